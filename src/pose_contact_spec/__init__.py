@@ -1,14 +1,107 @@
-"""Minimal reference helpers for the pose-contact specification."""
-
-from .load import load_document
-from .project import project_narrative
-from .validate import ValidationIssue, load_schema, validate_document, validate_instance
-
-__all__ = [
-    "ValidationIssue",
-    "load_document",
-    "load_schema",
-    "project_narrative",
-    "validate_document",
-    "validate_instance",
-]
+"""Minimal reference helpers for the pose-contact specification.
+
+Public names are imported from their submodules on first access, so
+``import pose_contact_spec`` stays cheap and heavy dependencies such as
+``jsonschema`` and PyYAML load only when a helper that needs them is used.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "AsyncValidator": "aio",
+    "aproject_narrative": "aio",
+    "avalidate_document": "aio",
+    "avalidate_instance": "aio",
+    "avalidate_many": "aio",
+    "BatchResult": "batch",
+    "validate_many": "batch",
+    "Corpus": "binary",
+    "decode_document": "binary",
+    "encode_document": "binary",
+    "write_corpus": "binary",
+    "ValidationCache": "cache",
+    "content_hash": "canonical",
+    "find_duplicates": "canonical",
+    "unique_documents": "canonical",
+    "RelationColumns": "columnar",
+    "RelationGraph": "graph",
+    "validate_incremental": "incremental",
+    "DocumentRecord": "load",
+    "iter_documents": "load",
+    "load_document": "load",
+    "Scene": "model",
+    "SceneIndex": "model",
+    "NarrativeProjector": "project",
+    "project_narrative": "project",
+    "FrameSequence": "sequence",
+    "load_sequence": "sequence",
+    "validate_sequence": "sequence",
+    "ValidationSession": "session",
+    "CompiledValidator": "validate",
+    "StreamIssue": "validate",
+    "ValidationIssue": "validate",
+    "compiled_validator": "validate",
+    "load_schema": "validate",
+    "validate_document": "validate",
+    "validate_instance": "validate",
+    "validate_stream": "validate",
+    "MigrationReport": "versions",
+    "VersionRegistry": "versions",
+    "migrate": "versions",
+    "migrate_many": "versions",
+    "WatchIndex": "watch",
+    "watch_documents": "watch",
+}
+
+__all__ = sorted(_EXPORTS, key=lambda name: (name[0].islower(), name))
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .aio import (
+        AsyncValidator,
+        aproject_narrative,
+        avalidate_document,
+        avalidate_instance,
+        avalidate_many,
+    )
+    from .batch import BatchResult, validate_many
+    from .binary import Corpus, decode_document, encode_document, write_corpus
+    from .cache import ValidationCache
+    from .canonical import content_hash, find_duplicates, unique_documents
+    from .columnar import RelationColumns
+    from .graph import RelationGraph
+    from .incremental import validate_incremental
+    from .load import DocumentRecord, iter_documents, load_document
+    from .model import Scene, SceneIndex
+    from .project import NarrativeProjector, project_narrative
+    from .sequence import FrameSequence, load_sequence, validate_sequence
+    from .session import ValidationSession
+    from .validate import (
+        CompiledValidator,
+        StreamIssue,
+        ValidationIssue,
+        compiled_validator,
+        load_schema,
+        validate_document,
+        validate_instance,
+        validate_stream,
+    )
+    from .versions import MigrationReport, VersionRegistry, migrate, migrate_many
+    from .watch import WatchIndex, watch_documents
@@ -0,0 +1,7 @@
+"""Allow ``python -m pose_contact_spec``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,362 @@
+"""asyncio counterparts of the validation and projection helpers.
+
+File reads run on the event loop's default executor, and parsing,
+validation and projection run on a thread or process pool owned by an
+:class:`AsyncValidator`, so coroutines never block the loop. A semaphore
+bounds how many documents are in flight at once; every call accepts a
+``timeout`` and can be cancelled. A document that times out keeps its slot
+until the pool has finished with it, since a running job cannot be stopped.
+
+The module-level functions share one thread-pool :class:`AsyncValidator`
+created on first use; pass ``validator=`` to use your own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import os
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    TypeVar,
+)
+
+from . import batch
+from .batch import EXECUTORS, BatchResult, _init_worker
+from .load import document_format, parse_document
+from .project import project_narrative
+from .validate import CompiledValidator, ValidationIssue, compiled_validator
+
+T = TypeVar("T")
+_Submit = Callable[..., Awaitable[Any]]
+
+
+def _validate_bytes(
+    data: bytes,
+    format: str,
+    max_issues: int | None,
+    validator: CompiledValidator | None = None,
+) -> list[ValidationIssue]:
+    validator = validator or batch._WORKER_VALIDATOR or compiled_validator()
+    document = parse_document(data, format)
+    return validator.validate_parsed(document, max_issues)
+
+
+def _validate_instance(
+    instance: Any, max_issues: int | None, validator: CompiledValidator | None = None
+) -> list[ValidationIssue]:
+    validator = validator or batch._WORKER_VALIDATOR or compiled_validator()
+    return validator.validate(instance, max_issues)
+
+
+class AsyncValidator:
+    """A worker pool and concurrency limit for validating from coroutines.
+
+    ``executor`` is ``"thread"`` or ``"process"``; process workers compile
+    the schema once when they start, thread workers share the process-wide
+    compiled validator. ``limit`` caps the documents being read or
+    validated at once (default: twice the worker count); further calls wait
+    for a slot without blocking the loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: str = "thread",
+        workers: int | None = None,
+        limit: int | None = None,
+        schema: dict[str, Any] | None = None,
+    ) -> None:
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+        workers = workers or os.cpu_count() or 1
+        self.limit = limit or workers * 2
+        if self.limit < 1:
+            raise ValueError("limit must be at least 1")
+        self._pool: Executor
+        if executor == "process":
+            self._pool = ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(schema,)
+            )
+            self._validator: CompiledValidator | None = None
+        else:
+            self._pool = ThreadPoolExecutor(workers, thread_name_prefix="avalidate")
+            self._validator = compiled_validator(schema)
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    async def __aenter__(self) -> AsyncValidator:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Shut the pool down without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        shutdown = functools.partial(self._pool.shutdown, cancel_futures=True)
+        await loop.run_in_executor(None, shutdown)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+    async def _limited(
+        self, operation: Callable[[_Submit], Awaitable[T]], timeout: float | None
+    ) -> T:
+        """Run ``operation`` in a slot, passing it a function to submit jobs.
+
+        A job that is already running cannot be cancelled, so on timeout or
+        cancellation the slot stays taken until every submitted job finishes.
+        """
+        semaphore = self._semaphore()
+        await semaphore.acquire()
+        jobs: list[Future[Any]] = []
+
+        def submit(
+            executor: Executor | None, func: Callable[..., Any], *args: Any
+        ) -> Awaitable[Any]:
+            job = _submit(executor, func, *args)
+            jobs.append(job)
+            return asyncio.wrap_future(job)
+
+        try:
+            return await asyncio.wait_for(operation(submit), timeout)
+        finally:
+            _release_when_done(semaphore, jobs)
+
+    async def validate_document(
+        self,
+        path: str | Path,
+        *,
+        max_issues: int | None = None,
+        timeout: float | None = None,
+    ) -> list[ValidationIssue]:
+        """Read, parse and validate a document; see :func:`validate_document`."""
+        resolved = Path(path)
+        format = document_format(resolved)
+
+        async def operation(submit: _Submit) -> list[ValidationIssue]:
+            data = await submit(None, resolved.read_bytes)
+            return await submit(
+                self._pool, _validate_bytes, data, format, max_issues, self._validator
+            )
+
+        return await self._limited(operation, timeout)
+
+    async def validate_instance(
+        self,
+        instance: dict[str, Any],
+        *,
+        max_issues: int | None = None,
+        timeout: float | None = None,
+    ) -> list[ValidationIssue]:
+        """Validate an in-memory instance on the pool."""
+        return await self._limited(
+            lambda submit: submit(
+                self._pool, _validate_instance, instance, max_issues, self._validator
+            ),
+            timeout,
+        )
+
+    async def project_narrative(
+        self, instance: dict[str, Any], *, timeout: float | None = None
+    ) -> str:
+        """Project an instance on the pool; see :func:`project_narrative`."""
+        return await self._limited(
+            lambda submit: submit(self._pool, project_narrative, instance), timeout
+        )
+
+    async def _batch_result(self, path: str, timeout: float | None) -> BatchResult:
+        try:
+            issues = await self.validate_document(path, timeout=timeout)
+        except asyncio.TimeoutError:
+            return BatchResult(path, error=f"TimeoutError: exceeded {timeout}s")
+        except Exception as exc:  # noqa: BLE001 - isolate per-file failures
+            return BatchResult(path, error=f"{type(exc).__name__}: {exc}")
+        return BatchResult(path, tuple(issues))
+
+    async def validate_many(
+        self,
+        paths: Iterable[str | Path] | AsyncIterable[str | Path],
+        *,
+        ordered: bool = True,
+        timeout: float | None = None,
+    ) -> AsyncIterator[BatchResult]:
+        """Validate documents concurrently, yielding a :class:`BatchResult` each.
+
+        At most :attr:`limit` documents are in flight; paths are consumed
+        lazily, so an unbounded async source is fine. ``timeout`` applies to
+        each document, and a document that times out or cannot be read gets a
+        result with ``error`` set. Closing the generator early cancels the
+        documents still in flight.
+        """
+        pending: deque[asyncio.Task[BatchResult]] = deque()
+        window = self.limit
+        try:
+            async for path in _aiter(paths):
+                task = asyncio.ensure_future(self._batch_result(str(path), timeout))
+                pending.append(task)
+                if len(pending) < window:
+                    continue
+                if ordered:
+                    yield await pending.popleft()
+                else:
+                    yield await _pop_first_done(pending)
+            while pending:
+                if ordered:
+                    yield await pending.popleft()
+                else:
+                    yield await _pop_first_done(pending)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _call_into(job: Future[T], func: Callable[..., T], *args: Any) -> None:
+    if not job.set_running_or_notify_cancel():
+        return
+    try:
+        result = func(*args)
+    except BaseException as exc:
+        job.set_exception(exc)
+    else:
+        job.set_result(result)
+
+
+def _submit(executor: Executor | None, func: Callable[..., T], *args: Any) -> Future[T]:
+    """Start ``func`` on ``executor``, or on the loop's default executor."""
+    if executor is not None:
+        return executor.submit(func, *args)
+    job: Future[T] = Future()
+    asyncio.get_running_loop().run_in_executor(None, _call_into, job, func, *args)
+    return job
+
+
+def _release_when_done(semaphore: asyncio.Semaphore, jobs: list[Future[Any]]) -> None:
+    """Release ``semaphore`` once every job in ``jobs`` has finished."""
+    running = [job for job in jobs if not job.done()]
+    if not running:
+        semaphore.release()
+        return
+    loop = asyncio.get_running_loop()
+    remaining = len(running)
+
+    def finished() -> None:
+        nonlocal remaining
+        remaining -= 1
+        if not remaining:
+            semaphore.release()
+
+    def notify(job: Future[Any]) -> None:
+        # Called on the worker thread; the loop may have closed meanwhile.
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(finished)
+
+    for job in running:
+        job.add_done_callback(notify)
+
+
+async def _aiter(items: Iterable[T] | AsyncIterable[T]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _pop_first_done(pending: deque[asyncio.Task[T]]) -> T:
+    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    task = next(iter(done))
+    pending.remove(task)
+    return task.result()
+
+
+_DEFAULT: AsyncValidator | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def _default_validator() -> AsyncValidator:
+    global _DEFAULT
+    if _DEFAULT is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None:
+                _DEFAULT = AsyncValidator()
+    return _DEFAULT
+
+
+async def avalidate_document(
+    path: str | Path,
+    *,
+    max_issues: int | None = None,
+    timeout: float | None = None,
+    validator: AsyncValidator | None = None,
+) -> list[ValidationIssue]:
+    """Asynchronously load and validate a canonical document."""
+    validator = validator or _default_validator()
+    return await validator.validate_document(
+        path, max_issues=max_issues, timeout=timeout
+    )
+
+
+async def avalidate_instance(
+    instance: dict[str, Any],
+    *,
+    max_issues: int | None = None,
+    timeout: float | None = None,
+    validator: AsyncValidator | None = None,
+) -> list[ValidationIssue]:
+    """Asynchronously validate a canonical instance."""
+    validator = validator or _default_validator()
+    return await validator.validate_instance(
+        instance, max_issues=max_issues, timeout=timeout
+    )
+
+
+def avalidate_many(
+    paths: Iterable[str | Path] | AsyncIterable[str | Path],
+    *,
+    ordered: bool = True,
+    timeout: float | None = None,
+    validator: AsyncValidator | None = None,
+) -> AsyncIterator[BatchResult]:
+    """Asynchronously validate many documents.
+
+    See :meth:`AsyncValidator.validate_many`.
+    """
+    validator = validator or _default_validator()
+    return validator.validate_many(paths, ordered=ordered, timeout=timeout)
+
+
+async def aproject_narrative(
+    instance: dict[str, Any],
+    *,
+    timeout: float | None = None,
+    validator: AsyncValidator | None = None,
+) -> str:
+    """Asynchronously create a narrative projection from canonical state."""
+    validator = validator or _default_validator()
+    return await validator.project_narrative(instance, timeout=timeout)
@@ -0,0 +1,250 @@
+"""Validate many canonical documents in parallel."""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, TypeVar
+
+from .validate import CompiledValidator, ValidationIssue, compiled_validator
+
+if TYPE_CHECKING:
+    from .cache import ValidationCache
+
+DOCUMENT_SUFFIXES = frozenset({".yaml", ".yml", ".json", ".pcb"})
+DEFAULT_CHUNKSIZE = 32
+EXECUTORS = ("process", "thread")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """The outcome of validating one file in a batch.
+
+    ``error`` is set when the file could not be read or parsed; ``issues``
+    then stays empty.
+    """
+
+    path: str
+    issues: tuple[ValidationIssue, ...] = ()
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.issues
+
+
+_WORKER_VALIDATOR: CompiledValidator | None = None
+_WORKER_CACHE: ValidationCache | None = None
+
+
+def _init_worker(schema: dict[str, Any] | None, cache: str | None = None) -> None:
+    global _WORKER_VALIDATOR, _WORKER_CACHE
+    _WORKER_VALIDATOR = compiled_validator(schema)
+    if cache is not None:
+        from .cache import ValidationCache
+
+        _WORKER_CACHE = ValidationCache(cache)
+
+
+def _validate_path(
+    path: str,
+    validator: CompiledValidator,
+    cache: ValidationCache | None = None,
+    incremental: bool = False,
+) -> BatchResult:
+    try:
+        if incremental:
+            from .incremental import validate_incremental
+
+            issues = validate_incremental(path, validator=validator)
+        elif cache is None:
+            issues = validator.validate_document(path)
+        else:
+            issues = cache.validate_document(path, validator=validator)
+    except Exception as exc:  # noqa: BLE001 - isolate per-file failures
+        return BatchResult(path, error=f"{type(exc).__name__}: {exc}")
+    return BatchResult(path, tuple(issues))
+
+
+def _validate_chunk(
+    chunk: list[str],
+    validator: CompiledValidator | None = None,
+    cache: ValidationCache | None = None,
+    incremental: bool = False,
+) -> list[BatchResult]:
+    validator = validator or _WORKER_VALIDATOR or compiled_validator()
+    cache = cache if cache is not None else _WORKER_CACHE
+    return [_validate_path(path, validator, cache, incremental) for path in chunk]
+
+
+def _chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@contextmanager
+def _open_cache(path: str | None) -> Iterator[ValidationCache | None]:
+    if path is None:
+        yield None
+        return
+    from .cache import ValidationCache
+
+    with ValidationCache(path) as cache:
+        yield cache
+
+
+def iter_document_paths(roots: Iterable[str | Path]) -> Iterator[Path]:
+    """Yield document files under ``roots``, walking directories in sorted order."""
+    for root in roots:
+        root = Path(root)
+        if not root.is_dir():
+            yield root
+            continue
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if Path(filename).suffix.lower() in DOCUMENT_SUFFIXES:
+                    yield Path(directory, filename)
+
+
+def read_manifest(path: str | Path) -> Iterator[Path]:
+    """Yield document paths listed one per line in a manifest file.
+
+    Blank lines and ``#`` comments are skipped; relative entries are resolved
+    against the manifest's directory.
+    """
+    manifest = Path(path)
+    with manifest.open(encoding="utf-8") as handle:
+        for line in handle:
+            entry = line.strip()
+            if not entry or entry.startswith("#"):
+                continue
+            yield manifest.parent / entry
+
+
+def map_chunks(
+    func: Callable[..., list[T]],
+    paths: Iterable[str | Path],
+    *args: Any,
+    workers: int | None = None,
+    executor: str = "process",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    ordered: bool = True,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple[Any, ...] = (),
+) -> Iterator[T]:
+    """Run ``func(chunk, *args)`` over ``paths`` on a pool and yield the results.
+
+    ``paths`` are converted to strings and sent in chunks of ``chunksize``;
+    ``func`` returns one result per path. At most ``2 * workers`` chunks are
+    in flight, so memory does not grow with the input. Results are yielded
+    in input order, or as chunks finish when ``ordered`` is false.
+    ``initializer(*initargs)`` runs once in each worker. ``workers=1`` calls
+    ``func`` inline without a pool or initializer. With the process executor,
+    ``func``, ``args`` and the results must be picklable.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunked((str(path) for path in paths), chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from func(chunk, *args)
+        return
+
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs)
+    else:
+        pool = ThreadPoolExecutor(workers, initializer=initializer, initargs=initargs)
+    window = workers * 2
+    try:
+        if ordered:
+            queue: deque[Future[list[T]]] = deque()
+            for chunk in chunks:
+                queue.append(pool.submit(func, chunk, *args))
+                if len(queue) >= window:
+                    yield from queue.popleft().result()
+            while queue:
+                yield from queue.popleft().result()
+        else:
+            pending: set[Future[list[T]]] = set()
+            for chunk in chunks:
+                pending.add(pool.submit(func, chunk, *args))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def validate_many(
+    paths: Iterable[str | Path],
+    *,
+    workers: int | None = None,
+    executor: str = "process",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    ordered: bool = True,
+    schema: dict[str, Any] | None = None,
+    cache: str | Path | None = None,
+    incremental: bool = False,
+) -> Iterator[BatchResult]:
+    """Validate documents in parallel, yielding one :class:`BatchResult` per path.
+
+    Paths are sent to the pool in chunks of ``chunksize``; each worker process
+    compiles the schema once when it starts. Results are yielded in input
+    order, or as chunks finish when ``ordered`` is false. A file that cannot
+    be read or parsed produces a result with ``error`` set instead of
+    stopping the batch. ``workers=1`` validates inline without a pool.
+
+    ``cache`` names a :class:`ValidationCache` file; documents whose content,
+    schema and rules are unchanged since a previous run are not re-parsed.
+    ``incremental`` validates each document while reading it (see
+    :mod:`pose_contact_spec.incremental`), for documents too large to load;
+    it cannot be combined with ``cache``.
+    """
+    if incremental and cache is not None:
+        raise ValueError("incremental validation cannot use a cache")
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+    workers = workers or os.cpu_count() or 1
+    cache_path = None if cache is None else str(cache)
+    # Worker processes compile the schema and open their own cache connection.
+    in_workers = executor == "process" and workers > 1
+    validator = None if in_workers else compiled_validator(schema)
+    with _open_cache(None if in_workers else cache_path) as shared_cache:
+        yield from map_chunks(
+            _validate_chunk,
+            paths,
+            validator,
+            shared_cache,
+            incremental,
+            workers=workers,
+            executor=executor,
+            chunksize=chunksize,
+            ordered=ordered,
+            initializer=_init_worker if in_workers else None,
+            initargs=(schema, cache_path),
+        )
@@ -0,0 +1,448 @@
+"""Compact binary encoding of canonical state, and corpus files of it.
+
+A document is encoded as a string table, holding every id, label, name and
+other free-text value once, followed by fixed-size little-endian records
+for each section. Records refer to strings by position and store
+predicates, body parts, sides, anchor roles, owner kinds and entity kinds
+as the small-integer codes of :mod:`pose_contact_spec.model`. Decoding
+returns a dict equal to the canonical document that was encoded.
+
+A corpus file holds many encoded documents followed by an offset index.
+:class:`Corpus` memory-maps it, so any document can be decoded or validated
+by position without reading the rest of the file::
+
+    write_corpus("scenes.pcc", documents)
+    with Corpus("scenes.pcc") as corpus:
+        corpus.validate(123_456)
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from . import model
+from .model import ENTITY_KINDS, BodyPartRef, EntityRef, Scene
+from .validate import CompiledValidator, ValidationIssue, compiled_validator
+
+DOCUMENT_SUFFIX = ".pcb"
+CORPUS_SUFFIX = ".pcc"
+FORMAT_VERSION = 1
+
+_DOCUMENT_MAGIC = b"PCSB"
+_CORPUS_MAGIC = b"PCSC"
+_NONE = 0xFF
+
+# magic, format version, section flags, string count, then the number of
+# actors, objects, surfaces, anchors, relations and qualifiers, reserved.
+_HEADER = struct.Struct("<4sHH8I")
+_OFFSET = struct.Struct("<I")
+_ACTOR = struct.Struct("<III")  # id, label + 1, type
+_ENTITY = struct.Struct("<II")  # id, label + 1
+_ANCHOR = struct.Struct("<IIIBB")  # id, owner, name, owner kind, role
+# id, predicate, then kind, target, part, side for the subject and the
+# object, then qualifiers + 1.
+_RELATION = struct.Struct("<IBBIBBBIBBI")
+# intensity + 1, contact area + 1, has duration, duration
+_QUALIFIERS = struct.Struct("<IIBQ")
+
+_SECTIONS = ("objects", "surfaces", "anchors")
+
+# magic, format version, reserved, document count, index offset
+_CORPUS_HEADER = struct.Struct("<4sHHQQ")
+_CORPUS_OFFSET = struct.Struct("<Q")
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    def optional(self, value: str | None) -> int:
+        return 0 if value is None else self.code(value) + 1
+
+
+def _encode_ref(entity: EntityRef, strings: _StringTable) -> tuple[int, ...]:
+    if isinstance(entity, BodyPartRef):
+        return (entity.kind, strings.code(entity.actor), entity.part, entity.side)
+    return (entity.kind, strings.code(entity.target), _NONE, _NONE)
+
+
+def encode_document(instance: dict[str, Any] | Scene) -> bytes:
+    """Encode a canonical dict or :class:`~.model.Scene`.
+
+    Dicts are converted with :meth:`Scene.from_dict`. A :class:`ValueError`
+    is raised for instances that do not fit the model, or that hold fields
+    the model does not, since those would not survive the round trip.
+    """
+    if isinstance(instance, Scene):
+        scene = instance
+    else:
+        scene = Scene.from_dict(instance)
+        if scene.to_dict() != instance:
+            raise ValueError("instance holds fields outside the canonical schema")
+    strings = _StringTable()
+    strings.code(scene.schema_version)
+    records = bytearray()
+    for actor in scene.actors:
+        records += _ACTOR.pack(
+            strings.code(actor.id),
+            strings.optional(actor.label),
+            strings.code(actor.type),
+        )
+    for item in (*(scene.objects or ()), *(scene.surfaces or ())):
+        records += _ENTITY.pack(strings.code(item.id), strings.optional(item.label))
+    for anchor in scene.anchors or ():
+        records += _ANCHOR.pack(
+            strings.code(anchor.id),
+            strings.code(anchor.owner),
+            strings.code(anchor.name),
+            anchor.owner_kind,
+            anchor.role,
+        )
+    qualifiers = bytearray()
+    qualifier_count = 0
+    for relation in scene.relations:
+        qualifier_code = 0
+        if relation.qualifiers is not None:
+            duration = relation.qualifiers.duration_ms
+            # The schema accepts integral floats such as 1.0, which would not
+            # decode to an equal document.
+            if duration is not None and (
+                type(duration) is not int or not 0 <= duration < 1 << 64
+            ):
+                raise ValueError(f"duration_ms {duration!r} cannot be encoded")
+            qualifiers += _QUALIFIERS.pack(
+                strings.optional(relation.qualifiers.intensity),
+                strings.optional(relation.qualifiers.contact_area),
+                duration is not None,
+                duration or 0,
+            )
+            qualifier_count += 1
+            qualifier_code = qualifier_count
+        records += _RELATION.pack(
+            strings.code(relation.id),
+            relation.predicate,
+            *_encode_ref(relation.subject, strings),
+            *_encode_ref(relation.object, strings),
+            qualifier_code,
+        )
+
+    encoded = [value.encode("utf-8") for value in strings.codes]
+    offsets = bytearray()
+    position = 0
+    for value in encoded:
+        offsets += _OFFSET.pack(position)
+        position += len(value)
+    offsets += _OFFSET.pack(position)
+    flags = sum(
+        1 << bit
+        for bit, name in enumerate(_SECTIONS)
+        if getattr(scene, name) is not None
+    )
+    header = _HEADER.pack(
+        _DOCUMENT_MAGIC,
+        FORMAT_VERSION,
+        flags,
+        len(encoded),
+        len(scene.actors),
+        len(scene.objects or ()),
+        len(scene.surfaces or ()),
+        len(scene.anchors or ()),
+        len(scene.relations),
+        qualifier_count,
+        0,
+    )
+    return b"".join((header, offsets, *encoded, records, qualifiers))
+
+
+def _labelled(item_id: str, label: int, strings: list[str]) -> dict[str, Any]:
+    if label:
+        return {"id": item_id, "label": strings[label - 1]}
+    return {"id": item_id}
+
+
+def _records(
+    layout: struct.Struct, data: memoryview, offset: int, count: int
+) -> tuple[Iterator[tuple[Any, ...]], int]:
+    end = offset + layout.size * count
+    return layout.iter_unpack(data[offset:end]), end
+
+
+def decode_document(data: bytes | memoryview) -> dict[str, Any]:
+    """Decode bytes from :func:`encode_document` into a canonical dict.
+
+    Raises :class:`ValueError` when ``data`` is not a complete document in a
+    supported format version.
+    """
+    try:
+        return _decode(memoryview(data))
+    except (struct.error, IndexError, UnicodeDecodeError) as exc:
+        raise ValueError(f"invalid binary document: {exc}") from None
+
+
+def _decode(data: memoryview) -> dict[str, Any]:
+    (
+        magic,
+        version,
+        flags,
+        string_count,
+        actor_count,
+        object_count,
+        surface_count,
+        anchor_count,
+        relation_count,
+        qualifier_count,
+        _,
+    ) = _HEADER.unpack_from(data)
+    if magic != _DOCUMENT_MAGIC:
+        raise ValueError("not a binary pose-contact document")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported binary format version {version}")
+    offset = _HEADER.size
+    bounds = [
+        bound
+        for (bound,) in _OFFSET.iter_unpack(
+            data[offset : offset + _OFFSET.size * (string_count + 1)]
+        )
+    ]
+    offset += _OFFSET.size * (string_count + 1)
+    text = bytes(data[offset : offset + bounds[-1]])
+    if len(text) != bounds[-1]:
+        raise ValueError("invalid binary document: truncated string table")
+    strings = [
+        text[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])
+    ]
+    offset += bounds[-1]
+
+    document: dict[str, Any] = {"schema_version": strings[0]}
+    rows, offset = _records(_ACTOR, data, offset, actor_count)
+    actors = []
+    for actor_id, label, actor_type in rows:
+        actor = {"id": strings[actor_id], "type": strings[actor_type]}
+        if label:
+            actor["label"] = strings[label - 1]
+        actors.append(actor)
+    document["actors"] = actors
+    for bit, name, count in (
+        (0, "objects", object_count),
+        (1, "surfaces", surface_count),
+    ):
+        rows, offset = _records(_ENTITY, data, offset, count)
+        items = [_labelled(strings[item_id], label, strings) for item_id, label in rows]
+        if flags & 1 << bit:
+            document[name] = items
+    rows, offset = _records(_ANCHOR, data, offset, anchor_count)
+    owner_kinds, roles = model.OWNER_KINDS, model.ANCHOR_ROLES
+    anchors = [
+        {
+            "id": strings[anchor_id],
+            "owner_kind": owner_kinds[owner_kind],
+            "owner": strings[owner],
+            "name": strings[name],
+            "role": roles[role],
+        }
+        for anchor_id, owner, name, owner_kind, role in rows
+    ]
+    if flags & 1 << 2:
+        document["anchors"] = anchors
+
+    relation_rows, offset = _records(_RELATION, data, offset, relation_count)
+    relation_rows = list(relation_rows)
+    qualifier_rows, offset = _records(_QUALIFIERS, data, offset, qualifier_count)
+    qualifiers = []
+    for intensity, contact_area, has_duration, duration in qualifier_rows:
+        found: dict[str, Any] = {}
+        if intensity:
+            found["intensity"] = strings[intensity - 1]
+        if has_duration:
+            found["duration_ms"] = duration
+        if contact_area:
+            found["contact_area"] = strings[contact_area - 1]
+        qualifiers.append(found)
+    if offset != len(data):
+        raise ValueError("invalid binary document: unexpected trailing data")
+
+    # Entity references are built inline: this loop dominates decoding.
+    parts, sides, predicates = model.BODY_PARTS, model.SIDES, model.PREDICATES
+    kinds = ENTITY_KINDS
+    relations = []
+    for (
+        relation_id,
+        predicate,
+        subject_kind,
+        subject_target,
+        subject_part,
+        subject_side,
+        object_kind,
+        object_target,
+        object_part,
+        object_side,
+        qualifier_code,
+    ) in relation_rows:
+        if subject_kind:
+            kind = kinds[subject_kind]
+            subject = {"kind": kind, kind: strings[subject_target]}
+        else:
+            subject = {
+                "kind": "body_part",
+                "actor": strings[subject_target],
+                "part": parts[subject_part],
+                "side": sides[subject_side],
+            }
+        if object_kind:
+            kind = kinds[object_kind]
+            entity = {"kind": kind, kind: strings[object_target]}
+        else:
+            entity = {
+                "kind": "body_part",
+                "actor": strings[object_target],
+                "part": parts[object_part],
+                "side": sides[object_side],
+            }
+        relation = {
+            "id": strings[relation_id],
+            "predicate": predicates[predicate],
+            "subject": subject,
+            "object": entity,
+        }
+        if qualifier_code:
+            relation["qualifiers"] = qualifiers[qualifier_code - 1]
+        relations.append(relation)
+    document["relations"] = relations
+    return document
+
+
+class CorpusWriter:
+    """Appends encoded documents to a new corpus file.
+
+    The offset index is written by :meth:`close`; a file that was not
+    closed cleanly has no index and cannot be opened as a :class:`Corpus`.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._handle: IO[bytes] = self.path.open("wb")
+        self._handle.write(_CORPUS_HEADER.pack(_CORPUS_MAGIC, FORMAT_VERSION, 0, 0, 0))
+        self._offsets = bytearray()
+        self._position = _CORPUS_HEADER.size
+        self._count = 0
+
+    def __enter__(self) -> CorpusWriter:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, instance: dict[str, Any] | Scene) -> int:
+        """Encode and append a document, returning its position."""
+        return self.append_encoded(encode_document(instance))
+
+    def append_encoded(self, data: bytes) -> int:
+        """Append a document already encoded with :func:`encode_document`."""
+        self._offsets += _CORPUS_OFFSET.pack(self._position)
+        self._handle.write(data)
+        self._position += len(data)
+        self._count += 1
+        return self._count - 1
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._offsets += _CORPUS_OFFSET.pack(self._position)
+        self._handle.write(self._offsets)
+        self._handle.seek(0)
+        self._handle.write(
+            _CORPUS_HEADER.pack(
+                _CORPUS_MAGIC, FORMAT_VERSION, 0, self._count, self._position
+            )
+        )
+        self._handle.close()
+
+
+def write_corpus(path: str | Path, documents: Iterable[dict[str, Any] | Scene]) -> int:
+    """Write ``documents`` to a corpus file, returning how many were written."""
+    with CorpusWriter(path) as writer:
+        for document in documents:
+            writer.append(document)
+        return len(writer)
+
+
+class Corpus:
+    """Read-only, memory-mapped access to a corpus file.
+
+    Opening the corpus reads only its header; each lookup reads the index
+    entry and the bytes of one document, so random access costs the same
+    for any corpus size.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < _CORPUS_HEADER.size:
+                raise ValueError(f"{self.path} is not a pose-contact corpus")
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, index_offset = _CORPUS_HEADER.unpack_from(self._map)
+        if magic != _CORPUS_MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a pose-contact corpus")
+        if version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"unsupported corpus format version {version}")
+        if index_offset + _CORPUS_OFFSET.size * (count + 1) > size:
+            self._map.close()
+            raise ValueError(f"{self.path} has no complete offset index")
+        self._count = count
+        self._index_offset = index_offset
+
+    def __enter__(self) -> Corpus:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def raw(self, index: int) -> bytes:
+        """Return the encoded bytes of document ``index``."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("corpus index out of range")
+        position = self._index_offset + _CORPUS_OFFSET.size * index
+        (start,) = _CORPUS_OFFSET.unpack_from(self._map, position)
+        (end,) = _CORPUS_OFFSET.unpack_from(self._map, position + _CORPUS_OFFSET.size)
+        return self._map[start:end]
+
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        return decode_document(self.raw(index))
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for index in range(self._count):
+            yield self[index]
+
+    def validate(
+        self,
+        index: int,
+        validator: CompiledValidator | None = None,
+        max_issues: int | None = None,
+    ) -> list[ValidationIssue]:
+        """Decode and validate document ``index``."""
+        validator = validator or compiled_validator()
+        return validator.validate(self[index], max_issues)
@@ -0,0 +1,189 @@
+"""Content-addressed, on-disk cache of validation results."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .load import document_format, parse_document
+from .validate import CompiledValidator, ValidationIssue, compiled_validator
+
+DEFAULT_MAX_ENTRIES = 100_000
+# Puts between two size checks; counting rows scans the whole table.
+EVICTION_INTERVAL = 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    issues TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def library_version() -> str:
+    """Return the installed package version, or ``"unknown"``."""
+    from importlib import metadata
+
+    try:
+        return metadata.version("pose-contact-spec")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def cache_key(
+    data: bytes, validator: CompiledValidator, format: str = "yaml"
+) -> str:
+    """Return the cache key for a document's raw bytes.
+
+    The key covers the bytes, the document format, the validator fingerprint
+    (schema and rule tables) and the library version, so results are
+    invalidated automatically when any of them change.
+    """
+    digest = hashlib.sha256()
+    for part in (library_version(), validator.fingerprint, format):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """Validation results stored in SQLite and keyed by document content.
+
+    The store holds at most ``max_entries`` results; the least recently used
+    are evicted first. The size is checked every :data:`EVICTION_INTERVAL`
+    puts (and on close), so between checks it may exceed ``max_entries`` by
+    up to that many entries. A cache may be shared between threads, and
+    several processes may open the same file.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._eviction_interval = min(EVICTION_INTERVAL, max_entries)
+        self._puts_since_check = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> ValidationCache:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._puts_since_check:
+                self._evict()
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()
+        return count
+
+    def get(self, key: str) -> list[ValidationIssue] | None:
+        """Return the cached issues for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT issues FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._connection.execute(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                (time.time_ns(), key),
+            )
+        return [
+            ValidationIssue(path, message) for path, message in json.loads(row[0])
+        ]
+
+    def put(self, key: str, issues: list[ValidationIssue]) -> None:
+        """Store ``issues`` under ``key``, evicting old entries if needed."""
+        encoded = json.dumps([[issue.path, issue.message] for issue in issues])
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, issues, last_used) "
+                "VALUES (?, ?, ?)",
+                (key, encoded, time.time_ns()),
+            )
+            self._puts_since_check += 1
+            if self._puts_since_check >= self._eviction_interval:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Called with the lock held.
+        self._puts_since_check = 0
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count > self.max_entries:
+            self._connection.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM results")
+
+    def validate_document(
+        self,
+        path: str | Path,
+        schema: dict[str, Any] | None = None,
+        *,
+        validator: CompiledValidator | None = None,
+    ) -> list[ValidationIssue]:
+        """Load and validate a document, reusing a cached result when possible.
+
+        A hit skips parsing entirely. Pass an already compiled ``validator``
+        instead of ``schema`` to avoid looking it up on every call.
+        """
+        validator = validator or compiled_validator(schema)
+        resolved = Path(path)
+        data = resolved.read_bytes()
+        format = document_format(resolved)
+        key = cache_key(data, validator, format)
+        issues = self.get(key)
+        if issues is None:
+            document = parse_document(data, format)
+            issues = validator.validate_parsed(document)
+            self.put(key, issues)
+        return issues
+
+    def validate_instance(
+        self, instance: dict[str, Any], schema: dict[str, Any] | None = None
+    ) -> list[ValidationIssue]:
+        """Validate an instance, reusing a cached result when possible.
+
+        The instance is keyed by its canonical JSON encoding.
+        """
+        validator = compiled_validator(schema)
+        data = json.dumps(instance, sort_keys=True, separators=(",", ":"))
+        key = cache_key(data.encode("utf-8"), validator, "instance")
+        issues = self.get(key)
+        if issues is None:
+            issues = validator.validate(instance)
+            self.put(key, issues)
+        return issues
@@ -0,0 +1,240 @@
+"""Order-insensitive normalization, content hashes and corpus deduplication.
+
+Two documents describe the same scene when they differ only in the order of
+entities or relations, in formatting, or in which end of a symmetric
+predicate (``touching``, ``contacting``) is the subject. :func:`normalize`
+rewrites an instance into one canonical form and :func:`content_hash`
+hashes that form, so such documents share a hash::
+
+    content_hash(scene) == content_hash(reordered_scene)
+
+``ignore_labels`` also drops the display ``label`` of actors, objects and
+surfaces, and ``ignore_relation_ids`` renumbers relations in canonical
+order. :func:`unique_documents` streams a corpus through a worker pool and
+yields only the first document of each hash, so every distinct scene can
+be validated or projected once; :func:`find_duplicates` yields the others.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .batch import DEFAULT_CHUNKSIZE, map_chunks
+from .load import load_document
+from .rules import DEFAULT_RULES
+from .validate import _ID_SECTIONS, _REF_FIELDS
+
+_LABELLED_SECTIONS = ("actors", "objects", "surfaces")
+
+
+def _ref_key(ref: Any) -> tuple[str, ...]:
+    if not isinstance(ref, dict):
+        return ("", json.dumps(ref, sort_keys=True))
+    kind = ref.get("kind")
+    field = _REF_FIELDS[kind][0] if kind in _REF_FIELDS else None
+    return (
+        str(kind),
+        str(ref.get(field, "")) if field else "",
+        str(ref.get("part", "")),
+        str(ref.get("side", "")),
+        json.dumps(ref, sort_keys=True, ensure_ascii=False),
+    )
+
+
+def _relation_key(relation: Any, with_id: bool) -> tuple[Any, ...]:
+    if not isinstance(relation, dict):
+        return ("", (), (), json.dumps(relation, sort_keys=True), "")
+    rest = {
+        name: value
+        for name, value in relation.items()
+        if name not in ("id", "predicate", "subject", "object")
+    }
+    return (
+        str(relation.get("predicate", "")),
+        _ref_key(relation.get("subject")),
+        _ref_key(relation.get("object")),
+        json.dumps(rest, sort_keys=True, ensure_ascii=False),
+        str(relation.get("id", "")) if with_id else "",
+    )
+
+
+def _entity_key(entity: Any) -> tuple[str, str]:
+    if isinstance(entity, dict):
+        return str(entity.get("id", "")), json.dumps(entity, sort_keys=True)
+    return "", json.dumps(entity, sort_keys=True)
+
+
+def normalize(
+    instance: dict[str, Any],
+    *,
+    ignore_labels: bool = False,
+    ignore_relation_ids: bool = False,
+) -> dict[str, Any]:
+    """Return a canonical copy of ``instance``.
+
+    Entities are sorted by id. The subject and object of symmetric
+    predicates are ordered by their reference, then relations are sorted by
+    predicate, subject, object and qualifiers. With ``ignore_relation_ids``
+    relations are then renumbered ``relation_1``, ``relation_2``, ...; the
+    result validates exactly when ``instance`` does either way.
+    """
+    if not isinstance(instance, dict):
+        raise ValueError("instance must be a mapping")
+    normalized = copy.deepcopy(instance)
+    for section in _ID_SECTIONS:
+        items = normalized.get(section)
+        if not isinstance(items, list):
+            continue
+        if ignore_labels and section in _LABELLED_SECTIONS:
+            for item in items:
+                if isinstance(item, dict):
+                    item.pop("label", None)
+        items.sort(key=_entity_key)
+
+    relations = normalized.get("relations")
+    if not isinstance(relations, list):
+        return normalized
+    for relation in relations:
+        if (
+            isinstance(relation, dict)
+            and relation.get("predicate") in DEFAULT_RULES.symmetric
+            and _ref_key(relation.get("object")) < _ref_key(relation.get("subject"))
+        ):
+            relation["subject"], relation["object"] = (
+                relation.get("object"),
+                relation.get("subject"),
+            )
+    relations.sort(
+        key=lambda relation: _relation_key(relation, not ignore_relation_ids)
+    )
+    if ignore_relation_ids:
+        for number, relation in enumerate(relations, 1):
+            if isinstance(relation, dict):
+                relation["id"] = f"relation_{number}"
+    return normalized
+
+
+def content_hash(
+    instance: dict[str, Any],
+    *,
+    ignore_labels: bool = False,
+    ignore_relation_ids: bool = False,
+) -> str:
+    """Return the SHA-256 hex digest of the :func:`normalize` form."""
+    normalized = normalize(
+        instance, ignore_labels=ignore_labels, ignore_relation_ids=ignore_relation_ids
+    )
+    encoded = json.dumps(
+        normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class HashResult:
+    """The content hash of one file.
+
+    ``error`` is set when the file could not be read or parsed; ``digest``
+    is then ``None``.
+    """
+
+    path: str
+    digest: str | None = None
+    error: str | None = None
+
+
+def _hash_chunk(
+    chunk: list[str], ignore_labels: bool, ignore_relation_ids: bool
+) -> list[HashResult]:
+    results = []
+    for path in chunk:
+        try:
+            digest = content_hash(
+                load_document(path),
+                ignore_labels=ignore_labels,
+                ignore_relation_ids=ignore_relation_ids,
+            )
+        except Exception as exc:  # noqa: BLE001 - isolate per-file failures
+            results.append(HashResult(path, error=f"{type(exc).__name__}: {exc}"))
+        else:
+            results.append(HashResult(path, digest))
+    return results
+
+
+def hash_many(
+    paths: Iterable[str | Path],
+    *,
+    ignore_labels: bool = False,
+    ignore_relation_ids: bool = False,
+    workers: int | None = None,
+    executor: str = "process",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[HashResult]:
+    """Hash documents in parallel, yielding one :class:`HashResult` per path.
+
+    Results are yielded in input order. At most ``2 * workers`` chunks are
+    in flight, so memory does not grow with the corpus. ``workers=1``
+    hashes inline.
+    """
+    yield from map_chunks(
+        _hash_chunk,
+        paths,
+        ignore_labels,
+        ignore_relation_ids,
+        workers=workers,
+        executor=executor,
+        chunksize=chunksize,
+    )
+
+
+def unique_documents(
+    paths: Iterable[str | Path], **options: Any
+) -> Iterator[HashResult]:
+    """Yield the first document of each distinct content hash.
+
+    Files that cannot be hashed are yielded too, with ``error`` set. Only
+    the digests seen so far are kept. ``options`` are passed to
+    :func:`hash_many`.
+    """
+    seen: set[bytes] = set()
+    for result in hash_many(paths, **options):
+        if result.digest is None:
+            yield result
+            continue
+        digest = bytes.fromhex(result.digest)
+        if digest not in seen:
+            seen.add(digest)
+            yield result
+
+
+@dataclass(frozen=True)
+class Duplicate:
+    """A file with the same content hash as an earlier file, its ``original``."""
+
+    path: str
+    original: str
+    digest: str
+
+
+def find_duplicates(paths: Iterable[str | Path], **options: Any) -> Iterator[Duplicate]:
+    """Yield every file whose content hash an earlier file already had.
+
+    Only the first path of each hash is kept, so memory grows with the
+    number of distinct scenes, not with the corpus. Files that cannot be
+    hashed are skipped. ``options`` are passed to :func:`hash_many`.
+    """
+    originals: dict[bytes, str] = {}
+    for result in hash_many(paths, **options):
+        if result.digest is None:
+            continue
+        digest = bytes.fromhex(result.digest)
+        original = originals.get(digest)
+        if original is None:
+            originals[digest] = result.path
+        else:
+            yield Duplicate(result.path, original, result.digest)
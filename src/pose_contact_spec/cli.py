@@ -0,0 +1,371 @@
+"""Command-line interface for the pose-contact helpers."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from itertools import chain
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from .batch import (
+    DEFAULT_CHUNKSIZE,
+    EXECUTORS,
+    iter_document_paths,
+    read_manifest,
+    validate_many,
+)
+from .load import STREAM_FORMATS, load_document
+from .validate import validate_stream
+
+
+def _collect_paths(args: argparse.Namespace) -> Iterator[Path]:
+    manifests = (read_manifest(manifest) for manifest in args.manifest)
+    return chain(iter_document_paths(args.paths), *manifests)
+
+
+def _run_watch(args: argparse.Namespace) -> int:
+    import time
+
+    from .watch import watch_documents
+
+    roots = [*args.paths, *chain.from_iterable(map(read_manifest, args.manifest))]
+    failing: set[str] = set()
+    documents: set[str] = set()
+    try:
+        for events in watch_documents(
+            roots, interval=args.interval, workers=args.workers
+        ):
+            for event in events:
+                if event.removed:
+                    documents.discard(event.path)
+                    failing.discard(event.path)
+                    print(f"- {event.path}: removed")
+                    continue
+                documents.add(event.path)
+                if event.ok:
+                    if event.path in failing:
+                        print(f"- {event.path}: ok")
+                    failing.discard(event.path)
+                    continue
+                failing.add(event.path)
+                if event.error is not None:
+                    print(f"- {event.path}: {event.error}")
+                for issue in event.issues:
+                    print(f"- {event.path}: {issue}")
+            stamp = time.strftime("%H:%M:%S")
+            print(
+                f"[{stamp}] {len(failing)} of {len(documents)} documents failed "
+                "validation; watching for changes.",
+                flush=True,
+            )
+    except KeyboardInterrupt:
+        pass
+    return 1 if failing else 0
+
+
+def _run_validate(args: argparse.Namespace) -> int:
+    if args.watch:
+        return _run_watch(args)
+    results = validate_many(
+        _collect_paths(args),
+        workers=args.workers,
+        executor=args.executor,
+        chunksize=args.chunksize,
+        ordered=not args.unordered,
+        cache=args.cache,
+        incremental=args.incremental,
+    )
+    checked = 0
+    failed = 0
+    for result in results:
+        checked += 1
+        if result.ok:
+            continue
+        if failed == 0:
+            print("Validation failed:")
+        failed += 1
+        if result.error is not None:
+            print(f"- {result.path}: {result.error}")
+        for issue in result.issues:
+            print(f"- {result.path}: {issue}")
+
+    if failed:
+        print(f"{failed} of {checked} documents failed validation.")
+        return 1
+    print(f"All {checked} documents are valid.")
+    return 0
+
+
+def _run_validate_stream(args: argparse.Namespace) -> int:
+    failed = 0
+    for stream_issue in validate_stream(args.path, format=args.format):
+        if failed == 0:
+            print("Validation failed:")
+        failed += 1
+        print(f"- {args.path}: {stream_issue}")
+    if failed:
+        print(f"{failed} issues found.")
+        return 1
+    print("All records are valid.")
+    return 0
+
+
+def _run_validate_sequence(args: argparse.Namespace) -> int:
+    from .sequence import validate_sequence
+
+    issues = validate_sequence(load_document(args.path))
+    if issues:
+        print("Validation failed:")
+        for issue in issues:
+            print(f"- {args.path}: {issue}")
+        print(f"{len(issues)} issues found.")
+        return 1
+    print("All frames are valid.")
+    return 0
+
+
+def _run_migrate(args: argparse.Namespace) -> int:
+    from .versions import MigrationReport, migrate_many
+
+    results = migrate_many(
+        _collect_paths(args),
+        target=args.target,
+        output_dir=args.output_dir,
+        source_root=args.source_root,
+        workers=args.workers,
+        executor=args.executor,
+        chunksize=args.chunksize,
+    )
+    report = MigrationReport()
+    try:
+        for result in results:
+            report.add(result)
+            if result.error is not None:
+                print(f"- {result.path}: {result.error}")
+            for issue in result.issues:
+                print(f"- {result.path}: {issue}")
+    except ValueError as exc:
+        # An unknown target or colliding output names stop the migration.
+        print(f"pose-contact migrate: error: {exc}", file=sys.stderr)
+        return 2
+    for line in report.lines():
+        print(line)
+    failed = sum(summary.failed for summary in report.versions.values())
+    return 1 if failed else 0
+
+
+def _run_dedupe(args: argparse.Namespace) -> int:
+    from .canonical import find_duplicates
+
+    duplicates = find_duplicates(
+        _collect_paths(args),
+        ignore_labels=args.ignore_labels,
+        ignore_relation_ids=args.ignore_relation_ids,
+        workers=args.workers,
+        executor=args.executor,
+        chunksize=args.chunksize,
+    )
+    count = 0
+    for duplicate in duplicates:
+        count += 1
+        print(f"- {duplicate.path}: same scene as {duplicate.original}")
+    print(f"{count} duplicate documents.")
+    return 0
+
+
+def _run_serve(args: argparse.Namespace) -> int:
+    from .server import serve
+
+    options = {
+        "host": args.host,
+        "port": args.port,
+        "max_pending": args.max_pending,
+        "max_body_bytes": args.max_body_bytes,
+        "max_batch": args.max_batch,
+    }
+    serve(
+        unix_socket=args.socket,
+        quiet=args.quiet,
+        workers=args.workers,
+        executor=args.executor,
+        **{name: value for name, value in options.items() if value is not None},
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pose-contact", description="Pose-contact specification helpers."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate = subparsers.add_parser(
+        "validate", help="Validate canonical documents, directories and manifests."
+    )
+    validate.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Documents or directories (searched for .yaml/.yml/.json/.pcb files).",
+    )
+    validate.add_argument(
+        "--manifest",
+        action="append",
+        default=[],
+        type=Path,
+        help="File listing one document path per line. May be repeated.",
+    )
+    validate.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of parallel workers (default: CPU count; 1 disables the pool).",
+    )
+    validate.add_argument("--executor", choices=EXECUTORS, default="process")
+    validate.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    validate.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Report results as they finish instead of in input order.",
+    )
+    validate.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="SQLite file caching results by document content across runs.",
+    )
+    validate.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Validate each document while reading it, for documents too large "
+        "to load at once.",
+    )
+    validate.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and revalidate documents as they change.",
+    )
+    validate.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Polling interval in seconds when inotify is unavailable.",
+    )
+    validate.set_defaults(handler=_run_validate)
+
+    stream = subparsers.add_parser(
+        "validate-stream",
+        help="Validate a JSON Lines or multi-document YAML stream record by record.",
+    )
+    stream.add_argument("path", type=Path)
+    stream.add_argument(
+        "--format",
+        choices=STREAM_FORMATS,
+        default=None,
+        help="Stream format (default: inferred from the file suffix).",
+    )
+    stream.set_defaults(handler=_run_validate_stream)
+
+    sequence = subparsers.add_parser(
+        "validate-sequence",
+        help="Validate a keyframe/delta frame sequence, checking deltas incrementally.",
+    )
+    sequence.add_argument("path", type=Path)
+    sequence.set_defaults(handler=_run_validate_sequence)
+
+    migrate = subparsers.add_parser(
+        "migrate",
+        help="Upgrade documents to a newer specification version and validate them.",
+    )
+    migrate.add_argument("paths", nargs="*", type=Path)
+    migrate.add_argument("--manifest", action="append", default=[], type=Path)
+    migrate.add_argument(
+        "--target", default="0.2.0", help="Version to migrate to (default: 0.2.0)."
+    )
+    migrate.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Write migrated documents here; without it, only report.",
+    )
+    migrate.add_argument(
+        "--source-root",
+        type=Path,
+        default=None,
+        help="Keep output paths relative to this directory.",
+    )
+    migrate.add_argument("--workers", type=int, default=None)
+    migrate.add_argument("--executor", choices=EXECUTORS, default="process")
+    migrate.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    migrate.set_defaults(handler=_run_migrate)
+
+    dedupe = subparsers.add_parser(
+        "dedupe", help="List documents that describe an earlier scene again."
+    )
+    dedupe.add_argument("paths", nargs="*", type=Path)
+    dedupe.add_argument("--manifest", action="append", default=[], type=Path)
+    dedupe.add_argument(
+        "--ignore-labels",
+        action="store_true",
+        help="Treat scenes that differ only in actor/object/surface labels as equal.",
+    )
+    dedupe.add_argument(
+        "--ignore-relation-ids",
+        action="store_true",
+        help="Treat scenes that differ only in relation ids as equal.",
+    )
+    dedupe.add_argument("--workers", type=int, default=None)
+    dedupe.add_argument("--executor", choices=EXECUTORS, default="process")
+    dedupe.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    dedupe.set_defaults(handler=_run_dedupe)
+
+    # Option defaults live in pose_contact_spec.server, which is only imported
+    # when the server actually runs, to keep the other subcommands fast.
+    server = subparsers.add_parser(
+        "serve", help="Run a long-lived validation server over HTTP or a Unix socket."
+    )
+    server.add_argument("--host", help="Address to bind (default: 127.0.0.1).")
+    server.add_argument("--port", type=int, help="TCP port (default: 8765).")
+    server.add_argument(
+        "--socket", default=None, help="Listen on this Unix socket instead of TCP."
+    )
+    server.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Validation workers (default: CPU count).",
+    )
+    server.add_argument("--executor", choices=EXECUTORS, default="thread")
+    server.add_argument(
+        "--max-pending",
+        type=int,
+        help="Requests validated at once before new ones get 503 (default: 64).",
+    )
+    server.add_argument(
+        "--max-body-bytes", type=int, help="Largest accepted body (default: 16 MiB)."
+    )
+    server.add_argument(
+        "--max-batch",
+        type=int,
+        help="Maximum documents per /validate/batch request (default: 1000).",
+    )
+    server.add_argument("--quiet", action="store_true", help="Do not log requests.")
+    server.set_defaults(handler=_run_serve)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    needs_input = ("validate", "migrate", "dedupe")
+    if args.command in needs_input and not args.paths and not args.manifest:
+        parser.error(f"{args.command} requires at least one path or --manifest")
+    if args.command == "validate" and args.cache is not None:
+        if args.watch or args.incremental:
+            parser.error("--watch and --incremental cannot be combined with --cache")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Columnar storage of relations for queries across scene corpora.
+
+:class:`RelationColumns` flattens the relations of many scenes into one
+``array`` column per field, coded with the vocabularies of
+:mod:`pose_contact_spec.model` and a shared id table. Queries filter whole
+columns at once, using NumPy when it is installed.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Iterable
+
+from .model import (
+    INTENSITIES,
+    AnchorRole,
+    AnchorRef,
+    BodyPart,
+    BodyPartRef,
+    CodedEnum,
+    EntityKind,
+    EntityRef,
+    Predicate,
+    Scene,
+    Side,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is optional
+    numpy = None
+
+MISSING = -1
+
+# Column name -> array typecode. Vocabulary codes fit in a signed byte;
+# MISSING marks fields that do not apply to a row.
+COLUMNS = {
+    "scene": "l",
+    "relation": "l",
+    "predicate": "b",
+    "subject_kind": "b",
+    "subject_id": "l",
+    "subject_part": "b",
+    "subject_side": "b",
+    "subject_role": "b",
+    "object_kind": "b",
+    "object_id": "l",
+    "object_part": "b",
+    "object_side": "b",
+    "object_role": "b",
+    "intensity": "b",
+    "duration_ms": "q",
+}
+
+_VOCABULARIES: dict[str, type[CodedEnum] | tuple[str, ...]] = {
+    "predicate": Predicate,
+    "subject_kind": EntityKind,
+    "subject_part": BodyPart,
+    "subject_side": Side,
+    "subject_role": AnchorRole,
+    "object_kind": EntityKind,
+    "object_part": BodyPart,
+    "object_side": Side,
+    "object_role": AnchorRole,
+    "intensity": INTENSITIES,
+}
+_ID_COLUMNS = frozenset({"relation", "subject_id", "object_id"})
+_NUMPY_DTYPES = {"b": "i1", "l": f"i{array('l').itemsize}", "q": "i8"}
+
+
+class RelationColumns:
+    """Relations of a scene corpus stored column by column.
+
+    Row ``i`` describes one relation; ``scene[i]`` is the position of its
+    scene in the order scenes were added. Ids are stored as codes into
+    :attr:`ids`. Part and side are :data:`MISSING` for entity references
+    that are not body parts, and role for references that are not anchors
+    (or whose anchor is not defined in the scene).
+    """
+
+    def __init__(self) -> None:
+        self.columns = {name: array(code) for name, code in COLUMNS.items()}
+        self.ids: list[str] = []
+        self.scene_count = 0
+        self._id_codes: dict[str, int] = {}
+        self._numpy_columns: dict[str, Any] | None = None
+
+    @classmethod
+    def from_scenes(
+        cls, scenes: Iterable[dict[str, Any] | Scene]
+    ) -> RelationColumns:
+        """Build columns from canonical dicts or typed scenes.
+
+        Dicts must be schema-valid; see :meth:`Scene.from_dict`.
+        """
+        columns = cls()
+        for scene in scenes:
+            columns.append_scene(scene)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.columns["scene"])
+
+    def __getitem__(self, name: str) -> array:
+        return self.columns[name]
+
+    def _id_code(self, value: str) -> int:
+        code = self._id_codes.get(value)
+        if code is None:
+            code = self._id_codes[value] = len(self.ids)
+            self.ids.append(value)
+        return code
+
+    def _append_ref(self, prefix: str, entity: EntityRef, scene: Scene) -> None:
+        columns = self.columns
+        columns[prefix + "_kind"].append(entity.kind)
+        columns[prefix + "_id"].append(self._id_code(entity.target))
+        if isinstance(entity, BodyPartRef):
+            columns[prefix + "_part"].append(entity.part)
+            columns[prefix + "_side"].append(entity.side)
+        else:
+            columns[prefix + "_part"].append(MISSING)
+            columns[prefix + "_side"].append(MISSING)
+        role = MISSING
+        if isinstance(entity, AnchorRef):
+            anchor = scene.index.anchors.get(entity.anchor)
+            if anchor is not None:
+                role = anchor.role
+        columns[prefix + "_role"].append(role)
+
+    def append_scene(self, scene: dict[str, Any] | Scene) -> int:
+        """Add the relations of one scene and return its position."""
+        if not isinstance(scene, Scene):
+            scene = Scene.from_dict(scene)
+        position = self.scene_count
+        columns = self.columns
+        for relation in scene.relations:
+            columns["scene"].append(position)
+            columns["relation"].append(self._id_code(relation.id))
+            columns["predicate"].append(relation.predicate)
+            self._append_ref("subject", relation.subject, scene)
+            self._append_ref("object", relation.object, scene)
+            qualifiers = relation.qualifiers
+            intensity = duration = None
+            if qualifiers is not None:
+                intensity, duration = qualifiers.intensity, qualifiers.duration_ms
+            columns["intensity"].append(
+                MISSING if intensity is None else INTENSITIES.index(intensity)
+            )
+            columns["duration_ms"].append(
+                MISSING if duration is None else int(duration)
+            )
+        self.scene_count += 1
+        self._numpy_columns = None
+        return position
+
+    def as_numpy(self) -> dict[str, Any]:
+        """Return the columns as NumPy arrays.
+
+        The arrays are copied once and reused until more scenes are added;
+        they are not views, because an ``array`` cannot grow while a buffer
+        on it is alive.
+        """
+        if numpy is None:
+            raise RuntimeError("NumPy is not installed")
+        if self._numpy_columns is None:
+            self._numpy_columns = {
+                name: numpy.frombuffer(
+                    column, dtype=_NUMPY_DTYPES[column.typecode]
+                ).copy()
+                for name, column in self.columns.items()
+            }
+        return self._numpy_columns
+
+    def _codes(self, name: str, value: Any) -> set[int]:
+        """Translate a condition value (or collection of values) into codes."""
+        collection = isinstance(value, (list, tuple, set, frozenset))
+        values = value if collection else (value,)
+        codes = set()
+        vocabulary = _VOCABULARIES.get(name)
+        for item in values:
+            if item is None:
+                codes.add(MISSING)
+            elif name in _ID_COLUMNS:
+                code = self._id_codes.get(item)
+                if code is not None:
+                    codes.add(code)
+            elif isinstance(vocabulary, tuple):
+                if item not in vocabulary:
+                    raise ValueError(f"invalid {name} {item!r}")
+                codes.add(vocabulary.index(item))
+            elif vocabulary is not None:
+                codes.add(vocabulary.parse(item))
+            else:
+                codes.add(int(item))
+        return codes
+
+    def rows(
+        self, *, min_duration_ms: int | None = None, **conditions: Any
+    ) -> list[int]:
+        """Return the indices of rows matching every condition.
+
+        Each keyword names a column and gives a value or a collection of
+        accepted values, e.g. ``predicate="gripping"``,
+        ``subject_side=("left", "none")`` or ``object_role="handle"``. ``None``
+        matches fields that do not apply. ``min_duration_ms`` keeps rows whose
+        duration qualifier is at least that value.
+        """
+        unknown = conditions.keys() - COLUMNS.keys()
+        if unknown:
+            raise ValueError(f"unknown columns: {', '.join(sorted(unknown))}")
+        codes = {name: self._codes(name, value) for name, value in conditions.items()}
+        if numpy is not None:
+            return self._numpy_rows(codes, min_duration_ms).tolist()
+        return self._python_rows(codes, min_duration_ms)
+
+    def _numpy_rows(
+        self, codes: dict[str, set[int]], min_duration_ms: int | None
+    ) -> Any:
+        columns = self.as_numpy()
+        mask = numpy.ones(len(self), dtype=bool)
+        for name, accepted in codes.items():
+            if len(accepted) == 1:
+                mask &= columns[name] == next(iter(accepted))
+            else:
+                mask &= numpy.isin(columns[name], list(accepted))
+        if min_duration_ms is not None:
+            mask &= columns["duration_ms"] >= min_duration_ms
+        return numpy.flatnonzero(mask)
+
+    def _python_rows(
+        self, codes: dict[str, set[int]], min_duration_ms: int | None
+    ) -> list[int]:
+        selected = list(range(len(self)))
+        for name, accepted in codes.items():
+            column = self.columns[name]
+            selected = [row for row in selected if column[row] in accepted]
+        if min_duration_ms is not None:
+            durations = self.columns["duration_ms"]
+            selected = [row for row in selected if durations[row] >= min_duration_ms]
+        return selected
+
+    def scenes(self, **conditions: Any) -> list[int]:
+        """Return the sorted positions of scenes with at least one matching row.
+
+        Accepts the same conditions as :meth:`rows`.
+        """
+        scene = self.columns["scene"]
+        return sorted({scene[row] for row in self.rows(**conditions)})
+
+    def record(self, row: int) -> dict[str, Any]:
+        """Decode one row back into names and ids, for display."""
+        record: dict[str, Any] = {}
+        for name, column in self.columns.items():
+            value = column[row]
+            vocabulary = _VOCABULARIES.get(name)
+            if name in _ID_COLUMNS:
+                value = self.ids[value]
+            elif value == MISSING and name != "scene":
+                value = None
+            elif isinstance(vocabulary, tuple):
+                value = vocabulary[value]
+            elif vocabulary is not None:
+                value = vocabulary(value).name
+            record[name] = value
+        return record
@@ -0,0 +1,303 @@
+"""Compile a JSON Schema into a specialised yes/no structural checker.
+
+The checker only answers whether an instance is valid. It is used to skip
+the generic ``jsonschema`` traversal for valid documents; when it reports a
+failure, callers re-run ``jsonschema`` to obtain the detailed errors. Only the
+keywords used by the pose-contact schema are supported, and
+:func:`compile_checker` returns ``None`` for any schema using something else.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable
+
+Check = Callable[[Any], bool]
+
+_ANNOTATIONS = frozenset(
+    {"$schema", "$id", "$comment", "title", "description", "definitions", "$defs"}
+)
+_OBJECT_KEYWORDS = frozenset({"type", "required", "properties", "additionalProperties"})
+_STRING_KEYWORDS = frozenset({"type", "enum", "const", "pattern", "minLength"})
+_TYPE_CHECKS: dict[str, Check] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+    "integer": lambda value: (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        or isinstance(value, float)
+        and value.is_integer()
+    ),
+    "number": lambda value: isinstance(value, (int, float))
+    and not isinstance(value, bool),
+}
+
+
+class UnsupportedSchema(Exception):
+    """Raised when a schema uses keywords the checker cannot compile."""
+
+
+def _string_set(values: list[Any]) -> frozenset[str]:
+    if not all(isinstance(value, str) for value in values):
+        raise UnsupportedSchema("only string enum and const values are supported")
+    return frozenset(values)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _Compiler:
+    def __init__(self, root: dict[str, Any]) -> None:
+        self.root = root
+        self.refs: dict[str, Check] = {}
+
+    def ref(self, pointer: str) -> Check:
+        if pointer in self.refs:
+            return self.refs[pointer]
+        if not pointer.startswith("#/"):
+            raise UnsupportedSchema(f"non-local $ref {pointer!r}")
+        target: Any = self.root
+        for token in pointer[2:].split("/"):
+            token = token.replace("~1", "/").replace("~0", "~")
+            if not isinstance(target, dict) or token not in target:
+                raise UnsupportedSchema(f"unresolvable $ref {pointer!r}")
+            target = target[token]
+        # Register a forwarding cell first so recursive references terminate.
+        cell: list[Check] = []
+        self.refs[pointer] = lambda value: cell[0](value)
+        compiled = self.compile(target)
+        cell.append(compiled)
+        self.refs[pointer] = compiled
+        return compiled
+
+    def compile(self, schema: Any) -> Check:
+        if schema is True:
+            return lambda value: True
+        if schema is False:
+            return lambda value: False
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema("schema must be an object or boolean")
+        keywords = schema.keys() - _ANNOTATIONS
+        if schema.get("type") == "object" and keywords <= _OBJECT_KEYWORDS:
+            return self._fused_object(schema)
+        if schema.get("type") == "string" and keywords <= _STRING_KEYWORDS:
+            return self._fused_string(schema)
+
+        checks: list[Check] = []
+        for keyword, argument in schema.items():
+            if keyword in _ANNOTATIONS:
+                continue
+            builder = getattr(self, "_" + keyword.lstrip("$"), None)
+            if builder is None:
+                raise UnsupportedSchema(f"unsupported keyword {keyword!r}")
+            checks.append(builder(argument, schema))
+
+        if not checks:
+            return lambda value: True
+        if len(checks) == 1:
+            return checks[0]
+        checks_tuple = tuple(checks)
+
+        def check_all(value: Any) -> bool:
+            for check in checks_tuple:
+                if not check(value):
+                    return False
+            return True
+
+        return check_all
+
+    def _fused_object(self, schema: dict[str, Any]) -> Check:
+        """Check an object schema in a single function call."""
+        additional = schema.get("additionalProperties", True)
+        if additional not in (True, False):
+            raise UnsupportedSchema("only boolean additionalProperties is supported")
+        closed = additional is False
+        required = tuple(schema.get("required", ()))
+        properties = {
+            name: self.compile(subschema)
+            for name, subschema in schema.get("properties", {}).items()
+        }
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, dict):
+                return False
+            for key in required:
+                if key not in value:
+                    return False
+            for name, item in value.items():
+                subcheck = properties.get(name)
+                if subcheck is None:
+                    if closed:
+                        return False
+                elif not subcheck(item):
+                    return False
+            return True
+
+        return check
+
+    def _fused_string(self, schema: dict[str, Any]) -> Check:
+        """Check a string schema in a single function call."""
+        allowed: frozenset[str] | None = None
+        if "enum" in schema:
+            allowed = _string_set(schema["enum"])
+        if "const" in schema:
+            const = _string_set([schema["const"]])
+            allowed = const if allowed is None else allowed & const
+        search = re.compile(schema["pattern"]).search if "pattern" in schema else None
+        min_length = schema.get("minLength", 0)
+        if allowed is not None and search is None and min_length == 0:
+            return lambda value: isinstance(value, str) and value in allowed
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, str) or len(value) < min_length:
+                return False
+            if allowed is not None and value not in allowed:
+                return False
+            return search is None or search(value) is not None
+
+        return check
+
+    def resolve(self, schema: Any) -> Any:
+        while isinstance(schema, dict) and set(schema) == {"$ref"}:
+            pointer = schema["$ref"]
+            target: Any = self.root
+            for token in pointer[2:].split("/"):
+                if not isinstance(target, dict) or token not in target:
+                    return schema
+                target = target[token]
+            schema = target
+        return schema
+
+    def _ref(self, argument: str, schema: dict[str, Any]) -> Check:
+        return self.ref(argument)
+
+    def _type(self, argument: Any, schema: dict[str, Any]) -> Check:
+        names = [argument] if isinstance(argument, str) else list(argument)
+        try:
+            checks = tuple(_TYPE_CHECKS[name] for name in names)
+        except KeyError as exc:
+            raise UnsupportedSchema(f"unsupported type {exc}") from None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda value: any(check(value) for check in checks)
+
+    def _enum(self, argument: list[Any], schema: dict[str, Any]) -> Check:
+        allowed = _string_set(argument)
+        return lambda value: isinstance(value, str) and value in allowed
+
+    def _const(self, argument: Any, schema: dict[str, Any]) -> Check:
+        allowed = _string_set([argument])
+        return lambda value: isinstance(value, str) and value in allowed
+
+    def _pattern(self, argument: str, schema: dict[str, Any]) -> Check:
+        search = re.compile(argument).search
+        return lambda value: not isinstance(value, str) or search(value) is not None
+
+    def _minLength(self, argument: int, schema: dict[str, Any]) -> Check:
+        return lambda value: not isinstance(value, str) or len(value) >= argument
+
+    def _minItems(self, argument: int, schema: dict[str, Any]) -> Check:
+        return lambda value: not isinstance(value, list) or len(value) >= argument
+
+    def _minimum(self, argument: float, schema: dict[str, Any]) -> Check:
+        return lambda value: not _is_number(value) or value >= argument
+
+    def _required(self, argument: list[str], schema: dict[str, Any]) -> Check:
+        required = tuple(argument)
+        return lambda value: not isinstance(value, dict) or all(
+            key in value for key in required
+        )
+
+    def _properties(self, argument: dict[str, Any], schema: dict[str, Any]) -> Check:
+        properties = {
+            name: self.compile(subschema) for name, subschema in argument.items()
+        }
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, dict):
+                return True
+            for name, item in value.items():
+                subcheck = properties.get(name)
+                if subcheck is not None and not subcheck(item):
+                    return False
+            return True
+
+        return check
+
+    def _additionalProperties(self, argument: Any, schema: dict[str, Any]) -> Check:
+        if argument is not False or "patternProperties" in schema:
+            raise UnsupportedSchema("only additionalProperties: false is supported")
+        allowed = frozenset(schema.get("properties", {}))
+        return lambda value: not isinstance(value, dict) or allowed.issuperset(value)
+
+    def _items(self, argument: Any, schema: dict[str, Any]) -> Check:
+        if "prefixItems" in schema:
+            raise UnsupportedSchema("prefixItems is not supported")
+        item_check = self.compile(argument)
+        return lambda value: not isinstance(value, list) or all(
+            item_check(item) for item in value
+        )
+
+    def _discriminator(self, branches: list[Any]) -> str | None:
+        """Return a property whose ``const`` tells the object branches apart."""
+        resolved = [self.resolve(branch) for branch in branches]
+        if not all(
+            isinstance(branch, dict) and branch.get("type") == "object"
+            for branch in resolved
+        ):
+            return None
+        for name in resolved[0].get("required", ()):
+            consts = [
+                branch.get("properties", {}).get(name, {}).get("const")
+                for branch in resolved
+                if name in branch.get("required", ())
+            ]
+            if (
+                len(consts) == len(resolved)
+                and all(isinstance(const, str) for const in consts)
+                and len(set(consts)) == len(consts)
+            ):
+                return name
+        return None
+
+    def _oneOf(self, argument: list[Any], schema: dict[str, Any]) -> Check:
+        branches = tuple(self.compile(subschema) for subschema in argument)
+        key = self._discriminator(argument)
+        if key is not None:
+            # At most one branch can match, so oneOf reduces to that branch.
+            dispatch = {
+                self.resolve(subschema)["properties"][key]["const"]: branch
+                for subschema, branch in zip(argument, branches)
+            }
+
+            def check_tagged(value: Any) -> bool:
+                if not isinstance(value, dict):
+                    return False
+                tag = value.get(key)
+                branch = dispatch.get(tag) if isinstance(tag, str) else None
+                return branch is not None and branch(value)
+
+            return check_tagged
+
+        def check(value: Any) -> bool:
+            matched = 0
+            for branch in branches:
+                if branch(value):
+                    matched += 1
+                    if matched > 1:
+                        return False
+            return matched == 1
+
+        return check
+
+
+def compile_checker(schema: dict[str, Any]) -> Check | None:
+    """Compile ``schema`` into a fast validity check, or ``None`` if unsupported."""
+    try:
+        return _Compiler(schema).compile(schema)
+    except UnsupportedSchema:
+        return None
@@ -0,0 +1,168 @@
+"""Adjacency index over the relations of one scene.
+
+:class:`RelationGraph` indexes every relation by the entities at its ends
+once, so questions such as "what is actor_b touching" or "what supports
+actor_a's feet" are dictionary lookups instead of scans over
+``relations``::
+
+    graph = RelationGraph(scene)
+    graph.outgoing("actor_b", predicate="touching")
+    graph.incoming("actor_a", predicate="supporting", part="foot")
+    graph.edges("chair", rollup=True)  # includes relations on chair's anchors
+
+Predicates the pairing rules mark symmetric (``touching``, ``contacting``)
+have their relations reachable from both ends in either direction.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .model import (
+    AnchorRef,
+    BodyPart,
+    BodyPartRef,
+    EntityRef,
+    Predicate,
+    Relation,
+    Scene,
+)
+from .rules import DEFAULT_RULES
+
+SYMMETRIC_PREDICATES = frozenset(
+    Predicate[name] for name in DEFAULT_RULES.symmetric if name in Predicate.__members__
+)
+
+DIRECTIONS = ("any", "out", "in")
+
+_Key = tuple[str, str, Predicate | None, BodyPart | None]
+
+
+@dataclass(frozen=True, slots=True)
+class Edge:
+    """A relation seen from one of its ends.
+
+    ``near`` is the end that belongs to the queried entity (for a rolled-up
+    query, the anchor of the queried owner) and ``far`` is the other end.
+    """
+
+    relation: Relation
+    near: EntityRef
+    far: EntityRef
+
+    @property
+    def predicate(self) -> Predicate:
+        return self.relation.predicate
+
+
+def _parse(enum: Any, value: Any) -> Any:
+    return enum.parse(value) if isinstance(value, str) else value
+
+
+class RelationGraph:
+    """Adjacency lookups by entity id, predicate and body part, built once.
+
+    ``instance`` may be a :class:`~.model.Scene` or a schema-valid canonical
+    dict. Queries take the id of an actor, object, surface or anchor and
+    return :class:`Edge` tuples in document order. ``predicate`` and
+    ``part`` accept schema strings or their enum members; ``part`` matches
+    the queried entity's own body part.
+    """
+
+    def __init__(self, instance: Scene | dict[str, Any]) -> None:
+        scene = instance if isinstance(instance, Scene) else Scene.from_dict(instance)
+        self.scene = scene
+        edges: dict[_Key, list[Edge]] = {}
+        rolled: dict[_Key, list[Edge]] = {}
+        by_predicate: dict[Predicate, list[Relation]] = {}
+        anchors = scene.index.anchors
+        for relation in scene.relations:
+            by_predicate.setdefault(relation.predicate, []).append(relation)
+            symmetric = relation.predicate in SYMMETRIC_PREDICATES
+            for near, far, direction in (
+                (relation.subject, relation.object, "out"),
+                (relation.object, relation.subject, "in"),
+            ):
+                edge = Edge(relation, near, far)
+                directions = ("any", "out", "in") if symmetric else ("any", direction)
+                _add(edges, directions, near.target, relation.predicate, near, edge)
+                if isinstance(near, AnchorRef) and near.anchor in anchors:
+                    owner = anchors[near.anchor].owner
+                    _add(rolled, directions, owner, relation.predicate, near, edge)
+        anchors_of: dict[str, list[str]] = {}
+        for anchor in anchors.values():
+            anchors_of.setdefault(anchor.owner, []).append(anchor.id)
+        self._edges = _frozen(edges)
+        self._rolled = _frozen(rolled)
+        self._by_predicate = _frozen(by_predicate)
+        self._anchors_of = _frozen(anchors_of)
+
+    def edges(
+        self,
+        entity: str,
+        *,
+        direction: str = "any",
+        predicate: Predicate | str | None = None,
+        part: BodyPart | str | None = None,
+        rollup: bool = False,
+    ) -> tuple[Edge, ...]:
+        """Return the edges at ``entity``.
+
+        ``direction`` is ``"out"`` (``entity`` is the subject), ``"in"``
+        (``entity`` is the object) or ``"any"``. With ``rollup``, the edges
+        of the anchors an object or surface owns follow its own edges.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}")
+        key = (direction, entity, _parse(Predicate, predicate), _parse(BodyPart, part))
+        found = self._edges.get(key, ())
+        if rollup and key in self._rolled:
+            found = found + self._rolled[key]
+        return found
+
+    def outgoing(self, entity: str, **filters: Any) -> tuple[Edge, ...]:
+        """Return the edges where ``entity`` is the subject; see :meth:`edges`."""
+        return self.edges(entity, direction="out", **filters)
+
+    def incoming(self, entity: str, **filters: Any) -> tuple[Edge, ...]:
+        """Return the edges where ``entity`` is the object; see :meth:`edges`."""
+        return self.edges(entity, direction="in", **filters)
+
+    def neighbours(self, entity: str, **filters: Any) -> tuple[EntityRef, ...]:
+        """Return the far end of every edge :meth:`edges` returns."""
+        return tuple(edge.far for edge in self.edges(entity, **filters))
+
+    def relations(self, predicate: Predicate | str) -> tuple[Relation, ...]:
+        """Return every relation with ``predicate``."""
+        return self._by_predicate.get(_parse(Predicate, predicate), ())
+
+    def anchors_of(self, owner: str) -> tuple[str, ...]:
+        """Return the ids of the anchors owned by an object or surface."""
+        return self._anchors_of.get(owner, ())
+
+    def owner_of(self, anchor: str) -> str | None:
+        """Return the id of an anchor's owner, or ``None`` if it is unknown."""
+        found = self.scene.index.anchors.get(anchor)
+        return None if found is None else found.owner
+
+
+def _add(
+    index: dict[_Key, list[Edge]],
+    directions: tuple[str, ...],
+    entity: str,
+    predicate: Predicate,
+    near: EntityRef,
+    edge: Edge,
+) -> None:
+    part = near.part if isinstance(near, BodyPartRef) else None
+    for direction in directions:
+        index.setdefault((direction, entity, None, None), []).append(edge)
+        index.setdefault((direction, entity, predicate, None), []).append(edge)
+        if part is not None:
+            index.setdefault((direction, entity, None, part), []).append(edge)
+            index.setdefault((direction, entity, predicate, part), []).append(edge)
+
+
+def _frozen(index: dict[Any, list[Any]]) -> dict[Any, tuple[Any, ...]]:
+    return {key: tuple(values) for key, values in index.items()}
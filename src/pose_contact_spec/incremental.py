@@ -0,0 +1,370 @@
+"""Validate one very large document without building it in memory.
+
+:func:`validate_incremental` reads a YAML or JSON document one section item
+at a time. Items of ``actors``, ``objects``, ``surfaces`` and ``anchors``
+are checked against their schema and reduced to an index of ids, and each
+relation is checked against the schema, the index and the pairing rules as
+it is read and then dropped. Peak memory is the id index plus the largest
+single item, instead of the whole nested document.
+
+The issues are those :meth:`~.validate.CompiledValidator.validate` reports
+for the loaded document, with the same paths (``/relations/123456/object/
+anchor``) and order: structural issues sorted by path, or else semantic
+issues with anchors before relations.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import cache
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from .load import document_format, yaml_loader
+from .validate import (
+    _ID_SECTIONS,
+    CompiledValidator,
+    ValidationIssue,
+    _anchor_issue,
+    _iter_relation_issues,
+    compiled_validator,
+)
+
+_CHUNK_CHARS = 1 << 20
+
+# Kinds of top-level parse events; see _yaml_events.
+_START, _ITEM, _VALUE = "start", "item", "value"
+
+
+def _yaml_events(handle: IO[str], loader: str | None) -> Iterator[tuple[Any, ...]]:
+    """Yield the top level of a YAML document as (kind, key, payload) tuples.
+
+    Top-level keys are reported as ``(_START, key, None)`` before their items
+    when the value is a sequence, each item as ``(_ITEM, key, value)``, and
+    other values as ``(_VALUE, key, value)``. Yields ``(_VALUE, None, value)``
+    once if the document is not a mapping.
+    """
+    import yaml
+    from yaml.events import (
+        DocumentStartEvent,
+        MappingEndEvent,
+        MappingStartEvent,
+        SequenceEndEvent,
+        SequenceStartEvent,
+        StreamEndEvent,
+    )
+
+    parser = _event_loader(yaml_loader(loader))(handle)
+    try:
+        parser.get_event()  # StreamStart
+        if not parser.check_event(DocumentStartEvent):
+            yield _VALUE, None, None
+            return
+        parser.get_event()
+        if not parser.check_event(MappingStartEvent):
+            yield _VALUE, None, parser.construct_document(
+                parser.compose_node(None, None)
+            )
+        else:
+            parser.get_event()
+            while not parser.check_event(MappingEndEvent):
+                key = parser.construct_document(parser.compose_node(None, None))
+                if not parser.check_event(SequenceStartEvent):
+                    value = parser.compose_node(None, None)
+                    yield _VALUE, key, parser.construct_document(value)
+                    continue
+                parser.get_event()
+                yield _START, key, None
+                while not parser.check_event(SequenceEndEvent):
+                    item = parser.construct_document(parser.compose_node(None, None))
+                    yield _ITEM, key, item
+                parser.get_event()
+            parser.get_event()
+        parser.get_event()  # DocumentEnd
+        if not parser.check_event(StreamEndEvent):
+            event = parser.get_event()
+            raise yaml.composer.ComposerError(
+                "expected a single document in the stream",
+                None,
+                "but found another document",
+                event.start_mark,
+            )
+    finally:
+        parser.dispose()
+
+
+@cache
+def _event_loader(base: type) -> type:
+    """Return a loader class that exposes parse events and node composition.
+
+    libyaml's loader composes whole documents in C; pairing its event parser
+    with PyYAML's composer lets single items be composed and constructed.
+    """
+    import yaml
+
+    c_loader = getattr(yaml, "CSafeLoader", None)
+    if c_loader is None or not issubclass(base, c_loader):
+        return base
+    from yaml._yaml import CParser
+    from yaml.composer import Composer
+    from yaml.constructor import SafeConstructor
+    from yaml.resolver import Resolver
+
+    class _CEventLoader(CParser, Composer, SafeConstructor, Resolver):
+        def __init__(self, stream: IO[str]) -> None:
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+    return _CEventLoader
+
+
+class _JsonReader:
+    """Decodes JSON values one at a time from a text stream read in chunks."""
+
+    def __init__(self, handle: IO[str]) -> None:
+        self._handle = handle
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(max(_CHUNK_CHARS, len(self._buffer) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or ``""`` at the end."""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\n\r":
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer) or not self._fill():
+                return buffer[pos] if pos < len(buffer) else ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _error(self, message: str) -> None:
+        raise json.JSONDecodeError(message, self._buffer, self._pos)
+
+
+def _json_events(handle: IO[str]) -> Iterator[tuple[Any, ...]]:
+    """Yield the top level of a JSON document like :func:`_yaml_events`."""
+    reader = _JsonReader(handle)
+    if reader.peek() != "{":
+        yield _VALUE, None, reader.value()
+    else:
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.expect("}")
+        else:
+            while True:
+                key = reader.value()
+                if not isinstance(key, str):
+                    reader._error("Expecting property name enclosed in double quotes")
+                reader.expect(":")
+                if reader.peek() != "[":
+                    yield _VALUE, key, reader.value()
+                else:
+                    reader.expect("[")
+                    yield _START, key, None
+                    if reader.peek() == "]":
+                        reader.expect("]")
+                    else:
+                        while True:
+                            yield _ITEM, key, reader.value()
+                            if reader.peek() == "]":
+                                reader.expect("]")
+                                break
+                            reader.expect(",")
+                if reader.peek() == "}":
+                    reader.expect("}")
+                    break
+                reader.expect(",")
+    if reader.peek():
+        reader._error("Extra data")
+
+
+class _Checker:
+    """Accumulates the issues of one streamed document."""
+
+    def __init__(self, validator: CompiledValidator, max_issues: int | None):
+        self.validator = validator
+        self.max_issues = max_issues
+        self.sections = frozenset(validator.item_sections)
+        self.root: dict[str, Any] = {}
+        self.schema_issues: list[ValidationIssue] = []
+        self.ids: dict[str, set[str]] = {section: set() for section in _ID_SECTIONS}
+        # (index, anchor) for anchors, checked once every owner is known.
+        self.anchors: list[tuple[int, dict[str, Any]]] = []
+        # (index, relation, issues) for relations whose checks found issues.
+        self.relations: list[tuple[int, dict[str, Any], list[ValidationIssue]]] = []
+        self.relations_started = False
+        self.ids_after_relations = False
+
+    @property
+    def full(self) -> bool:
+        return self.max_issues is not None and (
+            len(self.schema_issues) >= self.max_issues
+        )
+
+    def _add_key(self, key: str) -> None:
+        # Loading keeps the last copy of a repeated key, but the items of the
+        # first copy have already been checked and dropped.
+        if key in self.root:
+            raise ValueError(f"duplicate top-level key {key!r}")
+
+    def start(self, section: str) -> None:
+        self._add_key(section)
+        self.root[section] = []
+        if section == "relations":
+            self.relations_started = True
+        elif section in self.ids and self.relations_started:
+            self.ids_after_relations = True
+
+    def item(self, section: str, item: Any) -> None:
+        items = self.root[section]
+        index = len(items)
+        if section not in self.sections:
+            items.append(item)
+            return
+        # The root schema only needs the length of an item section.
+        items.append(None)
+        found = self.validator.item_schema_issues(section, index, item)
+        if found:
+            self.schema_issues.extend(found)
+            return
+        if self.schema_issues:
+            return
+        if section in self.ids:
+            if isinstance(item, dict) and "id" in item:
+                self.ids[section].add(item["id"])
+            if section == "anchors" and isinstance(item, dict):
+                self.anchors.append((index, _anchor_fields(item)))
+        elif section == "relations":
+            issues = list(
+                _iter_relation_issues(
+                    item,
+                    index,
+                    self.ids,
+                    self.validator.pairings,
+                    self.validator.expected_pairings,
+                )
+            )
+            if issues:
+                self.relations.append((index, _relation_fields(item), issues))
+
+    def value(self, key: str, value: Any) -> None:
+        self._add_key(key)
+        self.root[key] = value
+
+    def issues(self) -> list[ValidationIssue]:
+        # Reading stops early once full, so the root may be incomplete.
+        root_issues = [] if self.full else self.validator.root_schema_issues(self.root)
+        schema_issues = sorted(
+            [*root_issues, *self.schema_issues], key=lambda issue: issue.path
+        )
+        if schema_issues:
+            return schema_issues[: self.max_issues]
+        issues = []
+        for index, anchor in self.anchors:
+            issue = _anchor_issue(anchor, index, self.ids)
+            if issue is not None:
+                issues.append(issue)
+        for index, relation, found in self.relations:
+            if self.ids_after_relations:
+                # Ids defined after the relations may resolve these issues.
+                found = list(
+                    _iter_relation_issues(
+                        relation,
+                        index,
+                        self.ids,
+                        self.validator.pairings,
+                        self.validator.expected_pairings,
+                    )
+                )
+            issues.extend(found)
+        return issues[: self.max_issues]
+
+
+def _anchor_fields(anchor: dict[str, Any]) -> dict[str, Any]:
+    return {"owner_kind": anchor.get("owner_kind"), "owner": anchor.get("owner")}
+
+
+def _relation_fields(relation: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "predicate": relation.get("predicate"),
+        "subject": relation.get("subject"),
+        "object": relation.get("object"),
+    }
+
+
+def validate_incremental(
+    path: str | Path,
+    schema: dict[str, Any] | None = None,
+    *,
+    max_issues: int | None = None,
+    validator: CompiledValidator | None = None,
+    loader: str | None = None,
+) -> list[ValidationIssue]:
+    """Validate a YAML or JSON document while reading it item by item.
+
+    Returns the issues :func:`~.validate.validate_document` would. With
+    ``max_issues``, reading stops once that many structural issues are
+    found. Binary (``.pcb``) documents are decoded whole. ``loader`` selects
+    the YAML loader (see :func:`~.load.yaml_loader`). A top-level key that
+    appears twice raises :class:`ValueError`, since loading would keep only
+    its last value.
+    """
+    if max_issues is not None and max_issues < 1:
+        raise ValueError("max_issues must be at least 1")
+    validator = validator or compiled_validator(schema)
+    format = document_format(path)
+    if format == "binary":
+        return validator.validate_document(path, max_issues)
+    checker = _Checker(validator, max_issues)
+    with Path(path).open(encoding="utf-8") as handle:
+        events = (
+            _json_events(handle) if format == "json" else _yaml_events(handle, loader)
+        )
+        for kind, key, payload in events:
+            if key is None:
+                return validator.validate_parsed(payload, max_issues)
+            if kind == _START:
+                checker.start(key)
+            elif kind == _ITEM:
+                checker.item(key, payload)
+            else:
+                checker.value(key, payload)
+            if checker.full:
+                break
+    return checker.issues()
@@ -0,0 +1,246 @@
+"""Opt-in timing and size reporting for validation calls.
+
+While no observer is registered, validation only pays for one truthiness
+check per call. Register a callback with :func:`add_observer`, or use
+:func:`collect` to aggregate a block of work into :class:`ValidationStats`::
+
+    with collect() as stats:
+        for result in validate_many(paths, executor="thread"):
+            ...
+    stats.write_prometheus("/var/lib/node_exporter/pose_contact.prom")
+
+Observers are process-wide and are called from the validating thread.
+Documents validated in other processes (``validate_many`` with the process
+executor) are not reported to observers registered in the parent.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+PHASES = ("load", "schema", "semantic")
+
+Observer = Callable[["ValidationRecord"], None]
+
+# Read without the lock on the hot path; replaced, never mutated.
+_observers: tuple[Observer, ...] = ()
+_observers_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    """Wall-clock and CPU seconds spent in one phase."""
+
+    wall: float
+    cpu: float
+
+
+@dataclass(frozen=True)
+class ValidationRecord:
+    """What one ``validate_document``/``validate_instance`` call did.
+
+    ``source`` is the document path, or ``None`` for an in-memory instance;
+    ``bytes`` is only known for documents read from disk. Phases that did not
+    run (``load`` for instances, ``semantic`` after schema errors) are absent.
+    """
+
+    source: str | None
+    phases: dict[str, PhaseTiming]
+    actors: int
+    relations: int
+    bytes: int | None
+    issues: int
+
+    @property
+    def wall(self) -> float:
+        return sum(timing.wall for timing in self.phases.values())
+
+    @property
+    def cpu(self) -> float:
+        return sum(timing.cpu for timing in self.phases.values())
+
+
+def add_observer(observer: Observer) -> None:
+    """Call ``observer`` with a :class:`ValidationRecord` after each validation."""
+    global _observers
+    with _observers_lock:
+        _observers = _observers + (observer,)
+
+
+def remove_observer(observer: Observer) -> None:
+    """Unregister ``observer``; matched by identity, not equality."""
+    global _observers
+    with _observers_lock:
+        for index, registered in enumerate(_observers):
+            if registered is observer:
+                _observers = _observers[:index] + _observers[index + 1 :]
+                return
+    raise ValueError(f"{observer!r} is not registered")
+
+
+def enabled() -> bool:
+    """Return whether any observer is registered."""
+    return bool(_observers)
+
+
+def _section_size(instance: Any, name: str) -> int:
+    if not isinstance(instance, dict):
+        return 0
+    items = instance.get(name)
+    return len(items) if isinstance(items, list) else 0
+
+
+class Recorder:
+    """Collects the phases of one validation call and emits its record."""
+
+    __slots__ = ("source", "bytes", "_phases")
+
+    def __init__(self, source: str | Path | None = None) -> None:
+        self.source = None if source is None else str(source)
+        self.bytes: int | None = None
+        self._phases: dict[str, PhaseTiming] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self._phases[name] = PhaseTiming(
+                time.perf_counter() - wall, time.thread_time() - cpu
+            )
+
+    def emit(self, instance: Any, issues: int) -> None:
+        record = ValidationRecord(
+            self.source,
+            self._phases,
+            _section_size(instance, "actors"),
+            _section_size(instance, "relations"),
+            self.bytes,
+            issues,
+        )
+        for observer in _observers:
+            observer(record)
+
+
+@dataclass
+class _SlowestDocument:
+    source: str | None = None
+    wall: float = 0.0
+
+
+@dataclass(eq=False)
+class ValidationStats:
+    """Running totals over the records it observes; safe to share between threads."""
+
+    documents: int = 0
+    invalid_documents: int = 0
+    issues: int = 0
+    actors: int = 0
+    relations: int = 0
+    bytes: int = 0
+    phase_wall: dict[str, float] = field(default_factory=dict)
+    phase_cpu: dict[str, float] = field(default_factory=dict)
+    slowest: _SlowestDocument = field(default_factory=_SlowestDocument)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def __call__(self, record: ValidationRecord) -> None:
+        with self._lock:
+            self.documents += 1
+            self.invalid_documents += bool(record.issues)
+            self.issues += record.issues
+            self.actors += record.actors
+            self.relations += record.relations
+            self.bytes += record.bytes or 0
+            for name, timing in record.phases.items():
+                self.phase_wall[name] = self.phase_wall.get(name, 0.0) + timing.wall
+                self.phase_cpu[name] = self.phase_cpu.get(name, 0.0) + timing.cpu
+            wall = record.wall
+            if wall > self.slowest.wall:
+                self.slowest = _SlowestDocument(record.source, wall)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the totals as plain data, e.g. for JSON logging."""
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "invalid_documents": self.invalid_documents,
+                "issues": self.issues,
+                "actors": self.actors,
+                "relations": self.relations,
+                "bytes": self.bytes,
+                "phases": {
+                    name: {"wall": self.phase_wall[name], "cpu": self.phase_cpu[name]}
+                    for name in PHASES
+                    if name in self.phase_wall
+                },
+                "slowest": {
+                    "source": self.slowest.source,
+                    "wall": self.slowest.wall,
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "pose_contact") -> str:
+        """Render the totals in the Prometheus text exposition format."""
+        data = self.snapshot()
+        lines = []
+        for name in (
+            "documents",
+            "invalid_documents",
+            "issues",
+            "actors",
+            "relations",
+            "bytes",
+        ):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {data[name]}")
+        metric = f"{prefix}_phase_seconds_total"
+        lines.append(f"# TYPE {metric} counter")
+        for name, timing in data["phases"].items():
+            for clock in ("wall", "cpu"):
+                value = repr(float(timing[clock]))
+                lines.append(f'{metric}{{phase="{name}",clock="{clock}"}} {value}')
+        metric = f"{prefix}_slowest_document_seconds"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {data['slowest']['wall']!r}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path, prefix: str = "pose_contact") -> None:
+        """Atomically write :meth:`to_prometheus` output to ``path``.
+
+        The file is replaced in one step, so a textfile collector never reads
+        a partial file.
+        """
+        import tempfile
+
+        target = Path(path)
+        handle = tempfile.NamedTemporaryFile(
+            "w", dir=target.parent, prefix=target.name, delete=False, encoding="utf-8"
+        )
+        try:
+            with handle:
+                handle.write(self.to_prometheus(prefix))
+            os.replace(handle.name, target)
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+
+
+@contextmanager
+def collect(stats: ValidationStats | None = None) -> Iterator[ValidationStats]:
+    """Aggregate every validation in the block into ``stats`` (or a new one)."""
+    stats = stats if stats is not None else ValidationStats()
+    add_observer(stats)
+    try:
+        yield stats
+    finally:
+        remove_observer(stats)
@@ -3,16 +3,189 @@
 from __future__ import annotations
 
 import json
+import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterator
 
-import yaml
+JSON_LINES_SUFFIXES = frozenset({".jsonl", ".ndjson"})
+STREAM_FORMATS = ("yaml", "json", "jsonl")
+DOCUMENT_FORMATS = ("yaml", "json", "binary")
+BINARY_SUFFIX = ".pcb"
+YAML_LOADERS = ("auto", "c", "python")
+YAML_LOADER_ENV = "POSE_CONTACT_YAML_LOADER"
 
 
-def load_document(path: str | Path) -> Any:
-    """Load a YAML or JSON document from disk."""
+@dataclass(frozen=True)
+class DocumentRecord:
+    """One document read from a stream.
+
+    ``index`` counts records from zero and ``line`` is the 1-based line the
+    record starts on. ``error`` is set, and ``document`` is ``None``, for
+    JSON Lines records that could not be parsed when reading with
+    ``skip_invalid``.
+    """
+
+    index: int
+    line: int
+    document: Any
+    error: str | None = None
+
+
+def yaml_loader(name: str | None = None) -> type:
+    """Return the safe YAML loader class to parse with.
+
+    ``name`` is ``"auto"`` (libyaml's ``CSafeLoader`` when PyYAML was built
+    with it, otherwise the pure-Python ``SafeLoader``), ``"c"`` or
+    ``"python"``. When omitted, the ``POSE_CONTACT_YAML_LOADER`` environment
+    variable is consulted before falling back to ``"auto"``.
+    """
+    name = name or os.environ.get(YAML_LOADER_ENV) or "auto"
+    if name not in YAML_LOADERS:
+        raise ValueError(f"YAML loader must be one of {', '.join(YAML_LOADERS)}")
+    import yaml
+
+    if name == "python":
+        return yaml.SafeLoader
+    c_loader = getattr(yaml, "CSafeLoader", None)
+    if c_loader is None and name == "c":
+        raise RuntimeError("PyYAML was built without libyaml support")
+    return c_loader or yaml.SafeLoader
+
+
+def _load_yaml(stream: str | IO[str], loader: str | None) -> Any:
+    # PyYAML is imported on first use to keep package import cheap.
+    import yaml
+
+    return yaml.load(stream, Loader=yaml_loader(loader))
+
+
+def loads_document(text: str, format: str = "yaml", loader: str | None = None) -> Any:
+    """Parse a YAML or JSON document from a string.
+
+    ``format`` is ``"yaml"`` or ``"json"``; ``loader`` selects the YAML
+    loader (see :func:`yaml_loader`).
+    """
+    if format == "json":
+        return json.loads(text)
+    if format != "yaml":
+        raise ValueError("format must be 'yaml' or 'json'")
+    return _load_yaml(text, loader)
+
+
+def document_format(path: str | Path) -> str:
+    """Return the format of a document file from its suffix.
+
+    ``.json`` is JSON, ``.pcb`` is the binary encoding of
+    :mod:`pose_contact_spec.binary` and anything else is YAML.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".json":
+        return "json"
+    if suffix == BINARY_SUFFIX:
+        return "binary"
+    return "yaml"
+
+
+def parse_document(data: bytes, format: str = "yaml", loader: str | None = None) -> Any:
+    """Parse a document read as bytes, in any of :data:`DOCUMENT_FORMATS`."""
+    if format == "binary":
+        from .binary import decode_document
+
+        return decode_document(data)
+    return loads_document(data.decode("utf-8"), format, loader)
+
+
+def load_document(path: str | Path, loader: str | None = None) -> Any:
+    """Load a YAML, JSON or binary document from disk.
+
+    ``loader`` selects the YAML loader; see :func:`yaml_loader`.
+    """
     resolved = Path(path)
+    format = document_format(resolved)
+    if format == "binary":
+        return parse_document(resolved.read_bytes(), format)
     with resolved.open(encoding="utf-8") as handle:
-        if resolved.suffix.lower() == ".json":
+        if format == "json":
             return json.load(handle)
-        return yaml.safe_load(handle)
+        return _load_yaml(handle, loader)
+
+
+def _detect_format(name: str | None) -> str:
+    suffix = Path(name).suffix.lower() if name else ""
+    if suffix in JSON_LINES_SUFFIXES:
+        return "jsonl"
+    if suffix == ".json":
+        return "json"
+    return "yaml"
+
+
+def _iter_json_lines(handle: IO[str], skip_invalid: bool) -> Iterator[DocumentRecord]:
+    index = 0
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            document = json.loads(line)
+        except json.JSONDecodeError as exc:
+            if not skip_invalid:
+                raise ValueError(f"line {line_number}: invalid JSON: {exc}") from exc
+            yield DocumentRecord(index, line_number, None, f"invalid JSON: {exc}")
+        else:
+            yield DocumentRecord(index, line_number, document)
+        index += 1
+
+
+def _iter_yaml_documents(
+    handle: IO[str], loader_cls: type
+) -> Iterator[DocumentRecord]:
+    loader = loader_cls(handle)
+    try:
+        index = 0
+        while loader.check_node():
+            node = loader.get_node()
+            line = node.start_mark.line + 1 if node is not None else 1
+            yield DocumentRecord(index, line, loader.construct_document(node))
+            index += 1
+    finally:
+        loader.dispose()
+
+
+def _iter_handle(
+    handle: IO[str], format: str, skip_invalid: bool, loader: str | None
+) -> Iterator[DocumentRecord]:
+    if format == "jsonl":
+        yield from _iter_json_lines(handle, skip_invalid)
+    elif format == "json":
+        yield DocumentRecord(0, 1, json.load(handle))
+    else:
+        yield from _iter_yaml_documents(handle, yaml_loader(loader))
+
+
+def iter_documents(
+    source: str | Path | IO[str],
+    format: str | None = None,
+    *,
+    skip_invalid: bool = False,
+    loader: str | None = None,
+) -> Iterator[DocumentRecord]:
+    """Yield documents one at a time from a file path or text stream.
+
+    ``format`` is one of ``"yaml"`` (``---``-separated documents), ``"json"``
+    or ``"jsonl"``; by default it is inferred from the file suffix. Records
+    are parsed lazily, so memory use does not grow with the stream length.
+    With ``skip_invalid``, malformed JSON Lines records are yielded with
+    ``error`` set instead of raising. ``loader`` selects the YAML loader; see
+    :func:`yaml_loader`.
+    """
+    if format is not None and format not in STREAM_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(STREAM_FORMATS)}")
+    if isinstance(source, (str, Path)):
+        resolved = Path(source)
+        format = format or _detect_format(resolved.name)
+        with resolved.open(encoding="utf-8") as handle:
+            yield from _iter_handle(handle, format, skip_invalid, loader)
+        return
+    name = getattr(source, "name", None)
+    format = format or _detect_format(name if isinstance(name, str) else None)
+    yield from _iter_handle(source, format, skip_invalid, loader)
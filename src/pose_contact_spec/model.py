@@ -0,0 +1,414 @@
+"""Compact typed representation of canonical state.
+
+:meth:`Scene.from_dict` converts a schema-valid document into slotted
+dataclasses with interned ids and enum-coded vocabulary, and builds a
+:class:`SceneIndex` once so lookups by id need no further scans.
+:meth:`Scene.to_dict` converts back to an equal canonical dict.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import cache
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, ClassVar, Union
+
+from .rules import DEFAULT_RULES
+
+SCHEMA_RESOURCE = "pose-contact.schema.json"
+
+ENTITY_KINDS = DEFAULT_RULES.entity_kinds
+
+
+class CodedEnum(IntEnum):
+    """An integer-coded schema vocabulary whose member names are the values."""
+
+    @classmethod
+    def parse(cls, value: Any) -> CodedEnum:
+        if isinstance(value, str) and value in cls.__members__:
+            return cls[value]
+        raise ValueError(f"invalid {cls.__name__} {value!r}")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+EntityKind = CodedEnum("EntityKind", ENTITY_KINDS, start=0)
+
+# Vocabulary name -> (schema definition, property), and the enum coding each.
+# They are read from the bundled schema on first use, so importing the model
+# does not open it. Enum codes follow the schema's order, which binary
+# documents depend on, so new values must be appended.
+_SCHEMA_VOCABULARIES = {
+    "PREDICATES": ("relation", "predicate"),
+    "BODY_PARTS": ("body_part_ref", "part"),
+    "SIDES": ("body_part_ref", "side"),
+    "ANCHOR_ROLES": ("anchor", "role"),
+    "OWNER_KINDS": ("anchor", "owner_kind"),
+    "INTENSITIES": ("qualifiers", "intensity"),
+}
+_SCHEMA_ENUMS = {
+    "Predicate": "PREDICATES",
+    "BodyPart": "BODY_PARTS",
+    "Side": "SIDES",
+    "AnchorRole": "ANCHOR_ROLES",
+    "OwnerKind": "OWNER_KINDS",
+}
+
+
+@cache
+def _vocabulary() -> SimpleNamespace:
+    """Return the schema vocabularies and their enums, loading them once."""
+    from importlib import resources
+
+    resource = resources.files(__package__).joinpath(SCHEMA_RESOURCE)
+    with resource.open(encoding="utf-8") as handle:
+        definitions = json.load(handle)["definitions"]
+    values = {
+        name: tuple(definitions[definition]["properties"][field]["enum"])
+        for name, (definition, field) in _SCHEMA_VOCABULARIES.items()
+    }
+    for name, vocabulary in _SCHEMA_ENUMS.items():
+        values[name] = CodedEnum(name, values[vocabulary], module=__name__, start=0)
+    return SimpleNamespace(**values)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SCHEMA_VOCABULARIES or name in _SCHEMA_ENUMS:
+        return getattr(_vocabulary(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if TYPE_CHECKING:
+    PREDICATES: tuple[str, ...]
+    BODY_PARTS: tuple[str, ...]
+    SIDES: tuple[str, ...]
+    ANCHOR_ROLES: tuple[str, ...]
+    OWNER_KINDS: tuple[str, ...]
+    INTENSITIES: tuple[str, ...]
+    Predicate = BodyPart = Side = AnchorRole = OwnerKind = CodedEnum
+
+
+def _id(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError(f"invalid id {value!r}")
+    return sys.intern(value)
+
+
+def _optional_dict(values: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in values.items() if value is not None}
+
+
+@dataclass(frozen=True, slots=True)
+class Actor:
+    id: str
+    label: str | None = None
+    type: str = "human"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Actor:
+        return cls(_id(data["id"]), data.get("label"), data["type"])
+
+    def to_dict(self) -> dict[str, Any]:
+        return _optional_dict({"id": self.id, "type": self.type, "label": self.label})
+
+
+@dataclass(frozen=True, slots=True)
+class Object:
+    id: str
+    label: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Object:
+        return cls(_id(data["id"]), data.get("label"))
+
+    def to_dict(self) -> dict[str, Any]:
+        return _optional_dict({"id": self.id, "label": self.label})
+
+
+@dataclass(frozen=True, slots=True)
+class Surface:
+    id: str
+    label: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Surface:
+        return cls(_id(data["id"]), data.get("label"))
+
+    def to_dict(self) -> dict[str, Any]:
+        return _optional_dict({"id": self.id, "label": self.label})
+
+
+@dataclass(frozen=True, slots=True)
+class Anchor:
+    id: str
+    owner_kind: OwnerKind
+    owner: str
+    name: str
+    role: AnchorRole
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Anchor:
+        vocabulary = _vocabulary()
+        return cls(
+            _id(data["id"]),
+            vocabulary.OwnerKind.parse(data["owner_kind"]),
+            _id(data["owner"]),
+            data["name"],
+            vocabulary.AnchorRole.parse(data["role"]),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "owner_kind": self.owner_kind.name,
+            "owner": self.owner,
+            "name": self.name,
+            "role": self.role.name,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class BodyPartRef:
+    kind: ClassVar[EntityKind] = EntityKind.body_part
+    actor: str
+    part: BodyPart
+    side: Side
+
+    @property
+    def target(self) -> str:
+        return self.actor
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": "body_part",
+            "actor": self.actor,
+            "part": self.part.name,
+            "side": self.side.name,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectRef:
+    kind: ClassVar[EntityKind] = EntityKind.object
+    object: str
+
+    @property
+    def target(self) -> str:
+        return self.object
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": "object", "object": self.object}
+
+
+@dataclass(frozen=True, slots=True)
+class SurfaceRef:
+    kind: ClassVar[EntityKind] = EntityKind.surface
+    surface: str
+
+    @property
+    def target(self) -> str:
+        return self.surface
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": "surface", "surface": self.surface}
+
+
+@dataclass(frozen=True, slots=True)
+class AnchorRef:
+    kind: ClassVar[EntityKind] = EntityKind.anchor
+    anchor: str
+
+    @property
+    def target(self) -> str:
+        return self.anchor
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": "anchor", "anchor": self.anchor}
+
+
+EntityRef = Union[BodyPartRef, ObjectRef, SurfaceRef, AnchorRef]
+
+
+def entity_ref_from_dict(data: dict[str, Any]) -> EntityRef:
+    """Convert a canonical entity reference into its typed form."""
+    kind = EntityKind.parse(data.get("kind"))
+    if kind is EntityKind.body_part:
+        vocabulary = _vocabulary()
+        return BodyPartRef(
+            _id(data["actor"]),
+            vocabulary.BodyPart.parse(data["part"]),
+            vocabulary.Side.parse(data["side"]),
+        )
+    if kind is EntityKind.object:
+        return ObjectRef(_id(data["object"]))
+    if kind is EntityKind.surface:
+        return SurfaceRef(_id(data["surface"]))
+    return AnchorRef(_id(data["anchor"]))
+
+
+@dataclass(frozen=True, slots=True)
+class Qualifiers:
+    intensity: str | None = None
+    duration_ms: int | None = None
+    contact_area: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Qualifiers:
+        intensity = data.get("intensity")
+        return cls(
+            None if intensity is None else sys.intern(intensity),
+            data.get("duration_ms"),
+            data.get("contact_area"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return _optional_dict(
+            {
+                "intensity": self.intensity,
+                "duration_ms": self.duration_ms,
+                "contact_area": self.contact_area,
+            }
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Relation:
+    id: str
+    predicate: Predicate
+    subject: EntityRef
+    object: EntityRef
+    qualifiers: Qualifiers | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Relation:
+        qualifiers = data.get("qualifiers")
+        return cls(
+            _id(data["id"]),
+            _vocabulary().Predicate.parse(data["predicate"]),
+            entity_ref_from_dict(data["subject"]),
+            entity_ref_from_dict(data["object"]),
+            None if qualifiers is None else Qualifiers.from_dict(qualifiers),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {
+            "id": self.id,
+            "predicate": self.predicate.name,
+            "subject": self.subject.to_dict(),
+            "object": self.object.to_dict(),
+        }
+        if self.qualifiers is not None:
+            data["qualifiers"] = self.qualifiers.to_dict()
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class SceneIndex:
+    """Id lookups for every entity section of a scene, built once.
+
+    When ids repeat within a section, the first occurrence wins.
+    """
+
+    actors: dict[str, Actor]
+    objects: dict[str, Object]
+    surfaces: dict[str, Surface]
+    anchors: dict[str, Anchor]
+
+    @classmethod
+    def build(cls, scene: Scene) -> SceneIndex:
+        return cls(
+            _first_by_id(scene.actors),
+            _first_by_id(scene.objects or ()),
+            _first_by_id(scene.surfaces or ()),
+            _first_by_id(scene.anchors or ()),
+        )
+
+    def section(self, kind: EntityKind) -> dict[str, Any]:
+        """Return the lookup a reference of ``kind`` resolves against."""
+        if kind is EntityKind.body_part:
+            return self.actors
+        if kind is EntityKind.object:
+            return self.objects
+        if kind is EntityKind.surface:
+            return self.surfaces
+        return self.anchors
+
+    def owners(self, kind: OwnerKind) -> dict[str, Any]:
+        """Return the lookup an anchor owner of ``kind`` resolves against."""
+        return self.objects if kind.name == "object" else self.surfaces
+
+    def owner_label(self, anchor: Anchor) -> str:
+        """Return the label of an anchor's owner, falling back to its id."""
+        owner = self.owners(anchor.owner_kind).get(anchor.owner)
+        if owner is None or owner.label is None:
+            return anchor.owner
+        return owner.label
+
+
+def _first_by_id(items: Any) -> dict[str, Any]:
+    index: dict[str, Any] = {}
+    for item in items:
+        index.setdefault(item.id, item)
+    return index
+
+
+@dataclass(frozen=True, slots=True)
+class Scene:
+    """Typed canonical state.
+
+    Optional sections absent from the source document are ``None`` rather
+    than empty, so :meth:`to_dict` reproduces the document exactly.
+    """
+
+    schema_version: str
+    actors: tuple[Actor, ...]
+    relations: tuple[Relation, ...]
+    objects: tuple[Object, ...] | None = None
+    surfaces: tuple[Surface, ...] | None = None
+    anchors: tuple[Anchor, ...] | None = None
+    index: SceneIndex = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "index", SceneIndex.build(self))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Scene:
+        """Build a scene from a schema-valid canonical instance.
+
+        Raises :class:`ValueError` when the instance does not fit the model;
+        validate it first to get precise issues.
+        """
+        try:
+            return cls(
+                data["schema_version"],
+                tuple(Actor.from_dict(item) for item in data["actors"]),
+                tuple(Relation.from_dict(item) for item in data["relations"]),
+                _section(data, "objects", Object),
+                _section(data, "surfaces", Surface),
+                _section(data, "anchors", Anchor),
+            )
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise ValueError(f"instance does not match the schema: {exc!r}") from None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the canonical dict this scene was built from."""
+        data: dict[str, Any] = {
+            "schema_version": self.schema_version,
+            "actors": [actor.to_dict() for actor in self.actors],
+        }
+        for name in ("objects", "surfaces", "anchors"):
+            items = getattr(self, name)
+            if items is not None:
+                data[name] = [item.to_dict() for item in items]
+        data["relations"] = [relation.to_dict() for relation in self.relations]
+        return data
+
+
+def _section(data: dict[str, Any], name: str, cls: Any) -> tuple[Any, ...] | None:
+    if name not in data:
+        return None
+    return tuple(cls.from_dict(item) for item in data[name])
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, TextIO
+
+from .model import AnchorRef, BodyPartRef, EntityRef, Scene, SceneIndex
 
 
 def _indexed(items: list[dict[str, Any]], key: str = "id") -> dict[str, dict[str, Any]]:
@@ -13,6 +16,25 @@ def _indexed(items: list[dict[str, Any]], key: str = "id") -> dict[str, dict[str
     }
 
 
+def _format_body_part(part: Any, side: Any, actor_label: Any, actor_id: Any) -> str:
+    if side and side != "none":
+        part_desc = f"{side} {part}"
+    else:
+        part_desc = f"{part} (side: {side})" if side else str(part)
+    return f"{part_desc} of {actor_label} ({actor_id})"
+
+
+def _format_labelled(label: Any, item_id: Any) -> str:
+    return f"{label} ({item_id})"
+
+
+def _format_anchor(
+    name: Any, anchor_id: Any, owner_label: Any, owner_id: Any, role: Any
+) -> str:
+    role_note = f", role: {role}" if role else ""
+    return f"{name} ({anchor_id}) on {owner_label} ({owner_id}){role_note}"
+
+
 def _describe_entity(
     entity: dict[str, Any],
     actors: dict[str, dict[str, Any]],
@@ -24,29 +46,23 @@ def _describe_entity(
     if kind == "body_part":
         actor_id = entity.get("actor")
         actor = actors.get(actor_id, {})
-        actor_label = actor.get("label", actor_id)
-        part = entity.get("part")
-        side = entity.get("side")
-        if side and side != "none":
-            part_desc = f"{side} {part}"
-        else:
-            part_desc = f"{part} (side: {side})" if side else str(part)
-        return f"{part_desc} of {actor_label} ({actor_id})"
+        return _format_body_part(
+            entity.get("part"),
+            entity.get("side"),
+            actor.get("label", actor_id),
+            actor_id,
+        )
     if kind == "object":
         object_id = entity.get("object")
         obj = objects.get(object_id, {})
-        label = obj.get("label", object_id)
-        return f"{label} ({object_id})"
+        return _format_labelled(obj.get("label", object_id), object_id)
     if kind == "surface":
         surface_id = entity.get("surface")
         surface = surfaces.get(surface_id, {})
-        label = surface.get("label", surface_id)
-        return f"{label} ({surface_id})"
+        return _format_labelled(surface.get("label", surface_id), surface_id)
     if kind == "anchor":
         anchor_id = entity.get("anchor")
         anchor = anchors.get(anchor_id, {})
-        name = anchor.get("name", anchor_id)
-        role = anchor.get("role")
         owner_kind = anchor.get("owner_kind")
         owner_id = anchor.get("owner")
         owner_label = owner_id
@@ -54,11 +70,46 @@ def _describe_entity(
             owner_label = objects.get(owner_id, {}).get("label", owner_id)
         elif owner_kind == "surface":
             owner_label = surfaces.get(owner_id, {}).get("label", owner_id)
-        role_note = f", role: {role}" if role else ""
-        return f"{name} ({anchor_id}) on {owner_label} ({owner_id}){role_note}"
+        return _format_anchor(
+            anchor.get("name", anchor_id),
+            anchor_id,
+            owner_label,
+            owner_id,
+            anchor.get("role"),
+        )
     return "unknown entity"
 
 
+def _label_or_id(item: Any, item_id: str) -> str:
+    if item is None or item.label is None:
+        return item_id
+    return item.label
+
+
+def _describe_ref(entity: EntityRef, index: SceneIndex) -> str:
+    if isinstance(entity, BodyPartRef):
+        actor = index.actors.get(entity.actor)
+        return _format_body_part(
+            entity.part.name,
+            entity.side.name,
+            _label_or_id(actor, entity.actor),
+            entity.actor,
+        )
+    if isinstance(entity, AnchorRef):
+        anchor = index.anchors.get(entity.anchor)
+        if anchor is None:
+            return _format_anchor(entity.anchor, entity.anchor, None, None, None)
+        return _format_anchor(
+            anchor.name,
+            anchor.id,
+            index.owner_label(anchor),
+            anchor.owner,
+            anchor.role.name,
+        )
+    item = index.section(entity.kind).get(entity.target)
+    return _format_labelled(_label_or_id(item, entity.target), entity.target)
+
+
 def _format_qualifiers(qualifiers: dict[str, Any] | None) -> str:
     if not qualifiers:
         return ""
@@ -66,29 +117,317 @@ def _format_qualifiers(qualifiers: dict[str, Any] | None) -> str:
     return f" (qualifiers: {', '.join(parts)})"
 
 
-def project_narrative(instance: dict[str, Any]) -> str:
-    """Create a minimal narrative projection from canonical state."""
-    actors = _indexed(instance.get("actors", []))
-    objects = _indexed(instance.get("objects", []))
-    surfaces = _indexed(instance.get("surfaces", []))
-    anchors = _indexed(instance.get("anchors", []))
-
-    lines = ["Narrative Projection (non-authoritative):", ""]
-    for relation in instance.get("relations", []):
-        if not isinstance(relation, dict):
-            continue
-        predicate = relation.get("predicate", "relation")
-        subject = relation.get("subject", {})
-        object_ref = relation.get("object", {})
-        subject_desc = _describe_entity(subject, actors, objects, surfaces, anchors)
-        object_desc = _describe_entity(object_ref, actors, objects, surfaces, anchors)
-        verb = predicate.replace("_", " ")
-        qualifiers = _format_qualifiers(relation.get("qualifiers"))
-        lines.append(f"- {subject_desc} is {verb} {object_desc}.{qualifiers}")
-
-    lines.append("")
-    lines.append(
-        "Notes: This projection is derived from canonical state and MUST NOT be treated "
-        "as authoritative."
-    )
-    return "\n".join(lines)
+_HEADER = ("Narrative Projection (non-authoritative):", "")
+_FOOTER = (
+    "",
+    "Notes: This projection is derived from canonical state and MUST NOT be treated "
+    "as authoritative.",
+)
+
+
+def _ref_key(entity: dict[str, Any]) -> tuple[Any, ...]:
+    kind = entity.get("kind")
+    if kind == "body_part":
+        return (kind, entity.get("actor"), entity.get("part"), entity.get("side"))
+    if kind in ("object", "surface", "anchor"):
+        return (kind, entity.get(kind))
+    return (None,)
+
+
+class NarrativeProjector:
+    """Projects one scene, describing each distinct entity reference once.
+
+    Build one projector per scene and reuse it for every projection of that
+    scene. ``instance`` may be a canonical dict or a typed
+    :class:`~.model.Scene`.
+
+    Projections may be filtered, as ``spec/narrative-projection.md`` allows
+    omitting facts irrelevant to an interaction. Every filter is optional,
+    and a relation must pass all of those given:
+
+    - ``predicates`` keeps relations whose predicate is listed.
+    - ``actors`` keeps relations with a body part of a listed actor on
+      either side.
+    - ``entities`` keeps relations referencing a listed id on either side.
+      An anchor also matches its owner's id.
+    """
+
+    def __init__(self, instance: dict[str, Any] | Scene) -> None:
+        self._scene = instance if isinstance(instance, Scene) else None
+        self._instance = instance
+        self._descriptions: dict[Any, str] = {}
+        self._verbs: dict[str, str] = {}
+        self._link_map: dict[str, set[str]] | None = None
+        if self._scene is None:
+            self._actors = _indexed(instance.get("actors", []))
+            self._objects = _indexed(instance.get("objects", []))
+            self._surfaces = _indexed(instance.get("surfaces", []))
+            self._anchors = _indexed(instance.get("anchors", []))
+
+    def _describe(self, entity: Any) -> str:
+        if self._scene is not None:
+            key = entity
+        else:
+            key = _ref_key(entity)
+        try:
+            return self._descriptions[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable values in an invalid document: describe uncached.
+            return self._describe_uncached(entity)
+        description = self._descriptions[key] = self._describe_uncached(entity)
+        return description
+
+    def _describe_uncached(self, entity: Any) -> str:
+        if self._scene is not None:
+            return _describe_ref(entity, self._scene.index)
+        return _describe_entity(
+            entity, self._actors, self._objects, self._surfaces, self._anchors
+        )
+
+    def _verb(self, predicate: Any) -> str:
+        verb = self._verbs.get(predicate)
+        if verb is None:
+            verb = self._verbs[predicate] = predicate.replace("_", " ")
+        return verb
+
+    def _relations(self) -> Iterator[tuple[Any, Any, Any, dict[str, Any] | None]]:
+        if self._scene is not None:
+            for relation in self._scene.relations:
+                qualifiers = relation.qualifiers
+                yield (
+                    relation.predicate.name,
+                    relation.subject,
+                    relation.object,
+                    None if qualifiers is None else qualifiers.to_dict(),
+                )
+            return
+        for relation in self._instance.get("relations", []):
+            if not isinstance(relation, dict):
+                continue
+            yield (
+                relation.get("predicate", "relation"),
+                relation.get("subject", {}),
+                relation.get("object", {}),
+                relation.get("qualifiers"),
+            )
+
+    def _ref_ids(self, entity: Any) -> tuple[Any, Any, Any]:
+        """Return (kind, referenced id, anchor owner id) for a reference."""
+        if self._scene is not None:
+            owner = None
+            if isinstance(entity, AnchorRef):
+                anchor = self._scene.index.anchors.get(entity.anchor)
+                owner = None if anchor is None else anchor.owner
+            return entity.kind.name, entity.target, owner
+        if not isinstance(entity, dict):
+            return None, None, None
+        kind = entity.get("kind")
+        target = entity.get("actor" if kind == "body_part" else kind)
+        owner = None
+        if kind == "anchor":
+            owner = self._anchors.get(target, {}).get("owner")
+        return kind, target, owner
+
+    def _keeps(
+        self,
+        predicate: Any,
+        refs: tuple[Any, Any],
+        predicates: frozenset[str] | None,
+        actors: frozenset[str] | None,
+        entities: frozenset[str] | None,
+    ) -> bool:
+        if predicates is not None and predicate not in predicates:
+            return False
+        if actors is None and entities is None:
+            return True
+        ids = [self._ref_ids(entity) for entity in refs]
+        if actors is not None and not any(
+            kind == "body_part" and target in actors for kind, target, _ in ids
+        ):
+            return False
+        return entities is None or any(
+            target in entities or owner in entities for _, target, owner in ids
+        )
+
+    def iter_relation_lines(
+        self,
+        *,
+        predicates: Iterable[str] | None = None,
+        actors: Iterable[str] | None = None,
+        entities: Iterable[str] | None = None,
+    ) -> Iterator[str]:
+        """Yield one line per relation kept by the filters."""
+        predicate_set = None if predicates is None else frozenset(predicates)
+        actor_set = None if actors is None else frozenset(actors)
+        entity_set = None if entities is None else frozenset(entities)
+        filtered = not (predicate_set is None and actor_set is None)
+        filtered = filtered or entity_set is not None
+        for predicate, subject, object_ref, qualifiers in self._relations():
+            if filtered and not self._keeps(
+                predicate, (subject, object_ref), predicate_set, actor_set, entity_set
+            ):
+                continue
+            yield self._line(predicate, subject, object_ref, qualifiers)
+
+    def _line(
+        self,
+        predicate: Any,
+        subject: Any,
+        object_ref: Any,
+        qualifiers: dict[str, Any] | None,
+    ) -> str:
+        describe = self._describe
+        return (
+            f"- {describe(subject)} is {self._verb(predicate)} "
+            f"{describe(object_ref)}.{_format_qualifiers(qualifiers)}"
+        )
+
+    def _links(self) -> dict[str, set[str]]:
+        """Entity id -> ids it shares a relation with or owns/is owned by."""
+        if self._link_map is not None:
+            return self._link_map
+        links: dict[str, set[str]] = {}
+
+        def link(first: Any, second: Any) -> None:
+            if isinstance(first, str) and isinstance(second, str):
+                links.setdefault(first, set()).add(second)
+                links.setdefault(second, set()).add(first)
+
+        for _, subject, object_ref, _ in self._relations():
+            link(self._ref_ids(subject)[1], self._ref_ids(object_ref)[1])
+        if self._scene is not None:
+            for anchor in self._scene.index.anchors.values():
+                link(anchor.id, anchor.owner)
+        else:
+            for anchor_id, anchor in self._anchors.items():
+                link(anchor_id, anchor.get("owner"))
+        self._link_map = links
+        return links
+
+    def _distances(
+        self, focus: Iterable[str], max_distance: int | None
+    ) -> dict[str, int]:
+        links = self._links()
+        distances = {entity: 0 for entity in focus}
+        queue = deque(distances)
+        while queue:
+            entity = queue.popleft()
+            distance = distances[entity] + 1
+            if max_distance is not None and distance > max_distance:
+                continue
+            for neighbour in links.get(entity, ()):
+                if neighbour not in distances:
+                    distances[neighbour] = distance
+                    queue.append(neighbour)
+        return distances
+
+    def focused_relation_lines(
+        self,
+        focus: Iterable[str] | None = None,
+        *,
+        budget: int | None = None,
+        measure: Callable[[str], int] = len,
+        max_distance: int | None = None,
+    ) -> list[str]:
+        """Return the relation lines most relevant to ``focus`` within ``budget``.
+
+        ``focus`` holds actor, object, surface or anchor ids. Entities are
+        linked by the relations between them and by anchor ownership, and a
+        relation is as far from the focus as the nearer of its subject and
+        object. Relations are taken nearest first, in document order within
+        one distance, until the next would take the whole projection past
+        ``budget``; relations not connected to the focus, or further than
+        ``max_distance``, are never taken. Without ``focus`` every relation
+        is equally near.
+
+        ``budget`` is measured with ``measure``, characters by default; pass
+        e.g. ``lambda text: len(tokenizer.encode(text))`` for a token budget.
+        The header and notes always count against it. Lines are rendered
+        exactly as in the full projection and kept in document order.
+        """
+        distances = None if focus is None else self._distances(focus, max_distance)
+        candidates = []
+        for position, record in enumerate(self._relations()):
+            distance = 0
+            if distances is not None:
+                hops = [
+                    distances[target]
+                    for target in (
+                        self._ref_ids(record[1])[1],
+                        self._ref_ids(record[2])[1],
+                    )
+                    if isinstance(target, str) and target in distances
+                ]
+                if not hops:
+                    continue
+                distance = min(hops)
+            candidates.append((distance, position, record))
+        candidates.sort(key=lambda candidate: candidate[:2])
+
+        remaining = None
+        if budget is not None:
+            remaining = budget - measure("\n".join(_HEADER + _FOOTER))
+        selected = []
+        for _, position, record in candidates:
+            line = self._line(*record)
+            if remaining is not None:
+                remaining -= measure("\n" + line)
+                if remaining < 0:
+                    break
+            selected.append((position, line))
+        selected.sort()
+        return [line for _, line in selected]
+
+    def render_focused(self, focus: Iterable[str] | None = None, **options: Any) -> str:
+        """Return a projection of :meth:`focused_relation_lines` only."""
+        lines = self.focused_relation_lines(focus, **options)
+        return "\n".join((*_HEADER, *lines, *_FOOTER))
+
+    def iter_lines(self, **filters: Any) -> Iterator[str]:
+        """Yield the lines of the projection, header and notes included.
+
+        Accepts the filters of :meth:`iter_relation_lines`.
+        """
+        yield from _HEADER
+        yield from self.iter_relation_lines(**filters)
+        yield from _FOOTER
+
+    def render(self, **filters: Any) -> str:
+        """Return the projection as one string, as :func:`project_narrative`."""
+        return "\n".join(self.iter_lines(**filters))
+
+    def write(self, sink: TextIO, **filters: Any) -> None:
+        """Write the projection to a text stream without building it in memory.
+
+        The text written equals :meth:`render`'s result.
+        """
+        lines = self.iter_lines(**filters)
+        sink.write(next(lines))
+        for line in lines:
+            sink.write("\n")
+            sink.write(line)
+
+
+def project_narrative(
+    instance: dict[str, Any] | Scene,
+    *,
+    focus: Iterable[str] | None = None,
+    budget: int | None = None,
+    measure: Callable[[str], int] = len,
+) -> str:
+    """Create a minimal narrative projection from canonical state.
+
+    ``instance`` may be a canonical dict or a typed :class:`~.model.Scene`,
+    whose prebuilt index is used for lookups; the output is the same. Use a
+    :class:`NarrativeProjector` to stream or filter the projection.
+
+    With ``focus`` or ``budget``, only the relations nearest the focus
+    entities that fit the budget are projected; see
+    :meth:`NarrativeProjector.focused_relation_lines`.
+    """
+    projector = NarrativeProjector(instance)
+    if focus is None and budget is None:
+        return projector.render()
+    return projector.render_focused(focus, budget=budget, measure=measure)
@@ -0,0 +1,122 @@
+"""Predicate pairing rules, compiled from a declarative definition.
+
+The rules say which (subject kind, object kind) pairs each predicate
+accepts. They are defined once in the bundled ``pairing-rules.json``::
+
+    {
+      "entity_kinds": ["body_part", "object", "surface", "anchor"],
+      "predicates": {
+        "touching": {"subjects": ["body_part"], "objects": [...],
+                     "symmetric": true},
+        "gripping": {"subjects": ["body_part"], "objects": ["object", "anchor"]},
+        "left_of": {}
+      }
+    }
+
+A predicate without ``subjects`` and ``objects`` accepts any pairing, as do
+predicates the rules do not mention. ``symmetric`` also accepts each pair
+reversed. :class:`PairingRules` expands the definition once into a set of
+allowed pairs per predicate and precomputes the message reported for a
+disallowed pairing, so checking a relation is a single set lookup.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import product
+from pathlib import Path
+from typing import Any, Mapping
+
+RULES_RESOURCE = "pairing-rules.json"
+
+_ANY_PAIRING = "any entity reference"
+
+
+class PairingRules:
+    """Allowed entity-kind pairings per predicate, with their messages.
+
+    ``pairings`` maps each constrained predicate to its allowed
+    (subject kind, object kind) pairs and ``expected`` to the description
+    used in issue messages; ``symmetric`` holds the predicates whose subject
+    and object can be swapped. All are built when the rules are created and
+    never change; :meth:`extend` returns new rules.
+    """
+
+    def __init__(self, definition: Mapping[str, Any]) -> None:
+        self.definition = definition
+        self.entity_kinds: tuple[str, ...] = tuple(definition["entity_kinds"])
+        self.predicates: tuple[str, ...] = tuple(definition["predicates"])
+        self.symmetric = frozenset(
+            predicate
+            for predicate, rule in definition["predicates"].items()
+            if rule.get("symmetric", False)
+        )
+        pairings: dict[str, frozenset[tuple[str, str]]] = {}
+        expected: dict[str, str] = {}
+        for predicate, rule in definition["predicates"].items():
+            compiled = self._compile(predicate, rule)
+            if compiled is not None:
+                pairings[predicate], expected[predicate] = compiled
+        self.pairings = pairings
+        self.expected = expected
+
+    def _compile(
+        self, predicate: str, rule: Mapping[str, Any]
+    ) -> tuple[frozenset[tuple[str, str]], str] | None:
+        if "subjects" not in rule and "objects" not in rule:
+            return None
+        subjects = rule.get("subjects", self.entity_kinds)
+        objects = rule.get("objects", self.entity_kinds)
+        unknown = (set(subjects) | set(objects)) - set(self.entity_kinds)
+        if unknown:
+            raise ValueError(
+                f"predicate '{predicate}' names unknown entity kinds: "
+                f"{', '.join(sorted(unknown))}"
+            )
+        pairs = set(product(subjects, objects))
+        if rule.get("symmetric", False):
+            pairs |= {(right, left) for left, right in pairs}
+            return frozenset(pairs), f"{'/'.join(subjects)} ↔ {'/'.join(objects)}"
+        description = f"{'/'.join(sorted(subjects))} → {'/'.join(sorted(objects))}"
+        return frozenset(pairs), description
+
+    def allows(
+        self, predicate: str, subject_kind: str | None, object_kind: str | None
+    ) -> bool:
+        """Return whether ``predicate`` accepts the pairing.
+
+        Unknown kinds (``None``) are reported elsewhere and always pass.
+        """
+        if subject_kind is None or object_kind is None:
+            return True
+        allowed = self.pairings.get(predicate)
+        return allowed is None or (subject_kind, object_kind) in allowed
+
+    def describe(self, predicate: str) -> str:
+        """Return the pairing ``predicate`` requires, as used in messages."""
+        return self.expected.get(predicate, _ANY_PAIRING)
+
+    def extend(self, predicates: Mapping[str, Mapping[str, Any]]) -> PairingRules:
+        """Return rules with extra or replaced predicate definitions.
+
+        Extension predicates still have to pass the schema, so validating
+        documents that use them needs a schema that accepts them too.
+        """
+        definition = dict(self.definition)
+        definition["predicates"] = {**self.definition["predicates"], **predicates}
+        return PairingRules(definition)
+
+
+def load_rules(path: str | Path | None = None) -> PairingRules:
+    """Load pairing rules from a JSON file, by default the bundled ones."""
+    if path is None:
+        from importlib import resources
+
+        resource = resources.files(__package__).joinpath(RULES_RESOURCE)
+        with resource.open(encoding="utf-8") as handle:
+            return PairingRules(json.load(handle))
+    with Path(path).open(encoding="utf-8") as handle:
+        return PairingRules(json.load(handle))
+
+
+DEFAULT_RULES = load_rules()
@@ -0,0 +1,350 @@
+"""Per-frame canonical state stored as keyframes and relation deltas.
+
+A sequence is a mapping with a ``frames`` list. Each frame is either
+``{"keyframe": <canonical document>}`` or ``{"delta": {...}}``, which is
+applied to the previous frame. A delta may hold these operations, applied
+in this order and keyed by relation ``id``:
+
+- ``remove``: ids of relations to drop;
+- ``modify``: relations that replace the relation with the same id in place;
+- ``add``: relations appended after the existing ones.
+
+Only relations change between keyframes. Actors, objects, surfaces, anchors
+and ``schema_version`` come from the most recent keyframe, so changing them
+takes a new keyframe. The first frame must be a keyframe::
+
+    frames:
+      - keyframe: {schema_version: "0.2.0", actors: [...], relations: [...]}
+      - delta: {remove: [rel_2], add: [{id: rel_3, predicate: touching, ...}]}
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .load import load_document
+from .session import _item_id
+from .validate import (
+    CompiledValidator,
+    ValidationIssue,
+    _collect_ids,
+    _iter_relation_issues,
+    compiled_validator,
+)
+
+DELTA_OPERATIONS = ("remove", "modify", "add")
+DEFAULT_KEYFRAME_INTERVAL = 30
+
+
+def _relations_by_id(document: dict[str, Any]) -> dict[str, Any]:
+    relations: dict[str, Any] = {}
+    for relation in document.get("relations", ()):
+        relation_id = _item_id(relation)
+        if relation_id is not None:
+            relations.setdefault(relation_id, relation)
+    return relations
+
+
+def _apply_delta(relations: dict[str, Any], delta: dict[str, Any]) -> None:
+    for relation_id in delta.get("remove", ()):
+        relations.pop(relation_id, None)
+    for relation in delta.get("modify", ()):
+        relation_id = _item_id(relation)
+        if relation_id in relations:
+            relations[relation_id] = relation
+    for relation in delta.get("add", ()):
+        relation_id = _item_id(relation)
+        if relation_id is not None:
+            relations.setdefault(relation_id, relation)
+
+
+def _diff(previous: dict[str, Any], frame: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the delta turning ``previous`` into ``frame``, if one exists.
+
+    ``None`` means ``frame`` needs a keyframe: something besides relations
+    changed, relation ids are missing or repeated, or the new relation order
+    is not the one applying the delta produces.
+    """
+    if not isinstance(frame, dict) or any(
+        previous.get(key) != value for key, value in frame.items() if key != "relations"
+    ):
+        return None
+    if set(previous) != set(frame) or not isinstance(frame.get("relations"), list):
+        return None
+    old, new = _relations_by_id(previous), _relations_by_id(frame)
+    if len(old) != len(previous.get("relations", ())) or len(new) != len(
+        frame.get("relations", ())
+    ):
+        return None
+    kept = [relation_id for relation_id in old if relation_id in new]
+    added = [
+        relation for relation_id, relation in new.items() if relation_id not in old
+    ]
+    if kept + [relation["id"] for relation in added] != list(new):
+        return None
+    delta: dict[str, Any] = {}
+    remove = [relation_id for relation_id in old if relation_id not in new]
+    modify = [
+        new[relation_id] for relation_id in kept if old[relation_id] != new[relation_id]
+    ]
+    for name, items in (("remove", remove), ("modify", modify), ("add", added)):
+        if items:
+            delta[name] = items
+    return delta
+
+
+class FrameSequence:
+    """Random access to the frames of a keyframe/delta sequence.
+
+    ``data`` is a sequence mapping as described in the module docstring;
+    validate it with :func:`validate_sequence` first, since malformed deltas
+    are skipped silently. Reconstructing a frame replays the deltas since the
+    nearest keyframe before it, resuming from the last frame reconstructed
+    when that is closer. Reconstructed frames share relation dicts with the
+    sequence and with each other; treat them as read-only.
+    """
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        frames = data.get("frames") if isinstance(data, dict) else None
+        if not isinstance(frames, list) or not frames:
+            raise ValueError("sequence must be a mapping with a non-empty frames list")
+        if not isinstance(frames[0], dict) or "keyframe" not in frames[0]:
+            raise ValueError("the first frame must be a keyframe")
+        self._frames = frames
+        self.keyframes = tuple(
+            index
+            for index, frame in enumerate(frames)
+            if isinstance(frame, dict) and "keyframe" in frame
+        )
+        # (frame index, relations by id) of the last reconstructed frame.
+        self._cursor: tuple[int, dict[str, Any]] | None = None
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Iterable[dict[str, Any]],
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+    ) -> FrameSequence:
+        """Encode full canonical documents, one per frame.
+
+        A keyframe is written every ``keyframe_interval`` frames, and
+        whenever a frame cannot be expressed as a relation delta. Every frame
+        reconstructs to a document equal to the one given.
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        encoded: list[dict[str, Any]] = []
+        previous: dict[str, Any] | None = None
+        since_keyframe = 0
+        for frame in frames:
+            delta = None
+            if previous is not None and since_keyframe < keyframe_interval:
+                delta = _diff(previous, frame)
+            if delta is None:
+                encoded.append({"keyframe": frame})
+                since_keyframe = 1
+            else:
+                encoded.append({"delta": delta})
+                since_keyframe += 1
+            previous = frame
+        return cls({"frames": encoded})
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the sequence mapping, ready to dump as YAML or JSON."""
+        return {"frames": self._frames}
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        keyframe: dict[str, Any] = {}
+        relations: dict[str, Any] = {}
+        for frame in self._frames:
+            if "keyframe" in frame:
+                keyframe = frame["keyframe"]
+                relations = _relations_by_id(keyframe)
+                yield dict(keyframe)
+                continue
+            _apply_delta(relations, frame["delta"])
+            yield {**keyframe, "relations": list(relations.values())}
+
+    def frame(self, index: int) -> dict[str, Any]:
+        """Reconstruct the canonical document of frame ``index``."""
+        if index < 0:
+            index += len(self._frames)
+        if not 0 <= index < len(self._frames):
+            raise IndexError("frame index out of range")
+        start = self.keyframes[bisect_right(self.keyframes, index) - 1]
+        keyframe = self._frames[start]["keyframe"]
+        if index == start:
+            return dict(keyframe)
+        if self._cursor is not None and start <= self._cursor[0] <= index:
+            position, relations = self._cursor
+        else:
+            position, relations = start, _relations_by_id(keyframe)
+        for frame in islice(self._frames, position + 1, index + 1):
+            _apply_delta(relations, frame["delta"])
+        self._cursor = (index, relations)
+        return {**keyframe, "relations": list(relations.values())}
+
+
+def load_sequence(path: str | Path) -> FrameSequence:
+    """Load a YAML or JSON sequence from disk."""
+    return FrameSequence(load_document(path))
+
+
+def _rebased(
+    issues: Iterable[ValidationIssue], old_prefix: str, new_prefix: str
+) -> Iterator[ValidationIssue]:
+    for issue in issues:
+        suffix = issue.path[len(old_prefix) :].rstrip("/")
+        yield ValidationIssue(new_prefix + suffix, issue.message)
+
+
+def _iter_keyframe_issues(
+    keyframe: Any, prefix: str, validator: CompiledValidator
+) -> Iterator[ValidationIssue]:
+    yield from _rebased(validator.validate_parsed(keyframe), "", prefix)
+    if not isinstance(keyframe, dict):
+        return
+    seen: set[str] = set()
+    relations = keyframe.get("relations")
+    for index, relation in enumerate(relations if isinstance(relations, list) else ()):
+        relation_id = _item_id(relation)
+        if relation_id in seen:
+            yield ValidationIssue(
+                f"{prefix}/relations/{index}/id",
+                f"duplicate relation id '{relation_id}'",
+            )
+        elif relation_id is not None:
+            seen.add(relation_id)
+
+
+def _iter_delta_issues(
+    delta: Any,
+    prefix: str,
+    ids: dict[str, set[str]],
+    relation_ids: set[str],
+    validator: CompiledValidator,
+) -> Iterator[ValidationIssue]:
+    """Check one delta against the id index of its keyframe.
+
+    ``relation_ids`` holds the relation ids of the previous frame and is
+    updated to those of this frame.
+    """
+    if not isinstance(delta, dict):
+        yield ValidationIssue(prefix, "delta must be a mapping")
+        return
+    for name in delta:
+        if name not in DELTA_OPERATIONS:
+            yield ValidationIssue(
+                f"{prefix}/{name}", f"unknown delta operation '{name}'"
+            )
+    for name in DELTA_OPERATIONS:
+        items = delta.get(name, [])
+        if not isinstance(items, list):
+            yield ValidationIssue(f"{prefix}/{name}", "must be a list")
+            continue
+        for index, item in enumerate(items):
+            path = f"{prefix}/{name}/{index}"
+            if name == "remove":
+                if not isinstance(item, str):
+                    yield ValidationIssue(path, "relation id must be a string")
+                elif item not in relation_ids:
+                    yield ValidationIssue(path, f"unknown relation id '{item}'")
+                else:
+                    relation_ids.discard(item)
+                continue
+            yield from _iter_delta_relation_issues(item, index, path, ids, validator)
+            relation_id = _item_id(item)
+            if relation_id is None:
+                continue
+            if name == "modify" and relation_id not in relation_ids:
+                yield ValidationIssue(
+                    f"{path}/id", f"unknown relation id '{relation_id}'"
+                )
+            elif name == "add" and relation_id in relation_ids:
+                yield ValidationIssue(
+                    f"{path}/id", f"duplicate relation id '{relation_id}'"
+                )
+            else:
+                relation_ids.add(relation_id)
+
+
+def _iter_delta_relation_issues(
+    relation: Any,
+    index: int,
+    path: str,
+    ids: dict[str, set[str]],
+    validator: CompiledValidator,
+) -> Iterator[ValidationIssue]:
+    item_prefix = f"/relations/{index}"
+    schema_issues = validator.item_schema_issues("relations", index, relation)
+    if schema_issues:
+        yield from _rebased(schema_issues, item_prefix, path)
+        return
+    semantic = _iter_relation_issues(
+        relation, index, ids, validator.pairings, validator.expected_pairings
+    )
+    yield from _rebased(semantic, item_prefix, path)
+
+
+def _iter_sequence_issues(
+    data: Any, validator: CompiledValidator
+) -> Iterator[ValidationIssue]:
+    frames = data.get("frames") if isinstance(data, dict) else None
+    if not isinstance(frames, list) or not frames:
+        yield ValidationIssue("/frames", "sequence needs a non-empty frames list")
+        return
+    ids: dict[str, set[str]] = {}
+    relation_ids: set[str] = set()
+    for index, frame in enumerate(frames):
+        prefix = f"/frames/{index}"
+        if not isinstance(frame, dict) or len(frame) != 1:
+            yield ValidationIssue(
+                prefix, "frame must hold exactly one of 'keyframe' or 'delta'"
+            )
+            continue
+        if "keyframe" in frame:
+            keyframe = frame["keyframe"]
+            yield from _iter_keyframe_issues(keyframe, f"{prefix}/keyframe", validator)
+            if isinstance(keyframe, dict):
+                ids = _collect_ids(keyframe)
+                relation_ids = set(_relations_by_id(keyframe))
+        elif "delta" in frame:
+            if index == 0:
+                yield ValidationIssue(prefix, "the first frame must be a keyframe")
+                continue
+            yield from _iter_delta_issues(
+                frame["delta"], f"{prefix}/delta", ids, relation_ids, validator
+            )
+        else:
+            yield ValidationIssue(
+                prefix, "frame must hold exactly one of 'keyframe' or 'delta'"
+            )
+
+
+def validate_sequence(
+    sequence: dict[str, Any] | FrameSequence,
+    schema: dict[str, Any] | None = None,
+    *,
+    max_issues: int | None = None,
+) -> list[ValidationIssue]:
+    """Validate a keyframe/delta sequence, returning any issues found.
+
+    Keyframes are validated in full against the schema. Each relation in a
+    delta is checked on its own against the schema's relation item and
+    against the id index of its keyframe, and each delta's ids are checked
+    against the relations of the previous frame, so the cost of a delta
+    frame is proportional to the delta. Paths point into the sequence, e.g.
+    ``/frames/12/delta/add/0/object/anchor``.
+    """
+    if max_issues is not None and max_issues < 1:
+        raise ValueError("max_issues must be at least 1")
+    if isinstance(sequence, FrameSequence):
+        sequence = sequence.to_dict()
+    issues = _iter_sequence_issues(sequence, compiled_validator(schema))
+    return list(islice(issues, max_issues))
@@ -0,0 +1,496 @@
+"""Long-running validation service over HTTP or a Unix socket.
+
+The server compiles the schema once and validates request bodies on a
+bounded worker pool. Endpoints:
+
+``POST /validate``
+    One JSON or YAML document; responds ``{"valid": ..., "issues": [...]}``.
+``POST /validate/batch``
+    A JSON array of documents, or a ``---``-separated YAML stream; responds
+    ``{"results": [{"valid": ..., "issues": [...]}, ...]}`` in input order.
+``GET /healthz``
+    ``{"status": "ok"}`` once the validator is compiled.
+``GET /metrics``
+    Request and document counters in the Prometheus text format.
+
+Issues are serialized as ``{"path": ..., "message": ...}`` objects, exactly as
+:class:`~pose_contact_spec.validate.ValidationIssue` reports them. Bodies
+larger than ``max_body_bytes`` or batches longer than ``max_batch`` get 413;
+when ``max_pending`` requests are already being read or validated, new ones
+get 503 with ``Retry-After`` before their body is read, instead of queueing
+without bound. A single document is parsed on the pool along with its
+validation; a batch is split across the workers, and parsing it stops as
+soon as it is known to be too long. Any other failure gets 500 with a JSON
+``{"error": ...}`` body and is counted under that status in ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import signal
+import socket
+import stat
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Iterator
+from urllib.parse import parse_qs, urlsplit
+
+import yaml
+
+from . import batch
+from .batch import EXECUTORS, _chunked, _init_worker
+from .load import iter_documents, loads_document
+from .validate import ValidationIssue, compiled_validator
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BODY_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_BATCH = 1000
+DEFAULT_MAX_PENDING = 64
+
+_JSON_TYPES = ("application/json", "text/json")
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class RequestError(Exception):
+    """A request the server rejects with an HTTP error status."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Raised in worker processes too, so it must survive pickling.
+        return type(self), (self.status, str(self))
+
+
+def _validate_documents(
+    documents: list[Any], max_issues: int | None
+) -> list[list[ValidationIssue]]:
+    """Validate parsed documents with the warm validator of this process."""
+    validator = batch._WORKER_VALIDATOR or compiled_validator()
+    return [validator.validate_parsed(document, max_issues) for document in documents]
+
+
+def _validate_body(
+    body: bytes, content_type: str, max_issues: int | None
+) -> list[list[ValidationIssue]]:
+    """Parse and validate a single-document body in a worker."""
+    return _validate_documents(_parse_body(body, content_type, False), max_issues)
+
+
+def _result(issues: list[ValidationIssue]) -> dict[str, Any]:
+    return {"valid": not issues, "issues": [asdict(issue) for issue in issues]}
+
+
+class _Metrics:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests: dict[tuple[str, int], int] = {}
+        self.documents = 0
+        self.invalid_documents = 0
+        self.issues = 0
+        self.validation_seconds = 0.0
+        self.in_flight = 0
+
+    def request(self, endpoint: str, status: int) -> None:
+        with self.lock:
+            key = (endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def validated(self, results: list[list[ValidationIssue]], seconds: float) -> None:
+        with self.lock:
+            self.documents += len(results)
+            self.invalid_documents += sum(1 for issues in results if issues)
+            self.issues += sum(len(issues) for issues in results)
+            self.validation_seconds += seconds
+
+    def render(self) -> str:
+        with self.lock:
+            lines = ["# TYPE pose_contact_server_requests_total counter"]
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(
+                    "pose_contact_server_requests_total"
+                    f'{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+            counters = (
+                ("documents", self.documents),
+                ("invalid_documents", self.invalid_documents),
+                ("issues", self.issues),
+            )
+            for name, value in counters:
+                lines.append(f"# TYPE pose_contact_server_{name}_total counter")
+                lines.append(f"pose_contact_server_{name}_total {value}")
+            lines.append("# TYPE pose_contact_server_validation_seconds_total counter")
+            lines.append(
+                f"pose_contact_server_validation_seconds_total "
+                f"{self.validation_seconds!r}"
+            )
+            lines.append("# TYPE pose_contact_server_in_flight gauge")
+            lines.append(f"pose_contact_server_in_flight {self.in_flight}")
+        return "\n".join(lines) + "\n"
+
+
+class ValidationService:
+    """The request handling shared by the HTTP and Unix socket servers."""
+
+    def __init__(
+        self,
+        *,
+        workers: int | None = None,
+        executor: str = "thread",
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        workers = workers or os.cpu_count() or 1
+        self.workers = workers
+        # Compile before accepting requests so the first one is not slow.
+        compiled_validator()
+        self.pool: Executor
+        if executor == "process":
+            self.pool = ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(None,)
+            )
+        else:
+            self.pool = ThreadPoolExecutor(workers, thread_name_prefix="validate")
+        self.max_body_bytes = max_body_bytes
+        self.max_batch = max_batch
+        self.metrics = _Metrics()
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the ``max_pending`` slots, or raise 503 when none is free."""
+        if not self._slots.acquire(blocking=False):
+            raise RequestError(
+                HTTPStatus.SERVICE_UNAVAILABLE, "server is at capacity, retry later"
+            )
+        with self.metrics.lock:
+            self.metrics.in_flight += 1
+        try:
+            yield
+        finally:
+            with self.metrics.lock:
+                self.metrics.in_flight -= 1
+            self._slots.release()
+
+    def validate(
+        self, documents: list[Any], max_issues: int | None
+    ) -> list[list[ValidationIssue]]:
+        """Validate on the pool, or raise 503 when too many requests wait."""
+        with self.slot():
+            return self.validate_reserved(documents, max_issues)
+
+    def validate_reserved(
+        self, documents: list[Any], max_issues: int | None
+    ) -> list[list[ValidationIssue]]:
+        """Validate while the caller holds a :meth:`slot`.
+
+        The documents are split into one chunk per worker, so a batch uses
+        the whole pool.
+        """
+        start = time.perf_counter()
+        chunksize = max(1, -(-len(documents) // self.workers))
+        futures = [
+            self.pool.submit(_validate_documents, chunk, max_issues)
+            for chunk in _chunked(documents, chunksize)
+        ]
+        results = [issues for future in futures for issues in future.result()]
+        self.metrics.validated(results, time.perf_counter() - start)
+        return results
+
+    def validate_body(
+        self, body: bytes, content_type: str, max_issues: int | None
+    ) -> list[ValidationIssue]:
+        """Parse and validate one document on the pool under a held slot.
+
+        Raises :class:`RequestError` (400) when the body does not parse.
+        """
+        start = time.perf_counter()
+        results = self.pool.submit(
+            _validate_body, body, content_type, max_issues
+        ).result()
+        self.metrics.validated(results, time.perf_counter() - start)
+        return results[0]
+
+
+def _iter_json_array(text: str) -> Iterator[Any]:
+    """Yield the items of a JSON array one at a time, as they are decoded."""
+    skip = _JSON_WHITESPACE.match
+    index = skip(text).end()
+    if not text.startswith("[", index):
+        raise ValueError("a JSON batch must be an array of documents")
+    index = skip(text, index + 1).end()
+    if text.startswith("]", index):
+        index += 1
+    else:
+        while True:
+            item, index = _JSON_DECODER.raw_decode(text, index)
+            yield item
+            index = skip(text, index).end()
+            if text.startswith("]", index):
+                index += 1
+                break
+            if not text.startswith(",", index):
+                raise ValueError(f"expected ',' or ']' at offset {index}")
+            index = skip(text, index + 1).end()
+    if skip(text, index).end() != len(text):
+        raise ValueError(f"extra data after the array at offset {index}")
+
+
+def _parse_body(
+    body: bytes, content_type: str, many: bool, max_batch: int | None = None
+) -> list[Any]:
+    try:
+        text = body.decode("utf-8")
+        is_json = content_type.split(";")[0].strip().lower() in _JSON_TYPES
+        if not many:
+            return [loads_document(text, "json" if is_json else "yaml")]
+        if is_json:
+            items = _iter_json_array(text)
+        else:
+            records = iter_documents(io.StringIO(text), "yaml")
+            items = (record.document for record in records)
+        documents = []
+        for document in items:
+            if len(documents) == max_batch:
+                raise RequestError(
+                    HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                    f"batch exceeds {max_batch} documents",
+                )
+            documents.append(document)
+        return documents
+    except (UnicodeDecodeError, ValueError, yaml.YAMLError) as exc:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"invalid body: {exc}") from None
+
+
+def _max_issues(query: str) -> int | None:
+    values = parse_qs(query).get("max_issues")
+    if not values:
+        return None
+    try:
+        max_issues = int(values[-1])
+    except ValueError:
+        max_issues = 0
+    if max_issues < 1:
+        raise RequestError(
+            HTTPStatus.BAD_REQUEST, "max_issues must be a positive integer"
+        )
+    return max_issues
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    server_version = "pose-contact"
+    protocol_version = "HTTP/1.1"
+    service: ValidationService
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send(status, body, "application/json")
+
+    def _handle(self, endpoint: str, respond: Any) -> None:
+        try:
+            status, payload = respond()
+        except RequestError as exc:
+            status, payload = exc.status, {"error": str(exc)}
+        except Exception as exc:  # noqa: BLE001 - answer instead of dropping
+            self.log_error("%s failed: %r", endpoint, exc)
+            # The body may be partly read, so the connection cannot be reused.
+            self.close_connection = True
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            payload = {"error": "internal server error"}
+        self.service.metrics.request(endpoint, int(status))
+        if isinstance(payload, str):
+            self._send(status, payload.encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(status, payload)
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/healthz":
+            self._handle(path, lambda: (HTTPStatus.OK, {"status": "ok"}))
+        elif path == "/metrics":
+            self._handle(path, lambda: (HTTPStatus.OK, self.service.metrics.render()))
+        else:
+            self._handle("other", self._not_found)
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path in ("/validate", "/validate/batch"):
+            many = url.path == "/validate/batch"
+            self._handle(url.path, lambda: self._validate(url.query, many))
+        else:
+            self._discard_body()
+            self._handle("other", self._not_found)
+
+    def _not_found(self) -> tuple[HTTPStatus, Any]:
+        raise RequestError(HTTPStatus.NOT_FOUND, f"no such endpoint: {self.path}")
+
+    def _discard_body(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if 0 < length <= self.service.max_body_bytes:
+            self.rfile.read(length)
+        elif length:
+            self.close_connection = True
+
+    def _validate(self, query: str, many: bool) -> tuple[HTTPStatus, Any]:
+        try:
+            length = int(self.headers.get("Content-Length") or "")
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.close_connection = True
+            raise RequestError(
+                HTTPStatus.LENGTH_REQUIRED, "Content-Length is required"
+            ) from None
+        if length > self.service.max_body_bytes:
+            self.close_connection = True
+            raise RequestError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"body exceeds {self.service.max_body_bytes} bytes",
+            )
+        try:
+            with self.service.slot():
+                return self._validate_body(length, query, many)
+        except RequestError as exc:
+            if exc.status == HTTPStatus.SERVICE_UNAVAILABLE:
+                # Rejected before the body was read; the connection is unusable.
+                self.close_connection = True
+            raise
+
+    def _validate_body(
+        self, length: int, query: str, many: bool
+    ) -> tuple[HTTPStatus, Any]:
+        body = self.rfile.read(length)
+        max_issues = _max_issues(query)
+        content_type = self.headers.get("Content-Type", "")
+        if not many:
+            issues = self.service.validate_body(body, content_type, max_issues)
+            return HTTPStatus.OK, _result(issues)
+        documents = _parse_body(body, content_type, many, self.service.max_batch)
+        results = self.service.validate_reserved(documents, max_issues)
+        return HTTPStatus.OK, {"results": [_result(issues) for issues in results]}
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no host; fall back to the socket path.
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return str(self.server.server_address)
+
+
+class _ServerMixin:
+    daemon_threads = True
+    quiet = False
+
+
+class ValidationHTTPServer(_ServerMixin, ThreadingHTTPServer):
+    """Validation server listening on a TCP address."""
+
+
+class ValidationUnixServer(_ServerMixin, ThreadingMixIn, UnixStreamServer):
+    """Validation server listening on a Unix domain socket."""
+
+    def server_bind(self) -> None:
+        if os.path.exists(self.server_address):
+            # Replace a stale socket left by a previous run, but never a file.
+            if not stat.S_ISSOCK(os.stat(self.server_address).st_mode):
+                raise FileExistsError(self.server_address)
+            os.unlink(self.server_address)
+        super().server_bind()
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+
+
+def make_server(
+    service: ValidationService,
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: str | None = None,
+    quiet: bool = False,
+) -> ValidationHTTPServer | ValidationUnixServer:
+    """Bind a server for ``service`` without starting it.
+
+    Call ``serve_forever()`` on the result, and ``shutdown()`` from another
+    thread to stop it.
+    """
+    handler = type(
+        "BoundValidationRequestHandler",
+        (ValidationRequestHandler,),
+        {"service": service},
+    )
+    server: ValidationHTTPServer | ValidationUnixServer
+    if unix_socket is not None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Unix domain sockets are not supported here")
+        server = ValidationUnixServer(unix_socket, handler)
+    else:
+        server = ValidationHTTPServer((host, port), handler)
+    server.quiet = quiet
+    return server
+
+
+def serve(
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_socket: str | None = None,
+    quiet: bool = False,
+    **options: Any,
+) -> None:
+    """Run a validation server until interrupted or terminated.
+
+    ``options`` are passed to :class:`ValidationService`.
+    """
+    service = ValidationService(**options)
+    server = make_server(
+        service, host=host, port=port, unix_socket=unix_socket, quiet=quiet
+    )
+    if threading.current_thread() is threading.main_thread():
+        # Unwind through the cleanup below on SIGTERM too, so the Unix socket
+        # file is removed and worker processes are stopped.
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
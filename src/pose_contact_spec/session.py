@@ -0,0 +1,503 @@
+"""Incremental revalidation of canonical state that changes a little at a time."""
+
+from __future__ import annotations
+
+import copy
+from collections import Counter
+from typing import Any, Iterable
+
+from .validate import (
+    _ID_SECTIONS,
+    _OWNER_SECTIONS,
+    _REF_FIELDS,
+    ValidationIssue,
+    _anchor_issue,
+    _iter_relation_issues,
+    compiled_validator,
+)
+
+# (path suffix below the item, message); the item prefix is added on output.
+_ItemIssues = tuple[tuple[str, str], ...]
+_RefKey = tuple[str, str]
+
+_PATCH_OPS = ("add", "remove", "replace", "test")
+
+
+def _strip(issues: Iterable[ValidationIssue], prefix: str) -> _ItemIssues:
+    return tuple((issue.path[len(prefix) :], issue.message) for issue in issues)
+
+
+def _shift(
+    entries: dict[int, Any], start: int, stop: int, delta: int
+) -> dict[int, Any]:
+    """Drop entries in ``[start, stop)`` and move later ones by ``delta``."""
+    if delta == 0:
+        for index in range(start, stop):
+            entries.pop(index, None)
+        return entries
+    return {
+        (index + delta if index >= stop else index): value
+        for index, value in entries.items()
+        if not start <= index < stop
+    }
+
+
+def _same(left: Any, right: Any) -> bool:
+    """Return whether two parsed values are equal, including their types.
+
+    ``==`` treats ``1``, ``1.0`` and ``True`` as equal, but the schema does
+    not, so an item whose values only changed type must be revalidated.
+    """
+    if left is right:
+        return True
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(
+            _same(value, right[key]) for key, value in left.items()
+        )
+    if isinstance(left, list):
+        return len(left) == len(right) and all(map(_same, left, right))
+    return bool(left == right)
+
+
+def _changed_span(old: list[Any], new: list[Any]) -> tuple[int, int, int]:
+    """Return ``(start, old_stop, new_stop)`` bounding the items that differ."""
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and _same(old[start], new[start]):
+        start += 1
+    old_stop, new_stop = len(old), len(new)
+    while (
+        old_stop > start
+        and new_stop > start
+        and _same(old[old_stop - 1], new[new_stop - 1])
+    ):
+        old_stop -= 1
+        new_stop -= 1
+    return start, old_stop, new_stop
+
+
+def _item_id(item: Any) -> Any:
+    if isinstance(item, dict):
+        value = item.get("id")
+        if isinstance(value, str):
+            return value
+    return None
+
+
+def _relation_refs(relation: Any) -> list[_RefKey]:
+    refs: list[_RefKey] = []
+    if not isinstance(relation, dict):
+        return refs
+    for role in ("subject", "object"):
+        entity = relation.get(role)
+        if not isinstance(entity, dict):
+            continue
+        kind = entity.get("kind")
+        if not isinstance(kind, str) or kind not in _REF_FIELDS:
+            continue
+        field, section = _REF_FIELDS[kind]
+        value = entity.get(field)
+        if isinstance(value, str):
+            refs.append((section, value))
+    return refs
+
+
+def _anchor_owner(anchor: Any) -> list[_RefKey]:
+    if not isinstance(anchor, dict):
+        return []
+    owner_kind = anchor.get("owner_kind")
+    owner = anchor.get("owner")
+    if owner_kind not in ("object", "surface") or not isinstance(owner, str):
+        return []
+    return [(_OWNER_SECTIONS[owner_kind], owner)]
+
+
+def _parse_pointer(pointer: str) -> list[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"invalid JSON pointer {pointer!r}")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    ]
+
+
+def _list_index(container: list[Any], token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise ValueError(f"invalid array index {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise ValueError(f"array index {index} out of range")
+    return index
+
+
+def _apply_nested(target: Any, tokens: list[str], op: dict[str, Any]) -> None:
+    """Apply a JSON Patch operation below an item already copied by the caller."""
+    for token in tokens[:-1]:
+        if isinstance(target, list):
+            target = target[_list_index(target, token, allow_end=False)]
+        elif isinstance(target, dict) and token in target:
+            target = target[token]
+        else:
+            raise ValueError(f"path {op['path']!r} does not exist")
+    last = tokens[-1]
+    kind = op["op"]
+    if isinstance(target, list):
+        index = _list_index(target, last, allow_end=kind == "add")
+        if kind == "add":
+            target.insert(index, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            del target[index]
+        elif kind == "replace":
+            target[index] = copy.deepcopy(op["value"])
+        elif target[index] != op["value"]:
+            raise ValueError(f"test failed at {op['path']!r}")
+    elif isinstance(target, dict):
+        if kind != "add" and last not in target:
+            raise ValueError(f"path {op['path']!r} does not exist")
+        if kind in ("add", "replace"):
+            target[last] = copy.deepcopy(op["value"])
+        elif kind == "remove":
+            del target[last]
+        elif target[last] != op["value"]:
+            raise ValueError(f"test failed at {op['path']!r}")
+    else:
+        raise ValueError(f"path {op['path']!r} does not exist")
+
+
+class ValidationSession:
+    """Holds the last validated instance and revalidates only what edits touch.
+
+    Structural issues are kept per top-level item and semantic issues per
+    anchor and relation, together with the id index and reverse indexes from
+    referenced ids to the anchors and relations that use them. An edit
+    re-checks the changed items, the anchors whose owner id appeared or
+    disappeared, and the relations referencing such ids. :attr:`issues`
+    always equals ``validate_instance`` on :attr:`instance`.
+
+    Use :meth:`update` with a new version of the document (unchanged items
+    may be shared with the previous version, but must not have been mutated
+    in place) or :meth:`apply_patch` with JSON Patch operations.
+    """
+
+    def __init__(
+        self, instance: dict[str, Any], schema: dict[str, Any] | None = None
+    ) -> None:
+        self._validator = compiled_validator(schema)
+        sections = self._validator.item_sections
+        # Entity sections first so relations are checked against current ids.
+        self._sections = tuple(
+            sorted(
+                sections,
+                key=lambda name: (name == "relations", name not in _ID_SECTIONS),
+            )
+        )
+        self._instance: dict[str, Any] = {}
+        self._items: dict[str, list[Any]] = {name: [] for name in self._sections}
+        self._schema_issues: dict[str, dict[int, _ItemIssues]] = {
+            name: {} for name in self._sections
+        }
+        self._semantic: dict[str, dict[int, _ItemIssues]] = {
+            "anchors": {},
+            "relations": {},
+        }
+        self._ids: dict[str, Counter[str]] = {name: Counter() for name in _ID_SECTIONS}
+        self._relation_refs: dict[_RefKey, set[int]] | None = {}
+        self._anchor_owners: dict[_RefKey, set[int]] | None = {}
+        self._root_issues: list[ValidationIssue] = []
+        self.update(instance)
+
+    @property
+    def instance(self) -> dict[str, Any]:
+        """The current document. Treat it as read-only."""
+        return self._instance
+
+    @property
+    def issues(self) -> list[ValidationIssue]:
+        """Issues of the current document, as ``validate_instance`` reports them."""
+        schema_issues = list(self._root_issues)
+        for section in self._sections:
+            schema_issues.extend(self._render(section, self._schema_issues[section]))
+        if schema_issues:
+            schema_issues.sort(key=lambda issue: issue.path)
+            return schema_issues
+        issues = self._render("anchors", self._semantic["anchors"])
+        issues.extend(self._render("relations", self._semantic["relations"]))
+        return issues
+
+    @staticmethod
+    def _render(section: str, entries: dict[int, _ItemIssues]) -> list[ValidationIssue]:
+        return [
+            ValidationIssue(f"/{section}/{index}{suffix}", message)
+            for index in sorted(entries)
+            for suffix, message in entries[index]
+        ]
+
+    def update(self, instance: dict[str, Any]) -> list[ValidationIssue]:
+        """Revalidate against a new version of the document and return its issues."""
+        if not isinstance(instance, dict):
+            raise TypeError("instance must be a mapping")
+        root = dict(instance)
+        spans: dict[str, tuple[int, int, list[Any]]] = {}
+        for section in self._sections:
+            value = root.get(section)
+            new_items = value if isinstance(value, list) else []
+            start, old_stop, new_stop = _changed_span(self._items[section], new_items)
+            spans[section] = (start, old_stop, new_items[start:new_stop])
+        return self._commit(root, spans)
+
+    def apply_patch(
+        self, operations: Iterable[dict[str, Any]]
+    ) -> list[ValidationIssue]:
+        """Apply JSON Patch ``add``/``remove``/``replace``/``test`` operations.
+
+        The patch is applied atomically: if any operation fails, a
+        ``ValueError`` is raised and the session is left unchanged. Items are
+        copied before being edited, so documents passed in earlier are never
+        mutated.
+        """
+        root = dict(self._instance)
+        lists: dict[str, list[Any]] = {}
+        copied: set[int] = set()
+        # Per section: unchanged prefix length and unchanged suffix length.
+        bounds: dict[str, list[int]] = {}
+
+        for op in operations:
+            if op.get("op") not in _PATCH_OPS:
+                raise ValueError(f"unsupported patch operation {op.get('op')!r}")
+            if op["op"] != "remove" and "value" not in op:
+                raise ValueError(f"operation on {op.get('path')!r} needs a value")
+            tokens = _parse_pointer(op["path"])
+            if not tokens:
+                if op["op"] == "test":
+                    if root != op["value"]:
+                        raise ValueError("test failed at ''")
+                    continue
+                if op["op"] == "remove" or not isinstance(op["value"], dict):
+                    raise ValueError("the document root must remain a mapping")
+                root = dict(copy.deepcopy(op["value"]))
+                lists.clear()
+                bounds = {section: [0, 0] for section in self._sections}
+                continue
+
+            key = tokens[0]
+            if len(tokens) == 1:
+                if op["op"] == "test":
+                    if key not in root or root[key] != op["value"]:
+                        raise ValueError(f"test failed at {op['path']!r}")
+                    continue
+                if op["op"] != "add" and key not in root:
+                    raise ValueError(f"path {op['path']!r} does not exist")
+                if op["op"] == "remove":
+                    del root[key]
+                else:
+                    root[key] = copy.deepcopy(op["value"])
+                lists.pop(key, None)
+                if key in self._items:
+                    bounds[key] = [0, 0]
+                continue
+
+            if key not in root:
+                raise ValueError(f"path {op['path']!r} does not exist")
+            if key not in self._items or not isinstance(root[key], list):
+                container = root[key] = copy.deepcopy(root[key])
+                _apply_nested(container, tokens[1:], op)
+                continue
+
+            if key not in lists:
+                lists[key] = root[key] = list(root[key])
+            items = lists[key]
+            if len(tokens) == 2:
+                index = _list_index(items, tokens[1], allow_end=op["op"] == "add")
+                before = len(items)
+                _apply_nested(items, tokens[1:], op)
+                changed_stop = index + (len(items) - before) + (op["op"] == "replace")
+            else:
+                index = _list_index(items, tokens[1], allow_end=False)
+                if id(items[index]) not in copied:
+                    items[index] = copy.deepcopy(items[index])
+                    copied.add(id(items[index]))
+                _apply_nested(items[index], tokens[2:], op)
+                changed_stop = index + 1
+            if op["op"] == "test":
+                continue
+            prefix, suffix = bounds.setdefault(key, [len(items), len(items)])
+            bounds[key] = [
+                min(prefix, index),
+                min(suffix, len(items) - max(changed_stop, index)),
+            ]
+
+        spans: dict[str, tuple[int, int, list[Any]]] = {}
+        for section, (prefix, suffix) in bounds.items():
+            value = root.get(section)
+            new_items = value if isinstance(value, list) else []
+            old_len = len(self._items[section])
+            prefix = min(prefix, old_len, len(new_items))
+            suffix = min(suffix, old_len - prefix, len(new_items) - prefix)
+            spans[section] = (
+                prefix,
+                old_len - suffix,
+                new_items[prefix : len(new_items) - suffix],
+            )
+        return self._commit(root, spans)
+
+    def _commit(
+        self, root: dict[str, Any], spans: dict[str, tuple[int, int, list[Any]]]
+    ) -> list[ValidationIssue]:
+        flipped: set[_RefKey] = set()
+        for section in self._sections:
+            if section in spans:
+                start, stop, new_items = spans[section]
+                if start != stop or new_items:
+                    self._splice(section, start, stop, new_items, flipped)
+            if isinstance(root.get(section), list):
+                root[section] = self._items[section]
+        self._instance = root
+        if flipped:
+            self._recheck(flipped)
+        self._root_issues = self._validator.root_schema_issues(root)
+        return self.issues
+
+    def _splice(
+        self,
+        section: str,
+        start: int,
+        stop: int,
+        new_items: list[Any],
+        flipped: set[_RefKey],
+    ) -> None:
+        items = self._items[section]
+        old_items = items[start:stop]
+        delta = len(new_items) - len(old_items)
+        shifts_tail = delta != 0 and stop < len(items)
+        items[start:stop] = new_items
+
+        schema_issues = _shift(self._schema_issues[section], start, stop, delta)
+        self._schema_issues[section] = schema_issues
+        for index in range(start, start + len(new_items)):
+            found = self._validator.item_schema_issues(section, index, items[index])
+            if found:
+                schema_issues[index] = _strip(found, f"/{section}/{index}")
+
+        if section in self._ids:
+            self._reindex_ids(section, old_items, new_items, flipped)
+        if section == "anchors":
+            self._anchor_owners = self._reindex_refs(
+                self._anchor_owners,
+                start,
+                old_items,
+                new_items,
+                shifts_tail,
+                _anchor_owner,
+            )
+        elif section == "relations":
+            self._relation_refs = self._reindex_refs(
+                self._relation_refs,
+                start,
+                old_items,
+                new_items,
+                shifts_tail,
+                _relation_refs,
+            )
+        if section in self._semantic:
+            self._semantic[section] = _shift(
+                self._semantic[section], start, stop, delta
+            )
+            for index in range(start, start + len(new_items)):
+                self._check_semantic(section, index)
+
+    def _reindex_ids(
+        self,
+        section: str,
+        old_items: list[Any],
+        new_items: list[Any],
+        flipped: set[_RefKey],
+    ) -> None:
+        counts = self._ids[section]
+        for item in old_items:
+            item_id = _item_id(item)
+            if item_id is None:
+                continue
+            counts[item_id] -= 1
+            if counts[item_id] == 0:
+                del counts[item_id]
+                flipped.add((section, item_id))
+        for item in new_items:
+            item_id = _item_id(item)
+            if item_id is None:
+                continue
+            if item_id not in counts:
+                flipped.add((section, item_id))
+            counts[item_id] += 1
+
+    @staticmethod
+    def _reindex_refs(
+        index: dict[_RefKey, set[int]] | None,
+        start: int,
+        old_items: list[Any],
+        new_items: list[Any],
+        shifts_tail: bool,
+        refs_of: Any,
+    ) -> dict[_RefKey, set[int]] | None:
+        if index is None or shifts_tail:
+            # Positions after the edit moved; rebuild lazily when next needed.
+            return None
+        for offset, item in enumerate(old_items):
+            for key in refs_of(item):
+                positions = index.get(key)
+                if positions is not None:
+                    positions.discard(start + offset)
+                    if not positions:
+                        del index[key]
+        for offset, item in enumerate(new_items):
+            for key in refs_of(item):
+                index.setdefault(key, set()).add(start + offset)
+        return index
+
+    def _check_semantic(self, section: str, index: int) -> None:
+        entries = self._semantic[section]
+        entries.pop(index, None)
+        if index in self._schema_issues[section]:
+            return
+        item = self._items[section][index]
+        prefix = f"/{section}/{index}"
+        if section == "anchors":
+            if isinstance(item, dict):
+                issue = _anchor_issue(item, index, self._ids)
+                if issue is not None:
+                    entries[index] = _strip([issue], prefix)
+            return
+        pairings = self._validator.pairings
+        expected = self._validator.expected_pairings
+        found = list(_iter_relation_issues(item, index, self._ids, pairings, expected))
+        if found:
+            entries[index] = _strip(found, prefix)
+
+    def _recheck(self, flipped: set[_RefKey]) -> None:
+        if self._anchor_owners is None:
+            self._anchor_owners = self._build_refs(
+                "anchors",
+                _anchor_owner,
+            )
+        if self._relation_refs is None:
+            self._relation_refs = self._build_refs("relations", _relation_refs)
+        anchors: set[int] = set()
+        relations: set[int] = set()
+        for key in flipped:
+            anchors.update(self._anchor_owners.get(key, ()))
+            relations.update(self._relation_refs.get(key, ()))
+        for index in anchors:
+            self._check_semantic("anchors", index)
+        for index in relations:
+            self._check_semantic("relations", index)
+
+    def _build_refs(self, section: str, refs_of: Any) -> dict[_RefKey, set[int]]:
+        index: dict[_RefKey, set[int]] = {}
+        for position, item in enumerate(self._items.get(section, [])):
+            for key in refs_of(item):
+                index.setdefault(key, set()).add(position)
+        return index
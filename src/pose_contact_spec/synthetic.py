@@ -0,0 +1,135 @@
+"""Deterministic synthetic scenes for benchmarks and load tests."""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from .model import ANCHOR_ROLES, BODY_PARTS, INTENSITIES, PREDICATES, SIDES
+from .validate import _PAIRINGS, ENTITY_KINDS
+
+SCHEMA_VERSION = "0.2.0"
+
+
+def _entity_ref(
+    kind: str, rng: random.Random, ids: dict[str, list[str]]
+) -> dict[str, Any]:
+    if kind == "body_part":
+        return {
+            "kind": "body_part",
+            "actor": rng.choice(ids["actors"]),
+            "part": rng.choice(BODY_PARTS),
+            "side": rng.choice(SIDES),
+        }
+    section = {"object": "objects", "surface": "surfaces", "anchor": "anchors"}[kind]
+    return {"kind": kind, kind: rng.choice(ids[section])}
+
+
+def _pairing(
+    predicate: str, valid: bool, rng: random.Random, kinds: tuple[str, ...]
+) -> tuple[str, str]:
+    allowed = _PAIRINGS.get(predicate)
+    candidates = [
+        (subject, obj)
+        for subject in kinds
+        for obj in kinds
+        if allowed is None or ((subject, obj) in allowed) == valid
+    ]
+    return rng.choice(candidates)
+
+
+def generate_scene(
+    *,
+    actors: int = 2,
+    objects: int = 2,
+    surfaces: int = 1,
+    anchors: int = 2,
+    relations: int = 100,
+    invalid_ratio: float = 0.0,
+    qualifier_ratio: float = 0.3,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Return a canonical instance with the requested number of items.
+
+    The same arguments always produce the same scene. Every id reference
+    resolves; about ``invalid_ratio`` of the relations use a
+    subject/object pairing their predicate does not allow, so the scene
+    fails the semantic checks when it is above zero. ``anchors`` is the
+    total number of anchors, spread over objects and surfaces.
+    """
+    if actors < 1:
+        raise ValueError("a scene needs at least one actor")
+    if not 0.0 <= invalid_ratio <= 1.0:
+        raise ValueError("invalid_ratio must be between 0 and 1")
+    if anchors and not objects and not surfaces:
+        raise ValueError("anchors need at least one object or surface")
+    rng = random.Random(seed)
+    ids: dict[str, list[str]] = {
+        "actors": [f"actor_{index}" for index in range(actors)],
+        "objects": [f"object_{index}" for index in range(objects)],
+        "surfaces": [f"surface_{index}" for index in range(surfaces)],
+        "anchors": [f"anchor_{index}" for index in range(anchors)],
+    }
+    owners = [("object", owner) for owner in ids["objects"]]
+    owners += [("surface", owner) for owner in ids["surfaces"]]
+
+    scene: dict[str, Any] = {
+        "schema_version": SCHEMA_VERSION,
+        "actors": [
+            {"id": actor_id, "type": "human", "label": f"Actor {index}"}
+            for index, actor_id in enumerate(ids["actors"])
+        ],
+    }
+    if objects:
+        scene["objects"] = [
+            {"id": object_id, "label": f"Object {index}"}
+            for index, object_id in enumerate(ids["objects"])
+        ]
+    if surfaces:
+        scene["surfaces"] = [
+            {"id": surface_id, "label": f"Surface {index}"}
+            for index, surface_id in enumerate(ids["surfaces"])
+        ]
+    if anchors:
+        scene["anchors"] = []
+        for index, anchor_id in enumerate(ids["anchors"]):
+            owner_kind, owner = owners[index % len(owners)]
+            scene["anchors"].append(
+                {
+                    "id": anchor_id,
+                    "owner_kind": owner_kind,
+                    "owner": owner,
+                    "name": f"anchor {index}",
+                    "role": rng.choice(ANCHOR_ROLES),
+                }
+            )
+
+    sections = ("actors", "objects", "surfaces", "anchors")
+    kinds = tuple(
+        kind for kind, section in zip(ENTITY_KINDS, sections) if ids[section]
+    )
+    constrained = [predicate for predicate in PREDICATES if predicate in _PAIRINGS]
+    scene["relations"] = []
+    for index in range(relations):
+        valid = rng.random() >= invalid_ratio
+        predicate = rng.choice(PREDICATES if valid else constrained)
+        try:
+            subject_kind, object_kind = _pairing(predicate, valid, rng, kinds)
+        except IndexError:
+            # The available kinds cannot express this pairing; fall back to
+            # one that any predicate accepts.
+            predicate = "left_of"
+            subject_kind, object_kind = _pairing(predicate, True, rng, kinds)
+        relation: dict[str, Any] = {
+            "id": f"rel_{index}",
+            "predicate": predicate,
+            "subject": _entity_ref(subject_kind, rng, ids),
+            "object": _entity_ref(object_kind, rng, ids),
+        }
+        if rng.random() < qualifier_ratio:
+            relation["qualifiers"] = {
+                "intensity": rng.choice(INTENSITIES),
+                "duration_ms": rng.randrange(0, 5000, 10),
+            }
+        scene["relations"].append(relation)
+    return scene
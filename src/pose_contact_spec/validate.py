@@ -2,36 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
 from dataclasses import dataclass
-from importlib import resources
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator
 
-import jsonschema
-from jsonschema.exceptions import best_match
+from . import instrument
+from .fastpath import compile_checker
+from .load import iter_documents, load_document
+from .model import Scene
+from .rules import DEFAULT_RULES, PairingRules
 
-from .load import load_document
+if TYPE_CHECKING:
+    import jsonschema
 
-SPATIAL_PREDICATES = {
-    "left_of",
-    "right_of",
-    "above",
-    "below",
-    "facing",
-    "aligned_with",
-}
-
-BIDIRECTIONAL_BODY_PART_PREDICATES = {"touching", "contacting"}
-
-SUBJECT_OBJECT_RULES = {
-    "gripping": ({"body_part"}, {"object", "anchor"}),
-    "holding": ({"body_part"}, {"object", "anchor"}),
-    "supporting": ({"surface", "object", "anchor"}, {"body_part"}),
-    "standing_on": ({"body_part"}, {"surface", "object", "anchor"}),
-    "sitting_on": ({"body_part"}, {"surface", "object", "anchor"}),
-    "leaning_on": ({"body_part"}, {"surface", "object", "anchor"}),
-}
+ENTITY_KINDS = DEFAULT_RULES.entity_kinds
 
 
 @dataclass(frozen=True)
@@ -45,203 +33,543 @@ class ValidationIssue:
         return f"{self.path}: {self.message}"
 
 
-def load_schema() -> dict[str, Any]:
-    """Load the bundled JSON Schema."""
-    schema_path = resources.files(__package__).joinpath("pose-contact.schema.json")
+@dataclass(frozen=True)
+class StreamIssue:
+    """A validation issue tagged with the stream record it belongs to."""
+
+    record: int
+    line: int
+    issue: ValidationIssue
+
+    def __str__(self) -> str:
+        return f"record {self.record} (line {self.line}): {self.issue}"
+
+
+def load_schema(resource: str = "pose-contact.schema.json") -> dict[str, Any]:
+    """Load a bundled JSON Schema, by default the current version's."""
+    from importlib import resources
+
+    schema_path = resources.files(__package__).joinpath(resource)
     with schema_path.open(encoding="utf-8") as handle:
         return json.load(handle)
 
 
-def _collect_ids(instance: dict[str, Any]) -> dict[str, set[str]]:
-    def extract_id(items: list[dict[str, Any]]) -> set[str]:
-        return {item["id"] for item in items if isinstance(item, dict) and "id" in item}
+_ID_SECTIONS = ("actors", "objects", "surfaces", "anchors")
+_OWNER_SECTIONS = {"object": "objects", "surface": "surfaces"}
+_REF_FIELDS = {
+    "body_part": ("actor", "actors"),
+    "object": ("object", "objects"),
+    "surface": ("surface", "surfaces"),
+    "anchor": ("anchor", "anchors"),
+}
+
+
+def _extract_ids(items: list[dict[str, Any]]) -> set[str]:
+    return {item["id"] for item in items if isinstance(item, dict) and "id" in item}
 
+
+def _collect_ids(instance: dict[str, Any]) -> dict[str, set[str]]:
     return {
-        "actors": extract_id(instance.get("actors", [])),
-        "objects": extract_id(instance.get("objects", [])),
-        "surfaces": extract_id(instance.get("surfaces", [])),
-        "anchors": extract_id(instance.get("anchors", [])),
+        section: _extract_ids(instance.get(section, [])) for section in _ID_SECTIONS
     }
 
 
-def _format_path(parts: list[object]) -> str:
-    if not parts:
-        return "/"
-    return "/" + "/".join(str(part) for part in parts)
+def _format_path(parts: Iterable[object]) -> str:
+    path = "/".join(str(part) for part in parts)
+    return "/" + path
 
 
-def _validate_anchor_ownership(
-    anchors: list[dict[str, Any]], ids: dict[str, set[str]]
-) -> list[ValidationIssue]:
-    issues: list[ValidationIssue] = []
-    for index, anchor in enumerate(anchors):
-        if not isinstance(anchor, dict):
-            continue
-        owner_kind = anchor.get("owner_kind")
-        owner_id = anchor.get("owner")
-        if owner_kind == "object":
-            if owner_id not in ids["objects"]:
-                issues.append(
-                    ValidationIssue(
-                        _format_path(["anchors", index, "owner"]),
-                        f"unknown object id '{owner_id}'",
-                    )
-                )
-        elif owner_kind == "surface":
-            if owner_id not in ids["surfaces"]:
-                issues.append(
-                    ValidationIssue(
-                        _format_path(["anchors", index, "owner"]),
-                        f"unknown surface id '{owner_id}'",
-                    )
-                )
-    return issues
+def _anchor_issue(
+    anchor: dict[str, Any], index: int, ids: dict[str, set[str]]
+) -> ValidationIssue | None:
+    owner_kind = anchor.get("owner_kind")
+    section = _OWNER_SECTIONS.get(owner_kind)
+    owner_id = anchor.get("owner")
+    if section is None or owner_id in ids[section]:
+        return None
+    return ValidationIssue(
+        _format_path(("anchors", index, "owner")),
+        f"unknown {owner_kind} id '{owner_id}'",
+    )
 
 
-def _validate_entity_ref(
-    entity: dict[str, Any],
-    path: list[object],
-    ids: dict[str, set[str]],
-) -> tuple[str | None, list[ValidationIssue]]:
-    issues: list[ValidationIssue] = []
+def _entity_ref_issue(
+    entity: dict[str, Any], index: int, role: str, ids: dict[str, set[str]]
+) -> tuple[str | None, ValidationIssue | None]:
     if not isinstance(entity, dict):
-        return None, issues
+        return None, None
     kind = entity.get("kind")
-    if kind == "body_part":
-        actor_id = entity.get("actor")
-        if actor_id not in ids["actors"]:
-            issues.append(
-                ValidationIssue(
-                    _format_path([*path, "actor"]),
-                    f"unknown actor id '{actor_id}'",
-                )
-            )
-    elif kind == "object":
-        object_id = entity.get("object")
-        if object_id not in ids["objects"]:
-            issues.append(
-                ValidationIssue(
-                    _format_path([*path, "object"]),
-                    f"unknown object id '{object_id}'",
-                )
-            )
-    elif kind == "surface":
-        surface_id = entity.get("surface")
-        if surface_id not in ids["surfaces"]:
-            issues.append(
-                ValidationIssue(
-                    _format_path([*path, "surface"]),
-                    f"unknown surface id '{surface_id}'",
-                )
-            )
-    elif kind == "anchor":
-        anchor_id = entity.get("anchor")
-        if anchor_id not in ids["anchors"]:
-            issues.append(
-                ValidationIssue(
-                    _format_path([*path, "anchor"]),
-                    f"unknown anchor id '{anchor_id}'",
-                )
-            )
-    return kind, issues
+    ref = _REF_FIELDS.get(kind)
+    if ref is None:
+        return kind, None
+    field, section = ref
+    value = entity.get(field)
+    if value in ids[section]:
+        return kind, None
+    return kind, ValidationIssue(
+        _format_path(("relations", index, role, field)),
+        f"unknown {field} id '{value}'",
+    )
+
+
+# Shared by every default validator; see pose_contact_spec.rules.
+_PAIRINGS = DEFAULT_RULES.pairings
+_EXPECTED_PAIRINGS = DEFAULT_RULES.expected
 
 
 def _predicate_allows_pairing(
-    predicate: str, subject_kind: str | None, object_kind: str | None
+    predicate: str,
+    subject_kind: str | None,
+    object_kind: str | None,
+    pairings: dict[str, frozenset[tuple[str, str]]] = _PAIRINGS,
 ) -> bool:
     if subject_kind is None or object_kind is None:
         return True
-    if predicate in SPATIAL_PREDICATES:
-        return True
-    if predicate in BIDIRECTIONAL_BODY_PART_PREDICATES:
-        left = {"body_part"}
-        right = {"body_part", "object", "surface", "anchor"}
-        return (subject_kind in left and object_kind in right) or (
-            object_kind in left and subject_kind in right
-        )
-    if predicate in SUBJECT_OBJECT_RULES:
-        allowed_subjects, allowed_objects = SUBJECT_OBJECT_RULES[predicate]
-        return subject_kind in allowed_subjects and object_kind in allowed_objects
-    return True
-
-
-def _describe_expected_pairing(predicate: str) -> str:
-    if predicate in BIDIRECTIONAL_BODY_PART_PREDICATES:
-        return "body_part ↔ body_part/object/surface/anchor"
-    if predicate in SUBJECT_OBJECT_RULES:
-        allowed_subjects, allowed_objects = SUBJECT_OBJECT_RULES[predicate]
-        subject_desc = "/".join(sorted(allowed_subjects))
-        object_desc = "/".join(sorted(allowed_objects))
-        return f"{subject_desc} → {object_desc}"
-    if predicate in SPATIAL_PREDICATES:
-        return "any entity reference"
-    return "any entity reference"
-
-
-def _validate_relations(
-    relations: list[dict[str, Any]],
+    allowed = pairings.get(predicate)
+    return allowed is None or (subject_kind, object_kind) in allowed
+
+
+def _iter_relation_issues(
+    relation: dict[str, Any],
+    index: int,
     ids: dict[str, set[str]],
-) -> list[ValidationIssue]:
-    issues: list[ValidationIssue] = []
-    for index, relation in enumerate(relations):
-        if not isinstance(relation, dict):
-            continue
-        predicate = relation.get("predicate")
-        subject = relation.get("subject", {})
-        object_ref = relation.get("object", {})
-        subject_kind, subject_issues = _validate_entity_ref(
-            subject, ["relations", index, "subject"], ids
+    pairings: dict[str, frozenset[tuple[str, str]]] = _PAIRINGS,
+    expected_pairings: dict[str, str] = _EXPECTED_PAIRINGS,
+) -> Iterator[ValidationIssue]:
+    if not isinstance(relation, dict):
+        return
+    subject_kind, issue = _entity_ref_issue(
+        relation.get("subject", {}), index, "subject", ids
+    )
+    if issue is not None:
+        yield issue
+    object_kind, issue = _entity_ref_issue(
+        relation.get("object", {}), index, "object", ids
+    )
+    if issue is not None:
+        yield issue
+    predicate = relation.get("predicate")
+    if predicate and not _predicate_allows_pairing(
+        predicate, subject_kind, object_kind, pairings
+    ):
+        yield ValidationIssue(
+            _format_path(("relations", index)),
+            f"predicate '{predicate}' requires {expected_pairings[predicate]}",
         )
-        object_kind, object_issues = _validate_entity_ref(
-            object_ref, ["relations", index, "object"], ids
+
+
+def _iter_semantic_issues(
+    instance: dict[str, Any],
+    pairings: dict[str, frozenset[tuple[str, str]]] = _PAIRINGS,
+    expected_pairings: dict[str, str] = _EXPECTED_PAIRINGS,
+) -> Iterator[ValidationIssue]:
+    """Check anchor ownership and relation references in one pass per section.
+
+    Anchor ids are collected while anchor ownership is checked; issues are
+    yielded lazily so callers can stop after the first few.
+    """
+    ids = {
+        section: _extract_ids(instance.get(section, []))
+        for section in ("actors", "objects", "surfaces")
+    }
+    anchor_ids: set[str] = set()
+    ids["anchors"] = anchor_ids
+    for index, anchor in enumerate(instance.get("anchors", [])):
+        if not isinstance(anchor, dict):
+            continue
+        if "id" in anchor:
+            anchor_ids.add(anchor["id"])
+        issue = _anchor_issue(anchor, index, ids)
+        if issue is not None:
+            yield issue
+    for index, relation in enumerate(instance.get("relations", [])):
+        yield from _iter_relation_issues(
+            relation, index, ids, pairings, expected_pairings
         )
-        issues.extend(subject_issues)
-        issues.extend(object_issues)
-        if predicate and not _predicate_allows_pairing(
-            predicate, subject_kind, object_kind
-        ):
-            expected = _describe_expected_pairing(predicate)
-            issues.append(
-                ValidationIssue(
-                    _format_path(["relations", index]),
-                    f"predicate '{predicate}' requires {expected}",
+
+
+def _iter_scene_issues(
+    scene: Scene,
+    pairings: dict[str, frozenset[tuple[str, str]]] = _PAIRINGS,
+    expected_pairings: dict[str, str] = _EXPECTED_PAIRINGS,
+) -> Iterator[ValidationIssue]:
+    """Run the semantic checks of :func:`_iter_semantic_issues` on a scene.
+
+    Ids are resolved against the scene's prebuilt index instead of being
+    collected from the sections again.
+    """
+    index = scene.index
+    for position, anchor in enumerate(scene.anchors or ()):
+        owner_kind = anchor.owner_kind.name
+        if anchor.owner not in index.owners(anchor.owner_kind):
+            yield ValidationIssue(
+                _format_path(("anchors", position, "owner")),
+                f"unknown {owner_kind} id '{anchor.owner}'",
+            )
+    for position, relation in enumerate(scene.relations):
+        refs = (("subject", relation.subject), ("object", relation.object))
+        for role, entity in refs:
+            if entity.target not in index.section(entity.kind):
+                field = _REF_FIELDS[entity.kind.name][0]
+                yield ValidationIssue(
+                    _format_path(("relations", position, role, field)),
+                    f"unknown {field} id '{entity.target}'",
                 )
+        predicate = relation.predicate.name
+        if not _predicate_allows_pairing(
+            predicate, relation.subject.kind.name, relation.object.kind.name, pairings
+        ):
+            yield ValidationIssue(
+                _format_path(("relations", position)),
+                f"predicate '{predicate}' requires {expected_pairings[predicate]}",
             )
-    return issues
 
 
-def _normalize_schema_error(error: jsonschema.ValidationError) -> ValidationIssue:
+def _normalize_schema_error(
+    error: jsonschema.ValidationError, prefix: tuple[object, ...] = ()
+) -> ValidationIssue:
+    from jsonschema.exceptions import best_match
+
     if error.context:
         error = best_match(error.context)
-    path = _format_path(list(error.absolute_path))
+    path = _format_path((*prefix, *error.absolute_path))
     return ValidationIssue(path, error.message)
 
 
+class _PartialSchema:
+    """Validates one part of a document against the matching part of the schema."""
+
+    def __init__(self, validator_cls: Any, schema: dict[str, Any], fast_path: bool):
+        self._validator = validator_cls(schema)
+        self._fast_check = compile_checker(schema) if fast_path else None
+
+    def issues(
+        self, value: Any, prefix: tuple[object, ...] = ()
+    ) -> list[ValidationIssue]:
+        if self._fast_check is not None and self._fast_check(value):
+            return []
+        errors = self._validator.iter_errors(value)
+        issues = [_normalize_schema_error(err, prefix) for err in errors]
+        issues.sort(key=lambda issue: issue.path)
+        return issues
+
+
+def _build_partial_schemas(
+    validator_cls: Any, schema: dict[str, Any], fast_path: bool
+) -> dict[str, _PartialSchema]:
+    """Split ``schema`` into a shallow root schema and one schema per array section.
+
+    The root schema keeps every top-level keyword but no longer descends into
+    array items; the item schemas carry the definitions they reference.
+    Together they report exactly the errors of the full schema.
+    """
+    properties = schema.get("properties", {})
+    items = {
+        name: subschema["items"]
+        for name, subschema in properties.items()
+        if isinstance(subschema, dict) and isinstance(subschema.get("items"), dict)
+    }
+    shallow = dict(schema)
+    shallow["properties"] = {
+        name: (
+            {key: value for key, value in subschema.items() if key != "items"}
+            if name in items
+            else subschema
+        )
+        for name, subschema in properties.items()
+    }
+    support = {
+        key: schema[key] for key in ("$schema", "definitions", "$defs") if key in schema
+    }
+    partials = {"": _PartialSchema(validator_cls, shallow, fast_path)}
+    for name, item_schema in items.items():
+        partials[name] = _PartialSchema(
+            validator_cls, {**support, **item_schema}, fast_path
+        )
+    return partials
+
+
+def schema_fingerprint(schema: dict[str, Any]) -> str:
+    """Return a stable content hash for a schema document."""
+    encoded = json.dumps(
+        schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _rules_fingerprint(
+    schema_hash: str,
+    pairings: dict[str, frozenset[tuple[str, str]]],
+    expected_pairings: dict[str, str],
+) -> str:
+    rules = {
+        predicate: [sorted(pairs), expected_pairings[predicate]]
+        for predicate, pairs in sorted(pairings.items())
+    }
+    encoded = json.dumps([schema_hash, rules], ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CompiledValidator:
+    """Schema loading, meta-schema checking and validator construction done once.
+
+    Instances are immutable and safe to share between threads; reuse one for
+    every document validated against the same schema. :attr:`fingerprint`
+    identifies the schema together with the semantic rule tables. With
+    ``fast_path`` enabled, structural validity is first decided by a checker
+    compiled from the schema (see :mod:`pose_contact_spec.fastpath`), and
+    ``jsonschema`` only runs to report the errors of documents that fail it.
+    ``rules`` replaces the default :class:`~.rules.PairingRules`, e.g. for
+    another specification version or extension predicates.
+    """
+
+    def __init__(
+        self,
+        schema: dict[str, Any],
+        fast_path: bool = True,
+        *,
+        rules: PairingRules = DEFAULT_RULES,
+    ) -> None:
+        # jsonschema (and its referencing stack) is imported on first use.
+        import jsonschema
+
+        validator_cls = jsonschema.validators.validator_for(schema)
+        validator_cls.check_schema(schema)
+        self.schema = schema
+        self.rules = rules
+        self.pairings = rules.pairings
+        self.expected_pairings = rules.expected
+        self.fingerprint = _rules_fingerprint(
+            schema_fingerprint(schema), self.pairings, self.expected_pairings
+        )
+        self._validator_cls = validator_cls
+        self._validator = validator_cls(schema)
+        self._fast_path = fast_path
+        self._fast_check = compile_checker(schema) if fast_path else None
+        self._partials: dict[str, _PartialSchema] | None = None
+
+    @classmethod
+    def from_schema(cls, schema: dict[str, Any] | None = None) -> CompiledValidator:
+        """Return the process-wide compiled validator for ``schema``.
+
+        When ``schema`` is omitted the bundled schema is used.
+        """
+        return compiled_validator(schema)
+
+    def schema_issues(
+        self, instance: Any, max_issues: int | None = None
+    ) -> list[ValidationIssue]:
+        """Return structural issues, sorted by path.
+
+        With ``max_issues``, traversal stops after that many errors; the
+        issues returned are the first ones found, not the first by path.
+        """
+        errors = islice(self._validator.iter_errors(instance), max_issues)
+        issues = [_normalize_schema_error(err) for err in errors]
+        issues.sort(key=lambda issue: issue.path)
+        return issues
+
+    def _partial_schemas(self) -> dict[str, _PartialSchema]:
+        if self._partials is None:
+            self._partials = _build_partial_schemas(
+                self._validator_cls, self.schema, self._fast_path
+            )
+        return self._partials
+
+    @property
+    def item_sections(self) -> tuple[str, ...]:
+        """Top-level array sections whose items have their own schema."""
+        return tuple(name for name in self._partial_schemas() if name)
+
+    def root_schema_issues(self, instance: Any) -> list[ValidationIssue]:
+        """Return structural issues of the top level, ignoring section items."""
+        return self._partial_schemas()[""].issues(instance)
+
+    def item_schema_issues(
+        self, section: str, index: int, item: Any
+    ) -> list[ValidationIssue]:
+        """Return structural issues of one item of an array section.
+
+        Paths are reported as in full validation, e.g. ``/relations/3/object``.
+        """
+        return self._partial_schemas()[section].issues(item, (section, index))
+
+    def validate(
+        self, instance: dict[str, Any], max_issues: int | None = None
+    ) -> list[ValidationIssue]:
+        """Validate a canonical instance, returning any issues found.
+
+        With ``max_issues``, validation stops once that many issues are found;
+        see :meth:`schema_issues` for which ones are returned.
+        """
+        if max_issues is not None and max_issues < 1:
+            raise ValueError("max_issues must be at least 1")
+        if instrument.enabled():
+            return self._validate_recorded(instance, max_issues, instrument.Recorder())
+        if self._fast_check is None or not self._fast_check(instance):
+            issues = self.schema_issues(instance, max_issues)
+            if issues:
+                return issues
+
+        semantic = _iter_semantic_issues(
+            instance, self.pairings, self.expected_pairings
+        )
+        return list(islice(semantic, max_issues))
+
+    def _validate_recorded(
+        self, instance: Any, max_issues: int | None, recorder: instrument.Recorder
+    ) -> list[ValidationIssue]:
+        """Validate like :meth:`validate`, timing each phase."""
+        with recorder.phase("schema"):
+            issues = []
+            if self._fast_check is None or not self._fast_check(instance):
+                issues = self.schema_issues(instance, max_issues)
+        if not issues:
+            with recorder.phase("semantic"):
+                semantic = _iter_semantic_issues(
+                    instance, self.pairings, self.expected_pairings
+                )
+                issues = list(islice(semantic, max_issues))
+        recorder.emit(instance, len(issues))
+        return issues
+
+    def validate_scene(
+        self, scene: Scene, max_issues: int | None = None
+    ) -> list[ValidationIssue]:
+        """Run the semantic checks on a typed :class:`~.model.Scene`.
+
+        A scene can only be built from a structurally valid instance, so the
+        schema is not checked again.
+        """
+        if max_issues is not None and max_issues < 1:
+            raise ValueError("max_issues must be at least 1")
+        semantic = _iter_scene_issues(scene, self.pairings, self.expected_pairings)
+        return list(islice(semantic, max_issues))
+
+    def validate_document(
+        self, path: str | Path, max_issues: int | None = None
+    ) -> list[ValidationIssue]:
+        """Load and validate a canonical document."""
+        if not instrument.enabled():
+            return self.validate_parsed(load_document(path), max_issues)
+        if max_issues is not None and max_issues < 1:
+            raise ValueError("max_issues must be at least 1")
+        recorder = instrument.Recorder(path)
+        with recorder.phase("load"):
+            document = load_document(path)
+        recorder.bytes = Path(path).stat().st_size
+        if not isinstance(document, dict):
+            recorder.emit(document, 1)
+            return [ValidationIssue("/", "document must be a mapping")]
+        return self._validate_recorded(document, max_issues, recorder)
+
+    def validate_parsed(
+        self, document: Any, max_issues: int | None = None
+    ) -> list[ValidationIssue]:
+        """Validate a freshly parsed document, which may not be a mapping."""
+        if not isinstance(document, dict):
+            return [ValidationIssue("/", "document must be a mapping")]
+        return self.validate(document, max_issues)
+
+
+_VALIDATOR_CACHE: dict[tuple[str, str], CompiledValidator] = {}
+_VALIDATOR_CACHE_LOCK = threading.Lock()
+_BUNDLED_VALIDATOR: CompiledValidator | None = None
+
+
+def compiled_validator(schema: dict[str, Any] | None = None) -> CompiledValidator:
+    """Return a cached :class:`CompiledValidator` for ``schema`` (default: bundled).
+
+    Validators are cached per process, keyed by the schema ``$id`` and a hash
+    of its content, so equal schemas share one compiled validator.
+    """
+    global _BUNDLED_VALIDATOR
+    if not schema:
+        if _BUNDLED_VALIDATOR is None:
+            with _VALIDATOR_CACHE_LOCK:
+                if _BUNDLED_VALIDATOR is None:
+                    _BUNDLED_VALIDATOR = _cached_validator(load_schema())
+        return _BUNDLED_VALIDATOR
+    return _cached_validator(schema)
+
+
+def _cached_validator(schema: dict[str, Any]) -> CompiledValidator:
+    key = (str(schema.get("$id", "")), schema_fingerprint(schema))
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is None:
+        validator = CompiledValidator(schema)
+        validator = _VALIDATOR_CACHE.setdefault(key, validator)
+    return validator
+
+
+def _issue_limit(fail_fast: bool, max_issues: int | None) -> int | None:
+    return 1 if fail_fast else max_issues
+
+
 def validate_instance(
-    instance: dict[str, Any], schema: dict[str, Any] | None = None
+    instance: dict[str, Any],
+    schema: dict[str, Any] | None = None,
+    *,
+    fail_fast: bool = False,
+    max_issues: int | None = None,
 ) -> list[ValidationIssue]:
-    """Validate a canonical instance, returning any issues found."""
-    schema = schema or load_schema()
-    validator_cls = jsonschema.validators.validator_for(schema)
-    validator_cls.check_schema(schema)
-    validator = validator_cls(schema)
-
-    issues = [_normalize_schema_error(err) for err in validator.iter_errors(instance)]
-    issues.sort(key=lambda issue: issue.path)
-    if issues:
-        return issues
+    """Validate a canonical instance, returning any issues found.
 
-    ids = _collect_ids(instance)
-    issues.extend(_validate_anchor_ownership(instance.get("anchors", []), ids))
-    issues.extend(_validate_relations(instance.get("relations", []), ids))
-    return issues
+    ``max_issues`` stops validation once that many issues are found;
+    ``fail_fast`` is shorthand for ``max_issues=1``. The issues returned are
+    the first ones found, sorted by path, so they need not be the ones that
+    sort first in the full report.
+    """
+    limit = _issue_limit(fail_fast, max_issues)
+    return compiled_validator(schema).validate(instance, limit)
 
 
 def validate_document(
-    path: str | Path, schema: dict[str, Any] | None = None
+    path: str | Path,
+    schema: dict[str, Any] | None = None,
+    *,
+    fail_fast: bool = False,
+    max_issues: int | None = None,
 ) -> list[ValidationIssue]:
-    """Load and validate a canonical document."""
-    instance = load_document(path)
-    if not isinstance(instance, dict):
-        return [ValidationIssue("/", "document must be a mapping")]
-    return validate_instance(instance, schema=schema)
+    """Load and validate a canonical document.
+
+    ``fail_fast`` and ``max_issues`` behave as in :func:`validate_instance`:
+    the issues returned are the first ones found, which need not be the
+    first by path in the full report.
+    """
+    limit = _issue_limit(fail_fast, max_issues)
+    return compiled_validator(schema).validate_document(path, limit)
+
+
+def validate_stream(
+    source: str | Path | IO[str],
+    schema: dict[str, Any] | None = None,
+    format: str | None = None,
+    loader: str | None = None,
+) -> Iterator[StreamIssue]:
+    """Validate every document in a JSON Lines or multi-document YAML stream.
+
+    Records are loaded and validated one at a time, so memory use stays
+    constant regardless of the stream length. Malformed JSON Lines records
+    are reported and skipped; a YAML syntax error ends the stream, since the
+    parser cannot resynchronise after it.
+    """
+    import yaml
+
+    validator = compiled_validator(schema)
+    records = iter_documents(source, format, skip_invalid=True, loader=loader)
+    index, line = 0, 1
+    try:
+        for record in records:
+            index, line = record.index + 1, record.line
+            if record.error is not None:
+                issues = [ValidationIssue("/", record.error)]
+            else:
+                issues = validator.validate_parsed(record.document)
+            for issue in issues:
+                yield StreamIssue(record.index, record.line, issue)
+    except yaml.YAMLError as exc:
+        mark = getattr(exc, "problem_mark", None)
+        if mark is not None:
+            line = mark.line + 1
+        yield StreamIssue(index, line, ValidationIssue("/", f"invalid YAML: {exc}"))
@@ -0,0 +1,416 @@
+"""Specification versions: per-version validators and document migration.
+
+:data:`REGISTRY` maps each supported ``MAJOR.MINOR`` to a bundled schema
+and semantic rule tables, and validates a document against the version it
+declares, following ``spec/versioning.md``: unknown MAJOR versions are
+rejected, and a higher MINOR than any known is validated against the newest
+known MINOR of that MAJOR. Validators are compiled on first use and cached
+per version.
+
+:func:`migrate` upgrades a document to :data:`CURRENT_VERSION` one version
+step at a time, and :func:`migrate_many` does so for a corpus in parallel.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from .batch import DEFAULT_CHUNKSIZE, map_chunks
+from .load import document_format, load_document
+from .rules import DEFAULT_RULES, PairingRules
+from .validate import CompiledValidator, ValidationIssue, load_schema
+
+CURRENT_VERSION = "0.2.0"
+
+_VERSION_PATTERN = re.compile(r"^(\d+)\.(\d+)\.(\d+)$")
+
+
+class UnknownVersionError(ValueError):
+    """A ``schema_version`` that no registered version can validate."""
+
+
+@dataclass(frozen=True)
+class SpecVersion:
+    """A ``MAJOR.MINOR`` specification version and what validates it."""
+
+    major: int
+    minor: int
+    schema_resource: str
+    rules: PairingRules = field(default=DEFAULT_RULES, repr=False)
+
+    @property
+    def key(self) -> str:
+        return f"{self.major}.{self.minor}"
+
+    def compile(self) -> CompiledValidator:
+        return CompiledValidator(load_schema(self.schema_resource), rules=self.rules)
+
+
+def parse_version(value: Any) -> tuple[int, int, int]:
+    """Split a ``MAJOR.MINOR.PATCH`` string into integers."""
+    match = _VERSION_PATTERN.match(value) if isinstance(value, str) else None
+    if match is None:
+        raise UnknownVersionError(f"invalid schema_version {value!r}")
+    major, minor, patch = match.groups()
+    return int(major), int(minor), int(patch)
+
+
+class VersionRegistry:
+    """Resolves declared versions to lazily compiled, cached validators."""
+
+    def __init__(self, versions: Iterable[SpecVersion] = ()) -> None:
+        self._versions: dict[tuple[int, int], SpecVersion] = {}
+        self._validators: dict[tuple[int, int], CompiledValidator] = {}
+        self._lock = threading.Lock()
+        for version in versions:
+            self.register(version)
+
+    def register(self, version: SpecVersion) -> None:
+        with self._lock:
+            self._versions[version.major, version.minor] = version
+            self._validators.pop((version.major, version.minor), None)
+
+    @property
+    def versions(self) -> tuple[SpecVersion, ...]:
+        return tuple(self._versions[key] for key in sorted(self._versions))
+
+    def resolve(self, schema_version: Any) -> SpecVersion:
+        """Return the registered version that validates ``schema_version``.
+
+        Raises :class:`UnknownVersionError` for malformed versions, unknown
+        MAJOR versions and MINOR versions older than any registered.
+        """
+        major, minor, _ = parse_version(schema_version)
+        version = self._versions.get((major, minor))
+        if version is not None:
+            return version
+        minors = [
+            known for known_major, known in self._versions if known_major == major
+        ]
+        if not minors:
+            supported = sorted({known_major for known_major, _ in self._versions})
+            raise UnknownVersionError(
+                f"unknown major version {major} (supported: "
+                f"{', '.join(map(str, supported))})"
+            )
+        if minor > max(minors):
+            return self._versions[major, max(minors)]
+        raise UnknownVersionError(f"unsupported version {major}.{minor}")
+
+    def validator(self, schema_version: Any) -> CompiledValidator:
+        """Return the compiled validator for ``schema_version``."""
+        version = self.resolve(schema_version)
+        key = (version.major, version.minor)
+        validator = self._validators.get(key)
+        if validator is None:
+            with self._lock:
+                validator = self._validators.get(key)
+                if validator is None:
+                    validator = self._validators[key] = version.compile()
+        return validator
+
+    def validate(
+        self, instance: Any, max_issues: int | None = None
+    ) -> list[ValidationIssue]:
+        """Validate an instance against the version it declares.
+
+        Instances without a string ``schema_version`` are validated against
+        the current version, whose schema reports the problem.
+        """
+        declared = (
+            instance.get("schema_version") if isinstance(instance, dict) else None
+        )
+        if not isinstance(declared, str):
+            declared = CURRENT_VERSION
+        try:
+            validator = self.validator(declared)
+        except UnknownVersionError as exc:
+            return [ValidationIssue("/schema_version", str(exc))]
+        return validator.validate_parsed(instance, max_issues)
+
+    def validate_document(
+        self, path: str | Path, max_issues: int | None = None
+    ) -> list[ValidationIssue]:
+        """Load a document and validate it against the version it declares."""
+        return self.validate(load_document(path), max_issues)
+
+
+REGISTRY = VersionRegistry(
+    [
+        SpecVersion(0, 1, "pose-contact-0.1.schema.json"),
+        SpecVersion(0, 2, "pose-contact.schema.json"),
+    ]
+)
+
+
+# Descriptive 0.1 anchor roles -> functional 0.2 roles. Roles missing here
+# are left for a person to map; validation of the result reports them.
+ANCHOR_ROLE_MIGRATION = {
+    "seat": "support_surface",
+    "top": "support_surface",
+    "back_top": "support_surface",
+    "tabletop": "support_surface",
+    "shelf": "support_surface",
+    "step": "support_surface",
+    "backrest": "rest_surface",
+    "back": "rest_surface",
+    "armrest": "rest_surface",
+    "headrest": "rest_surface",
+    "footrest": "rest_surface",
+    "handle": "handle",
+    "grip": "handle",
+    "knob": "handle",
+    "handrail": "handle",
+    "edge": "edge",
+    "rim": "edge",
+    "corner": "corner",
+    "hook": "attachment_point",
+    "mount": "attachment_point",
+}
+
+_FUNCTIONAL_ROLES = frozenset(
+    (
+        "support_surface",
+        "contact_surface",
+        "rest_surface",
+        "handle",
+        "edge",
+        "corner",
+        "attachment_point",
+    )
+)
+
+
+def _migrate_0_1(instance: dict[str, Any]) -> dict[str, Any]:
+    """0.1 -> 0.2: descriptive anchor roles move to ``name``."""
+    for anchor in instance.get("anchors", ()):
+        if not isinstance(anchor, dict):
+            continue
+        role = anchor.get("role")
+        if not isinstance(role, str) or role in _FUNCTIONAL_ROLES:
+            continue
+        if not anchor.get("name"):
+            anchor["name"] = role
+        anchor["role"] = ANCHOR_ROLE_MIGRATION.get(role.lower(), role)
+    return instance
+
+
+# MAJOR.MINOR -> (next MAJOR.MINOR, step that edits a copy in place)
+MIGRATIONS: dict[str, tuple[str, Callable[[dict[str, Any]], dict[str, Any]]]] = {
+    "0.1": ("0.2", _migrate_0_1),
+}
+
+
+def migrate(
+    instance: dict[str, Any],
+    target: str = CURRENT_VERSION,
+    registry: VersionRegistry = REGISTRY,
+) -> dict[str, Any]:
+    """Return a copy of ``instance`` upgraded to the ``target`` version.
+
+    Each step sets ``schema_version`` to the ``.0`` patch of the version it
+    produces. Raises :class:`UnknownVersionError` when no chain of
+    migrations leads from the declared version to ``target``.
+    """
+    target_key = registry.resolve(target).key
+    current = registry.resolve(instance.get("schema_version")).key
+    migrated = copy.deepcopy(instance)
+    while current != target_key:
+        step = MIGRATIONS.get(current)
+        if step is None:
+            raise UnknownVersionError(
+                f"no migration from {current} towards {target_key}"
+            )
+        current, upgrade = step
+        migrated = upgrade(migrated)
+        migrated["schema_version"] = f"{current}.0"
+    return migrated
+
+
+@dataclass(frozen=True)
+class MigrationResult:
+    """The outcome of migrating one file.
+
+    ``issues`` are those of the migrated document against the target
+    version. ``error`` is set when the file could not be read, migrated or
+    written; ``output`` is the path written, if any.
+    """
+
+    path: str
+    source_version: str | None
+    issues: tuple[ValidationIssue, ...] = ()
+    error: str | None = None
+    output: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.issues
+
+
+@dataclass
+class VersionSummary:
+    documents: int = 0
+    failed: int = 0
+    issues: int = 0
+    seconds: float = 0.0
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class MigrationReport:
+    """Per-source-version totals over :class:`MigrationResult` values.
+
+    ``seconds`` add up the time spent on each document, so
+    :attr:`VersionSummary.documents_per_second` is per worker.
+    """
+
+    versions: dict[str, VersionSummary] = field(default_factory=dict)
+
+    def add(self, result: MigrationResult) -> None:
+        key = "unknown"
+        if result.source_version is not None:
+            try:
+                major, minor, _ = parse_version(result.source_version)
+                key = f"{major}.{minor}"
+            except UnknownVersionError:
+                pass
+        summary = self.versions.setdefault(key, VersionSummary())
+        summary.documents += 1
+        summary.failed += not result.ok
+        summary.issues += len(result.issues)
+        summary.seconds += result.seconds
+
+    def lines(self) -> list[str]:
+        return [
+            f"{key}: {summary.documents} documents, {summary.failed} failed, "
+            f"{summary.issues} issues, {summary.documents_per_second:,.0f} "
+            "documents/s per worker"
+            for key, summary in sorted(self.versions.items())
+        ]
+
+
+def _write(document: dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    format = document_format(path)
+    if format == "json":
+        path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    elif format == "binary":
+        from .binary import encode_document
+
+        path.write_bytes(encode_document(document))
+    else:
+        import yaml
+
+        path.write_text(
+            yaml.safe_dump(document, sort_keys=False, allow_unicode=True),
+            encoding="utf-8",
+        )
+
+
+def _output_path(path: str, output_dir: str, source_root: str | None) -> Path:
+    source = Path(path)
+    if source_root is not None:
+        return Path(
+            output_dir, source.resolve().relative_to(Path(source_root).resolve())
+        )
+    return Path(output_dir, source.name)
+
+
+def _unique_names(paths: Iterable[str | Path]) -> Iterator[str]:
+    """Yield ``paths``, raising before two files would share an output name.
+
+    Without a source root, documents are written under their file name
+    alone, so a second source with the same name would overwrite the first.
+    """
+    seen: dict[str, Path] = {}
+    for path in paths:
+        source = Path(path)
+        first = seen.setdefault(source.name, source.resolve())
+        if first != source.resolve():
+            raise ValueError(
+                f"{first} and {source} would both be written to {source.name}; "
+                "pass source_root to keep their relative paths"
+            )
+        yield str(path)
+
+
+def _migrate_path(
+    path: str, target: str, output_dir: str | None, source_root: str | None
+) -> MigrationResult:
+    start = time.perf_counter()
+    source_version = None
+    try:
+        document = load_document(path)
+        if not isinstance(document, dict):
+            raise ValueError("document must be a mapping")
+        source_version = document.get("schema_version")
+        migrated = migrate(document, target)
+        issues = tuple(REGISTRY.validate(migrated))
+        output = None
+        if output_dir is not None and not issues:
+            output_path = _output_path(path, output_dir, source_root)
+            _write(migrated, output_path)
+            output = str(output_path)
+    except Exception as exc:  # noqa: BLE001 - isolate per-file failures
+        return MigrationResult(
+            path,
+            source_version if isinstance(source_version, str) else None,
+            error=f"{type(exc).__name__}: {exc}",
+            seconds=time.perf_counter() - start,
+        )
+    return MigrationResult(
+        path, source_version, issues, output=output, seconds=time.perf_counter() - start
+    )
+
+
+def _migrate_chunk(
+    chunk: list[str], target: str, output_dir: str | None, source_root: str | None
+) -> list[MigrationResult]:
+    return [_migrate_path(path, target, output_dir, source_root) for path in chunk]
+
+
+def migrate_many(
+    paths: Iterable[str | Path],
+    *,
+    target: str = CURRENT_VERSION,
+    output_dir: str | Path | None = None,
+    source_root: str | Path | None = None,
+    workers: int | None = None,
+    executor: str = "process",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[MigrationResult]:
+    """Migrate documents in parallel, yielding a :class:`MigrationResult` each.
+
+    Each migrated document is validated against ``target``. With
+    ``output_dir``, documents that migrate without issues are written there
+    in their original format, under their path relative to ``source_root``
+    (or their file name when it is omitted); sources are never modified.
+    Without ``source_root``, a :class:`ValueError` is raised before a
+    second file with an already written name is migrated. Results are
+    yielded in input order; aggregate them with a :class:`MigrationReport`.
+    ``workers=1`` migrates inline.
+    """
+    REGISTRY.resolve(target)
+    if output_dir is not None and source_root is None:
+        paths = _unique_names(paths)
+    yield from map_chunks(
+        _migrate_chunk,
+        paths,
+        target,
+        None if output_dir is None else str(output_dir),
+        None if source_root is None else str(source_root),
+        workers=workers,
+        executor=executor,
+        chunksize=chunksize,
+    )
@@ -0,0 +1,414 @@
+"""Revalidate documents under a directory tree as they change.
+
+:class:`WatchIndex` remembers the modification time, size, content hash and
+issues of every document it has validated, and only re-reads files whose
+time or size changed and only re-validates files whose content changed.
+:func:`watch_documents` keeps one index and one compiled validator warm and
+yields the changed results after every save. It listens for inotify events
+on Linux and polls otherwise::
+
+    for events in watch_documents(["examples", "tests/fixtures"]):
+        for event in events:
+            print(event.path, event.issues)
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .batch import (
+    DEFAULT_CHUNKSIZE,
+    DOCUMENT_SUFFIXES,
+    _chunked,
+    _init_worker,
+    iter_document_paths,
+)
+from .load import document_format, parse_document
+from .rules import DEFAULT_RULES
+from .validate import CompiledValidator, ValidationIssue, compiled_validator
+
+DEFAULT_INTERVAL = 0.5
+# How long to wait for more events after the first before revalidating, so a
+# save that writes several files (or renames over one) is handled once.
+DEFAULT_SETTLE = 0.02
+
+
+@dataclass(frozen=True)
+class FileState:
+    """What :class:`WatchIndex` remembers about one file."""
+
+    mtime_ns: int
+    size: int
+    digest: bytes
+    issues: tuple[ValidationIssue, ...] = ()
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class WatchEvent:
+    """A file whose validation result may have changed.
+
+    ``removed`` is set when the file no longer exists; ``error`` when it
+    could not be read or parsed.
+    """
+
+    path: str
+    issues: tuple[ValidationIssue, ...] = ()
+    error: str | None = None
+    removed: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.removed and self.error is None and not self.issues
+
+
+def _inspect(
+    path: str, validator: CompiledValidator, loader: str | None
+) -> tuple[FileState | None, str | None]:
+    """Read, hash and validate ``path``; return its state or the read error."""
+    try:
+        stat = os.stat(path)
+        with open(path, "rb") as handle:
+            data = handle.read()
+    except FileNotFoundError:
+        return None, None
+    except OSError as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+    issues: tuple[ValidationIssue, ...] = ()
+    error = None
+    try:
+        document = parse_document(data, document_format(path), loader)
+        issues = tuple(validator.validate_parsed(document))
+    except Exception as exc:  # noqa: BLE001 - report and keep watching
+        error = f"{type(exc).__name__}: {exc}"
+    digest = hashlib.sha256(data).digest()
+    return FileState(stat.st_mtime_ns, stat.st_size, digest, issues, error), None
+
+
+def _inspect_chunk(
+    chunk: list[str], loader: str | None
+) -> list[tuple[FileState | None, str | None]]:
+    from . import batch
+
+    validator = batch._WORKER_VALIDATOR or compiled_validator()
+    return [_inspect(path, validator, loader) for path in chunk]
+
+
+class WatchIndex:
+    """Validation results for the documents under ``roots``, kept current.
+
+    ``roots`` are documents or directories, searched for document files like
+    ``pose-contact validate`` does. Call :meth:`scan` to walk every root or
+    :meth:`refresh` with paths known to have changed. When more than
+    ``parallel_threshold`` files need validating at once, as on the first
+    scan, they are spread over ``workers`` processes.
+    """
+
+    def __init__(
+        self,
+        roots: Iterable[str | Path],
+        validator: CompiledValidator | None = None,
+        loader: str | None = None,
+        *,
+        workers: int | None = None,
+        parallel_threshold: int = 256,
+    ) -> None:
+        self.roots = tuple(Path(root) for root in roots)
+        self.validator = validator or compiled_validator()
+        self.loader = loader
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self._states: dict[str, FileState] = {}
+
+    @property
+    def states(self) -> dict[str, FileState]:
+        return dict(self._states)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for state in self._states.values() if state.issues or state.error)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def scan(self) -> list[WatchEvent]:
+        """Walk every root and return the files that changed or disappeared."""
+        paths = [os.path.normpath(path) for path in iter_document_paths(self.roots)]
+        events = self.refresh(paths)
+        for name in sorted(self._states.keys() - set(paths)):
+            del self._states[name]
+            events.append(WatchEvent(name, removed=True))
+        return events
+
+    def refresh(self, paths: Iterable[str | Path]) -> list[WatchEvent]:
+        """Recheck ``paths`` and return those whose result may have changed.
+
+        Paths are normalized with :func:`os.path.normpath`, so ``./a.yaml``
+        and ``a.yaml`` name the same entry.
+        """
+        events = []
+        stale = []
+        for path in dict.fromkeys(os.path.normpath(path) for path in paths):
+            previous = self._states.get(path)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                if previous is not None:
+                    del self._states[path]
+                    events.append(WatchEvent(path, removed=True))
+                continue
+            if (
+                previous is None
+                or previous.mtime_ns != stat.st_mtime_ns
+                or previous.size != stat.st_size
+            ):
+                stale.append(path)
+        for path, (state, error) in zip(stale, self._inspect_many(stale)):
+            event = self._update(path, state, error)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _inspect_many(
+        self, paths: list[str]
+    ) -> Iterable[tuple[FileState | None, str | None]]:
+        if (
+            len(paths) <= self.parallel_threshold
+            or self.workers == 1
+            or self.validator.rules is not DEFAULT_RULES
+        ):
+            return [_inspect(path, self.validator, self.loader) for path in paths]
+        chunks = list(_chunked(paths, DEFAULT_CHUNKSIZE))
+        with ProcessPoolExecutor(
+            self.workers, initializer=_init_worker, initargs=(self.validator.schema,)
+        ) as pool:
+            results = pool.map(_inspect_chunk, chunks, [self.loader] * len(chunks))
+            return [item for chunk in results for item in chunk]
+
+    def _update(
+        self, path: str, state: FileState | None, error: str | None
+    ) -> WatchEvent | None:
+        previous = self._states.get(path)
+        if state is None:
+            self._states.pop(path, None)
+            if error is not None:
+                return WatchEvent(path, error=error)
+            return None if previous is None else WatchEvent(path, removed=True)
+        self._states[path] = state
+        if previous is not None and previous.digest == state.digest:
+            # Touched or rewritten with the same bytes: the result stands.
+            return None
+        return WatchEvent(path, state.issues, state.error)
+
+
+# inotify(7) constants.
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Directory watches through the inotify system calls.
+
+    Raises :class:`OSError` when inotify is unavailable.
+    """
+
+    def __init__(self) -> None:
+        name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch descriptor -> (directory, whether documents under it count).
+        self._dirs: dict[int, tuple[str, bool]] = {}
+
+    def add(self, directory: str, recursive: bool) -> None:
+        """Watch ``directory``, and every directory below it if ``recursive``."""
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            wd = self._libc.inotify_add_watch(
+                self.fd, os.fsencode(current), _WATCH_MASK
+            )
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if errno == 28:  # ENOSPC: max_user_watches reached
+                    raise OSError(errno, "inotify watch limit reached")
+                continue
+            self._dirs[wd] = (current, recursive)
+            if recursive:
+                try:
+                    with os.scandir(current) as entries:
+                        pending.extend(
+                            entry.path for entry in entries if entry.is_dir()
+                        )
+                except OSError:
+                    continue
+
+    def read(self, timeout: float | None) -> tuple[set[str], set[str], bool]:
+        """Wait for events; return changed files, new directories and overflow.
+
+        ``overflow`` is also set when a watched directory loses a
+        subdirectory, since its files disappear without events of their own.
+        """
+        files: set[str] = set()
+        directories: set[str] = set()
+        overflow = False
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return files, directories, overflow
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if wd not in self._dirs or not name:
+                    continue
+                directory, recursive = self._dirs[wd]
+                path = os.path.normpath(os.path.join(directory, name))
+                if mask & _IN_ISDIR:
+                    if recursive and mask & (_IN_CREATE | _IN_MOVED_TO):
+                        directories.add(path)
+                    elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                        overflow = overflow or recursive
+                    continue
+                files.add(path)
+        return files, directories, overflow
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _open_inotify(roots: tuple[Path, ...]) -> _Inotify | None:
+    try:
+        inotify = _Inotify()
+    except (OSError, AttributeError):
+        return None
+    try:
+        for root in roots:
+            if root.is_dir():
+                inotify.add(str(root), recursive=True)
+            else:
+                inotify.add(str(root.parent), recursive=False)
+    except OSError:
+        inotify.close()
+        return None
+    return inotify
+
+
+def watch_documents(
+    roots: Iterable[str | Path],
+    *,
+    validator: CompiledValidator | None = None,
+    interval: float = DEFAULT_INTERVAL,
+    settle: float = DEFAULT_SETTLE,
+    use_inotify: bool | None = None,
+    workers: int | None = None,
+) -> Iterator[list[WatchEvent]]:
+    """Yield validation results for documents under ``roots`` as they change.
+
+    The first batch holds every document found. After that, each batch
+    holds the files changed since the previous one; content that is
+    rewritten unchanged is not reported. inotify is used when available
+    (``use_inotify=None``), else the tree is polled every ``interval``
+    seconds, comparing modification times and sizes. ``workers`` is passed
+    to :class:`WatchIndex`. Runs until the generator is closed.
+    """
+    index = WatchIndex(roots, validator, workers=workers)
+    inotify = _open_inotify(index.roots) if use_inotify is not False else None
+    if inotify is None and use_inotify:
+        raise OSError("inotify is not available")
+    files = {os.path.normpath(root) for root in index.roots if not root.is_dir()}
+    try:
+        yield index.scan()
+        while True:
+            if inotify is None:
+                time.sleep(interval)
+                events = index.scan()
+            else:
+                changed, directories, overflow = inotify.read(None)
+                while True:
+                    more_changed, more_directories, more_overflow = inotify.read(settle)
+                    if not (more_changed or more_directories or more_overflow):
+                        break
+                    changed |= more_changed
+                    directories |= more_directories
+                    overflow = overflow or more_overflow
+                try:
+                    for directory in directories:
+                        inotify.add(directory, recursive=True)
+                except OSError:
+                    # Out of watches: fall back to polling from now on.
+                    inotify.close()
+                    inotify = None
+                if overflow or directories:
+                    events = index.scan()
+                else:
+                    events = index.refresh(
+                        path
+                        for path in sorted(changed)
+                        if path in files
+                        or (
+                            Path(path).suffix.lower() in DOCUMENT_SUFFIXES
+                            and _under_directory_root(path, index.roots)
+                        )
+                    )
+            if events:
+                yield events
+    finally:
+        if inotify is not None:
+            inotify.close()
+
+
+def _under_directory_root(path: str, roots: tuple[Path, ...]) -> bool:
+    return any(
+        root.is_dir()
+        and os.path.commonpath([path, os.path.normpath(root)]) == os.path.normpath(root)
+        for root in roots
+    )
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+
+from pose_contact_spec import aio
+from pose_contact_spec.synthetic import generate_scene
+from pose_contact_spec.validate import validate_instance
+
+SCENE = generate_scene(relations=5, seed=0)
+
+
+def test_timed_out_job_holds_its_slot(monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+    validate = aio._validate_instance
+
+    def blocking(*args):
+        started.set()
+        release.wait(5)
+        return validate(*args)
+
+    async def main():
+        async with aio.AsyncValidator(workers=2, limit=1) as validator:
+            monkeypatch.setattr(aio, "_validate_instance", blocking)
+            with pytest.raises(asyncio.TimeoutError):
+                await validator.validate_instance(SCENE, timeout=0.05)
+            assert started.is_set()
+            monkeypatch.setattr(aio, "_validate_instance", validate)
+            # The first job is still running, so the next call waits for it.
+            waiting = asyncio.ensure_future(validator.validate_instance(SCENE))
+            await asyncio.sleep(0.1)
+            assert not waiting.done()
+            release.set()
+            return await asyncio.wait_for(waiting, 5)
+
+    try:
+        assert asyncio.run(main()) == validate_instance(SCENE)
+    finally:
+        release.set()
+
+
+def test_cancelled_queued_jobs_release_their_slots():
+    async def main():
+        async with aio.AsyncValidator(workers=1, limit=2) as validator:
+            tasks = [
+                asyncio.ensure_future(validator.validate_instance(SCENE))
+                for _ in range(6)
+            ]
+            await asyncio.sleep(0)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return await validator.validate_instance(SCENE, timeout=5)
+
+    assert asyncio.run(main()) == validate_instance(SCENE)
@@ -0,0 +1,41 @@
+import copy
+from pathlib import Path
+
+import pytest
+
+from pose_contact_spec.binary import (
+    Corpus,
+    decode_document,
+    encode_document,
+    write_corpus,
+)
+from pose_contact_spec.load import load_document
+from pose_contact_spec.validate import validate_instance
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "valid").glob("*.yaml"))
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.name)
+def test_document_round_trip(path):
+    document = load_document(path)
+    assert decode_document(encode_document(document)) == document
+
+
+def test_corpus_round_trip(tmp_path):
+    documents = [load_document(path) for path in FIXTURES]
+    corpus_path = tmp_path / "fixtures.pcc"
+    assert write_corpus(corpus_path, documents) == len(documents)
+    with Corpus(corpus_path) as corpus:
+        assert len(corpus) == len(documents)
+        assert list(corpus) == documents
+        assert corpus[-1] == documents[-1]
+        for index, document in enumerate(documents):
+            assert corpus.validate(index) == validate_instance(document)
+
+
+@pytest.mark.parametrize("duration", [1.0, True, -1, 1 << 64])
+def test_unencodable_duration_raises_value_error(duration):
+    document = copy.deepcopy(load_document(FIXTURES[0]))
+    document["relations"][0]["qualifiers"] = {"duration_ms": duration}
+    with pytest.raises(ValueError, match="duration_ms"):
+        encode_document(document)
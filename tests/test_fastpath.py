@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+
+from pose_contact_spec.validate import CompiledValidator, load_schema
+
+FIXTURES = Path(__file__).parent / "fixtures"
+DOCUMENTS = sorted(
+    [*FIXTURES.glob("valid/*.yaml"), *FIXTURES.glob("invalid/*.yaml")],
+    key=lambda path: (path.parent.name, path.name),
+)
+
+
+@pytest.fixture(scope="module")
+def validators() -> tuple[CompiledValidator, CompiledValidator]:
+    schema = load_schema()
+    return (
+        CompiledValidator(schema, fast_path=True),
+        CompiledValidator(schema, fast_path=False),
+    )
+
+
+def _issues(validator: CompiledValidator, path: Path) -> list[tuple[str, str]]:
+    return [(issue.path, issue.message) for issue in validator.validate_document(path)]
+
+
+@pytest.mark.parametrize(
+    "path", DOCUMENTS, ids=lambda path: f"{path.parent.name}/{path.name}"
+)
+def test_fast_path_reports_the_same_issues(validators, path):
+    fast, slow = validators
+    assert _issues(fast, path) == _issues(slow, path)
+
+
+def test_fixtures_are_found():
+    assert any(path.parent.name == "valid" for path in DOCUMENTS)
+    assert any(path.parent.name == "invalid" for path in DOCUMENTS)
@@ -0,0 +1,74 @@
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+TOOL = ROOT / "tools" / "check_import_time.py"
+
+
+def _load_tool():
+    spec = importlib.util.spec_from_file_location("check_import_time", TOOL)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_scenarios():
+    return _load_tool().SCENARIOS
+
+
+@pytest.fixture(scope="module")
+def import_time():
+    return _load_tool()
+
+
+def test_package_import_defers_heavy_dependencies(import_time):
+    times = import_time._import_times("import pose_contact_spec")
+    assert "pose_contact_spec" in times
+    assert "jsonschema" not in times
+    assert "yaml" not in times
+
+
+def test_import_time_budgets(import_time):
+    assert import_time.check(runs=3) == []
+
+
+# Records every file opened while running the statement, via an audit hook.
+_OPENED_FILES = """
+import sys
+opened = []
+sys.addaudithook(
+    lambda event, args: event == "open" and opened.append(str(args[0]))
+)
+{statement}
+print("\\n".join(opened))
+"""
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        *(scenario[0] for scenario in _load_scenarios()),
+        "import pose_contact_spec.binary",
+    ],
+)
+def test_import_does_not_read_the_schema(statement):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(ROOT / "src"), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", _OPENED_FILES.format(statement=statement)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    schemas = [
+        path for path in result.stdout.splitlines() if path.endswith(".schema.json")
+    ]
+    assert schemas == []
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from pose_contact_spec.incremental import validate_incremental
+from pose_contact_spec.load import load_document
+from pose_contact_spec.synthetic import generate_scene
+from pose_contact_spec.validate import validate_document
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SOURCES = {
+    **{
+        f"{path.parent.name}/{path.name}": load_document(path)
+        for path in sorted(
+            [*FIXTURES.glob("valid/*.yaml"), *FIXTURES.glob("invalid/*.yaml")]
+        )
+    },
+    **{
+        f"synthetic-{seed}": generate_scene(relations=30, invalid_ratio=0.3, seed=seed)
+        for seed in range(3)
+    },
+}
+
+
+def _relations_first(document):
+    """Move ``relations`` before the id sections it refers to."""
+    if not isinstance(document, dict) or "relations" not in document:
+        return document
+    return {"relations": document["relations"], **document}
+
+
+def _write(tmp_path, name, document, format):
+    path = tmp_path / f"{name.replace('/', '-')}.{format}"
+    if format == "json":
+        path.write_text(json.dumps(document), encoding="utf-8")
+    else:
+        path.write_text(yaml.safe_dump(document, sort_keys=False), encoding="utf-8")
+    return path
+
+
+def _issues(issues):
+    return [(issue.path, issue.message) for issue in issues]
+
+
+@pytest.mark.parametrize("name", SOURCES)
+@pytest.mark.parametrize("format", ["yaml", "json"])
+@pytest.mark.parametrize("order", ["as-is", "relations-first"])
+@pytest.mark.parametrize("max_issues", [None, 1, 2])
+def test_incremental_matches_full_validation(tmp_path, name, format, order, max_issues):
+    document = SOURCES[name]
+    if order == "relations-first":
+        document = _relations_first(document)
+    path = _write(tmp_path, name, document, format)
+    expected = validate_document(path, max_issues=max_issues)
+    assert _issues(validate_incremental(path, max_issues=max_issues)) == _issues(
+        expected
+    )
+
+
+def test_incremental_rejects_repeated_top_level_keys(tmp_path):
+    path = tmp_path / "repeated.yaml"
+    path.write_text('schema_version: "0.2.0"\nactors: []\nactors: []\n')
+    with pytest.raises(ValueError, match="duplicate top-level key 'actors'"):
+        validate_incremental(path)
@@ -0,0 +1,66 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from pose_contact_spec import instrument
+from pose_contact_spec.validate import validate_document
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "valid").glob("*.yaml"))
+
+
+def test_nested_collect_blocks_count_their_own_validations():
+    with instrument.collect() as outer:
+        validate_document(FIXTURES[0])
+        with instrument.collect() as inner:
+            validate_document(FIXTURES[1])
+        validate_document(FIXTURES[2])
+    assert outer.documents == 3
+    assert inner.documents == 1
+    assert not instrument.enabled()
+
+
+def test_leaving_an_equal_inner_block_keeps_the_outer_one():
+    # Both blocks hold equal totals when the inner one exits.
+    with instrument.collect() as outer:
+        with instrument.collect() as inner:
+            pass
+        validate_document(FIXTURES[0])
+    assert outer.documents == 1
+    assert inner.documents == 0
+    assert not instrument.enabled()
+
+
+def test_concurrent_collect_blocks_are_independent():
+    started = threading.Barrier(4)
+    counts = {}
+
+    def run(worker):
+        with instrument.collect() as stats:
+            started.wait()
+            for path in FIXTURES[: worker + 1]:
+                validate_document(path)
+            started.wait()
+        counts[worker] = stats.documents
+
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = sum(range(1, 5))
+    # Observers are process-wide, so each block sees every validation made
+    # while it was open: all four blocks overlap for the whole run.
+    assert counts == {worker: total for worker in range(4)}
+    assert not instrument.enabled()
+
+
+def test_remove_observer_requires_the_registered_object():
+    first, second = instrument.ValidationStats(), instrument.ValidationStats()
+    instrument.add_observer(first)
+    try:
+        with pytest.raises(ValueError):
+            instrument.remove_observer(second)
+    finally:
+        instrument.remove_observer(first)
+    assert not instrument.enabled()
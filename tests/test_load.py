@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from pose_contact_spec.load import load_document, loads_document
+
+ROOT = Path(__file__).parent.parent
+DOCUMENTS = sorted(
+    [*ROOT.glob("examples/*.yaml"), *ROOT.glob("tests/fixtures/*/*.yaml")]
+)
+
+requires_libyaml = pytest.mark.skipif(
+    getattr(yaml, "CSafeLoader", None) is None,
+    reason="PyYAML was built without libyaml",
+)
+
+
+@requires_libyaml
+@pytest.mark.parametrize(
+    "path", DOCUMENTS, ids=lambda path: str(path.relative_to(ROOT))
+)
+def test_c_loader_matches_python_loader(path):
+    assert load_document(path, loader="c") == load_document(path, loader="python")
+
+
+@requires_libyaml
+@pytest.mark.parametrize("loader", ["c", "python"])
+@pytest.mark.parametrize("version", ["0.2.0", '"1.0.0"', "'1.0'"])
+def test_schema_version_loads_as_string(loader, version):
+    document = loads_document(f"schema_version: {version}\n", loader=loader)
+    assert document["schema_version"] == version.strip("'\"")
+    assert isinstance(document["schema_version"], str)
+
+
+@requires_libyaml
+def test_c_loader_matches_python_loader_on_scalars():
+    text = (
+        "ints: [1, 0o17, 0x1f, -3]\n"
+        "floats: [1.5, 1e3, .inf, -.inf]\n"
+        "bools: [true, false, yes, no, on, off]\n"
+        "nulls: [null, ~, ]\n"
+        "dates: [2024-01-02, 2024-01-02T03:04:05Z]\n"
+        "text: [0.2, '0.2', 1_000, 'é']\n"
+    )
+    assert loads_document(text, loader="c") == loads_document(text, loader="python")
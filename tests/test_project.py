@@ -0,0 +1,40 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from pose_contact_spec.load import load_document
+from pose_contact_spec.model import Scene
+from pose_contact_spec.project import NarrativeProjector, project_narrative
+
+ROOT = Path(__file__).parent.parent
+# Projections recorded with the projector as it was before NarrativeProjector.
+GOLDEN = json.loads(
+    (ROOT / "tests" / "fixtures" / "narrative-projections.json").read_text(
+        encoding="utf-8"
+    )
+)
+
+
+@pytest.mark.parametrize("name", GOLDEN)
+def test_projection_matches_golden_output(name):
+    document = load_document(ROOT / name)
+    assert project_narrative(document) == GOLDEN[name]
+    sink = io.StringIO()
+    NarrativeProjector(document).write(sink)
+    assert sink.getvalue() == GOLDEN[name]
+
+
+@pytest.mark.parametrize("name", GOLDEN)
+def test_scene_projection_matches_golden_output(name):
+    try:
+        scene = Scene.from_dict(load_document(ROOT / name))
+    except ValueError:
+        pytest.skip("document does not fit the typed model")
+    assert project_narrative(scene) == GOLDEN[name]
+
+
+def test_golden_covers_examples_and_fixtures():
+    names = {Path(name).parent.name for name in GOLDEN}
+    assert {"examples", "valid", "invalid"} <= names
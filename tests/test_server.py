@@ -0,0 +1,78 @@
+import http.client
+import json
+import threading
+
+import pytest
+import yaml
+
+from pose_contact_spec.server import ValidationService, _iter_json_array, make_server
+from pose_contact_spec.synthetic import generate_scene
+
+DOCUMENTS = [generate_scene(relations=5, seed=seed) for seed in range(3)]
+
+
+@pytest.fixture()
+def running():
+    service = ValidationService(workers=1, max_batch=2)
+    server = make_server(service, port=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield service, server.server_address[1]
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def _request(port, method, path, body=None, content_type="application/json"):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": content_type} if body is not None else {}
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    return response.status, response.read().decode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["[]", " [ ] ", "[1]", '[{"a": [1, 2]}, "x", null]\n', "[[], {}]"],
+)
+def test_iter_json_array_matches_json_loads(text):
+    assert list(_iter_json_array(text)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1", "[1,]", "[1 2]", "[1] 2", "[,]"])
+def test_iter_json_array_rejects_what_json_loads_rejects(text):
+    with pytest.raises(ValueError):
+        list(_iter_json_array(text))
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [
+        # Everything after the third document is malformed; it must not be read.
+        (json.dumps(DOCUMENTS)[:-1] + ", {bad", "application/json"),
+        (yaml.safe_dump_all(DOCUMENTS) + "---\n[bad\n", "application/yaml"),
+    ],
+)
+def test_oversized_batch_is_rejected_while_parsing(running, body, content_type):
+    _, port = running
+    status, payload = _request(port, "POST", "/validate/batch", body, content_type)
+    assert status == 413
+    assert json.loads(payload) == {"error": "batch exceeds 2 documents"}
+
+
+def test_unexpected_error_is_a_counted_500(running, monkeypatch):
+    service, port = running
+
+    def fail(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(service, "validate_body", fail)
+    status, payload = _request(port, "POST", "/validate", json.dumps(DOCUMENTS[0]))
+    assert status == 500
+    assert json.loads(payload) == {"error": "internal server error"}
+    _, metrics = _request(port, "GET", "/metrics")
+    assert 'requests_total{endpoint="/validate",status="500"} 1' in metrics
+    # The server keeps answering afterwards.
+    monkeypatch.undo()
+    status, payload = _request(port, "POST", "/validate", json.dumps(DOCUMENTS[0]))
+    assert status == 200
@@ -0,0 +1,131 @@
+import copy
+import random
+from pathlib import Path
+
+import pytest
+
+from pose_contact_spec.load import load_document
+from pose_contact_spec.session import ValidationSession
+from pose_contact_spec.synthetic import generate_scene
+from pose_contact_spec.validate import validate_instance
+
+FIXTURES = Path(__file__).parent / "fixtures"
+DOCUMENTS = [
+    *(
+        load_document(path)
+        for path in sorted(
+            [*FIXTURES.glob("valid/*.yaml"), *FIXTURES.glob("invalid/*.yaml")]
+        )
+    ),
+    *(generate_scene(relations=20, invalid_ratio=0.3, seed=seed) for seed in range(3)),
+]
+DOCUMENTS = [document for document in DOCUMENTS if isinstance(document, dict)]
+
+# Replacement values, including ones equal to each other under ``==``.
+VALUES = [
+    "actor_a",
+    "floor",
+    "touching",
+    "supporting",
+    "body_part",
+    "anchor",
+    None,
+    0,
+    1,
+    1.0,
+    True,
+    False,
+    "1",
+    [],
+    {},
+]
+
+
+def _pointer(path):
+    return "".join(f"/{token}" for token in path)
+
+
+def _paths(value, path=()):
+    if path:
+        yield path
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _paths(item, (*path, key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _paths(item, (*path, index))
+
+
+def _mutate(document, rng):
+    """Edit ``document`` in place; return the same edits as a JSON Patch."""
+    operations = []
+    for _ in range(rng.randint(1, 3)):
+        paths = list(_paths(document))
+        if not paths:
+            break
+        path = rng.choice(paths)
+        parent = document
+        for token in path[:-1]:
+            parent = parent[token]
+        choice = rng.random()
+        if choice < 0.5:
+            value = rng.choice(VALUES)
+            parent[path[-1]] = copy.deepcopy(value)
+            operations.append({"op": "replace", "path": _pointer(path), "value": value})
+        elif choice < 0.7:
+            del parent[path[-1]]
+            operations.append({"op": "remove", "path": _pointer(path)})
+        elif isinstance(parent, list):
+            value = copy.deepcopy(rng.choice(parent)) if parent else {}
+            index = rng.randint(0, len(parent))
+            parent.insert(index, copy.deepcopy(value))
+            operations.append(
+                {"op": "add", "path": _pointer((*path[:-1], index)), "value": value}
+            )
+    return operations
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("method", ["update", "apply_patch"])
+def test_session_matches_full_revalidation(seed, method):
+    rng = random.Random(seed)
+    for document in DOCUMENTS:
+        session = ValidationSession(copy.deepcopy(document))
+        assert session.issues == validate_instance(document)
+        current = copy.deepcopy(document)
+        for _ in range(8):
+            operations = _mutate(current, rng)
+            if method == "update":
+                issues = session.update(copy.deepcopy(current))
+            else:
+                issues = session.apply_patch(operations)
+            assert session.instance == current
+            assert issues == validate_instance(copy.deepcopy(current))
+
+
+def _with_duration(value):
+    document = load_document(FIXTURES / "valid" / "minimal-touching.yaml")
+    document["relations"][0]["qualifiers"] = {"duration_ms": value}
+    return document
+
+
+@pytest.mark.parametrize(
+    "old, new", [(1, True), (True, 1), (1, 1.0), (0, False), (1, "1")]
+)
+@pytest.mark.parametrize("method", ["update", "apply_patch"])
+def test_type_only_changes_are_revalidated(old, new, method):
+    session = ValidationSession(_with_duration(old))
+    changed = _with_duration(new)
+    if method == "update":
+        issues = session.update(changed)
+    else:
+        issues = session.apply_patch(
+            [
+                {
+                    "op": "replace",
+                    "path": "/relations/0/qualifiers/duration_ms",
+                    "value": new,
+                }
+            ]
+        )
+    assert issues == validate_instance(changed)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Offline benchmarks for loading, validating and projecting canonical state.
+
+Scenes come from the deterministic generator in
+``pose_contact_spec.synthetic``, so results are comparable across commits.
+Results are printed as a table and can be written as JSON with ``--output``;
+``--compare`` checks them against a previous result file and exits with
+status 1 when a case got slower than ``--max-regression`` allows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+
+try:
+    import pose_contact_spec
+except ImportError:
+    sys.path.insert(0, str(ROOT / "src"))
+    import pose_contact_spec
+
+import yaml
+
+from pose_contact_spec import (
+    compiled_validator,
+    load_document,
+    project_narrative,
+    validate_instance,
+)
+from pose_contact_spec.binary import encode_document
+from pose_contact_spec.synthetic import generate_scene
+from pose_contact_spec.validate import _iter_semantic_issues
+
+DEFAULT_BASELINE = ROOT / "tools" / "benchmark-baseline.json"
+
+
+def _measure(func: Callable[[], Any], repeat: int, min_time: float) -> float:
+    """Return the best per-call time in seconds over ``repeat`` rounds."""
+    func()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def _cases(
+    relations: int, workdir: Path
+) -> dict[str, tuple[Callable[[], Any], int]]:
+    """Return ``name -> (callable, relations handled per call)``."""
+    valid = generate_scene(
+        actors=4, objects=8, surfaces=2, anchors=16, relations=relations, seed=1
+    )
+    invalid = generate_scene(
+        actors=4,
+        objects=8,
+        surfaces=2,
+        anchors=16,
+        relations=relations,
+        invalid_ratio=0.1,
+        seed=2,
+    )
+    yaml_path = workdir / "scene.yaml"
+    json_path = workdir / "scene.json"
+    yaml_path.write_text(yaml.safe_dump(valid, sort_keys=False), encoding="utf-8")
+    json_path.write_text(json.dumps(valid), encoding="utf-8")
+    binary_path = workdir / "scene.pcb"
+    binary_path.write_bytes(encode_document(valid))
+
+    validator = compiled_validator()
+    cases: dict[str, tuple[Callable[[], Any], int]] = {
+        "load_json": (lambda: load_document(json_path), relations),
+        "load_binary": (lambda: load_document(binary_path), relations),
+        "load_yaml_c": (lambda: load_document(yaml_path, loader="c"), relations),
+        "load_yaml_python": (
+            lambda: load_document(yaml_path, loader="python"),
+            relations,
+        ),
+        "schema_jsonschema": (lambda: validator.schema_issues(valid), relations),
+        "semantic_valid": (
+            lambda: list(_iter_semantic_issues(valid)),
+            relations,
+        ),
+        "semantic_invalid": (
+            lambda: list(_iter_semantic_issues(invalid)),
+            relations,
+        ),
+        "validate_valid": (lambda: validate_instance(valid), relations),
+        "validate_invalid": (lambda: validate_instance(invalid), relations),
+        "project_narrative": (lambda: project_narrative(valid), relations),
+    }
+    if not yaml.__with_libyaml__:
+        del cases["load_yaml_c"]
+    return cases
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run(relations: int, repeat: int, min_time: float, only: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = _cases(relations, Path(tmp))
+        results = {}
+        for name, (func, handled) in cases.items():
+            if only and name not in only:
+                continue
+            seconds = _measure(func, repeat, min_time)
+            results[name] = {
+                "seconds": seconds,
+                "relations_per_second": handled / seconds,
+            }
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "libyaml": bool(yaml.__with_libyaml__),
+        "relations": relations,
+        "cases": results,
+    }
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Return a line for every case slower than the baseline allows."""
+    failures = []
+    for name, result in report["cases"].items():
+        reference = baseline.get("cases", {}).get(name)
+        if reference is None:
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        if ratio > 1 + max_regression:
+            failures.append(
+                f"{name}: {ratio:.2f}x the baseline "
+                f"({result['seconds'] * 1e3:.2f} ms vs "
+                f"{reference['seconds'] * 1e3:.2f} ms)"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--relations", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum seconds per timing round (default: 0.2).",
+    )
+    parser.add_argument(
+        "--case", action="append", default=[], help="Run only this case."
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON.")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help="Compare against a result file (default: the committed baseline).",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown as a fraction of the baseline (default: 0.25).",
+    )
+    args = parser.parse_args()
+
+    report = run(args.relations, args.repeat, args.min_time, args.case)
+    for name, result in report["cases"].items():
+        print(
+            f"{name:20} {result['seconds'] * 1e3:10.3f} ms "
+            f"{result['relations_per_second']:14,.0f} relations/s"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("relations") != report["relations"]:
+            print("Baseline was recorded with a different --relations value.")
+            return 1
+        failures = compare(report, baseline, args.max_regression)
+        if failures:
+            print("Regressions:")
+            for failure in failures:
+                print(f"- {failure}")
+            return 1
+        print(f"No case is more than {args.max_regression:.0%} slower than baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
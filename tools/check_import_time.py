@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Enforce the package's import-time budget.
+
+Each scenario runs in a fresh interpreter under ``python -X importtime``. The
+check fails when a scenario imports a module it must not (heavy dependencies
+are meant to load on first use), or when the best of ``--runs`` measurements
+of the time spent importing modules beyond a bare interpreter exceeds the
+scenario's budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY = ("jsonschema", "yaml", "numpy", "sqlite3", "asyncio", "http.server")
+
+# (statement, budget in milliseconds, modules that must not be imported)
+SCENARIOS = [
+    ("import pose_contact_spec", 60, HEAVY),
+    ("from pose_contact_spec import project_narrative", 80, HEAVY),
+    (
+        "from pose_contact_spec import validate_instance, load_document",
+        100,
+        HEAVY,
+    ),
+    (
+        "from pose_contact_spec.cli import build_parser; build_parser()",
+        150,
+        HEAVY,
+    ),
+]
+
+
+def _import_times(statement: str) -> dict[str, tuple[int, int]]:
+    """Return ``module -> (cumulative microseconds, nesting level)``."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(ROOT / "src"), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        level = (len(name) - len(name.lstrip())) // 2
+        times[name.strip()] = (int(cumulative), level)
+    return times
+
+
+def check(runs: int) -> list[str]:
+    baseline = set(_import_times("pass"))
+    failures = []
+    for statement, budget_ms, forbidden in SCENARIOS:
+        best = None
+        for _ in range(runs):
+            times = _import_times(statement)
+            total = sum(
+                cumulative
+                for name, (cumulative, level) in times.items()
+                if level == 0 and name not in baseline
+            )
+            best = total if best is None else min(best, total)
+        imported = sorted(module for module in forbidden if module in times)
+        status = "ok"
+        if imported:
+            status = "FAIL"
+            failures.append(f"{statement!r} imports {', '.join(imported)}")
+        if best / 1000 > budget_ms:
+            status = "FAIL"
+            failures.append(
+                f"{statement!r} took {best / 1000:.1f} ms (budget {budget_ms} ms)"
+            )
+        print(f"{status:4} {best / 1000:7.1f} ms / {budget_ms:4} ms  {statement}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    failures = check(args.runs)
+    if failures:
+        print("Import-time budget exceeded:")
+        for failure in failures:
+            print(f"- {failure}")
+        return 1
+    print("All import-time budgets met.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
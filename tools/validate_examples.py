@@ -9,25 +9,10 @@ import jsonschema
 from jsonschema.exceptions import best_match
 import yaml
 
-SPATIAL_PREDICATES = {
-    "left_of",
-    "right_of",
-    "above",
-    "below",
-    "facing",
-    "aligned_with",
-}
-
-BIDIRECTIONAL_BODY_PART_PREDICATES = {"touching", "contacting"}
-
-SUBJECT_OBJECT_RULES = {
-    "gripping": ({"body_part"}, {"object", "anchor"}),
-    "holding": ({"body_part"}, {"object", "anchor"}),
-    "supporting": ({"surface", "object", "anchor"}, {"body_part"}),
-    "standing_on": ({"body_part"}, {"surface", "object", "anchor"}),
-    "sitting_on": ({"body_part"}, {"surface", "object", "anchor"}),
-    "leaning_on": ({"body_part"}, {"surface", "object", "anchor"}),
-}
+# Check against this checkout's rules, even when another version of the
+# package is installed.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+from pose_contact_spec.rules import DEFAULT_RULES  # noqa: E402
 
 
 def load_schema(schema_path: Path) -> dict:
@@ -137,38 +122,6 @@ def validate_entity_ref(
     return kind, errors
 
 
-def predicate_allows_pairing(
-    predicate: str, subject_kind: str | None, object_kind: str | None
-) -> bool:
-    if subject_kind is None or object_kind is None:
-        return True
-    if predicate in SPATIAL_PREDICATES:
-        return True
-    if predicate in BIDIRECTIONAL_BODY_PART_PREDICATES:
-        left = {"body_part"}
-        right = {"body_part", "object", "surface", "anchor"}
-        return (subject_kind in left and object_kind in right) or (
-            object_kind in left and subject_kind in right
-        )
-    if predicate in SUBJECT_OBJECT_RULES:
-        allowed_subjects, allowed_objects = SUBJECT_OBJECT_RULES[predicate]
-        return subject_kind in allowed_subjects and object_kind in allowed_objects
-    return True
-
-
-def describe_expected_pairing(predicate: str) -> str:
-    if predicate in BIDIRECTIONAL_BODY_PART_PREDICATES:
-        return "body_part ↔ body_part/object/surface/anchor"
-    if predicate in SUBJECT_OBJECT_RULES:
-        allowed_subjects, allowed_objects = SUBJECT_OBJECT_RULES[predicate]
-        subject_desc = "/".join(sorted(allowed_subjects))
-        object_desc = "/".join(sorted(allowed_objects))
-        return f"{subject_desc} → {object_desc}"
-    if predicate in SPATIAL_PREDICATES:
-        return "any entity reference"
-    return "any entity reference"
-
-
 def validate_relations(
     relations: list[dict],
     ids: dict[str, set[str]],
@@ -188,10 +141,8 @@ def validate_relations(
         )
         errors.extend(subject_errors)
         errors.extend(object_errors)
-        if predicate and not predicate_allows_pairing(
-            predicate, subject_kind, object_kind
-        ):
-            expected = describe_expected_pairing(predicate)
+        if predicate and not DEFAULT_RULES.allows(predicate, subject_kind, object_kind):
+            expected = DEFAULT_RULES.describe(predicate)
             errors.append(
                 (
                     format_path(["relations", index]),